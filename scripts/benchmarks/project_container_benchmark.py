@@ -0,0 +1,114 @@
+"""
+Benchmarks the size of synthetic projects, and how fast they're saved and opened, as plain JSON .fcl files and as
+compressed containers.
+
+Usage (from the repository root):
+    python scripts/benchmarks/project_container_benchmark.py [numTokens ...]
+
+Defaults to 10k and 100k tokens. Each component has one super token with one token and a few properties, and the
+components form a tree that is 50 components wide at each level. "open" parses the whole file; "open info" only
+reads the project information, as the recent projects menu does when there's no manifest.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+
+from data import jsonstream
+from data.jsonstream import LazyObject
+from data.projectcontainer import ProjectContainer
+
+WIDTH = 50
+COMPONENTS_PER_CHUNK = 2000
+
+
+def makeComponent(i: int) -> dict:
+    token = {"type": "Button", "title": "Component %d" % i, "autoid": str(i), "picHash": "%064x" % i, "pic": None,
+             "rectangle": [i % 800, i % 600, 80, 20], "parentRect": None, "controlIDs": ["Button", str(i)],
+             "texts": ["Component %d" % i], "childrenTexts": [], "isDialog": False}
+    properties = {"Base": {"Name": {"value": "component_%d" % i, "type": "str", "readOnly": False},
+                           "Type": {"value": "Button", "type": "str", "readOnly": True}},
+                  "Visual": {"X": {"value": i % 800, "type": "int", "readOnly": True},
+                             "Y": {"value": i % 600, "type": "int", "readOnly": True}}}
+    parent = 0 if i <= WIDTH else (i - 1) // WIDTH
+    return {"id": i, "srcBehaviors": [], "destBehaviors": [], "children": [], "isEC": False, "depth": 0,
+            "timestamp": float(i), "properties": properties, "parent": parent,
+            "superToken": {"id": 10 ** 8 + i, "tokens": [token], "ignoreFlag": False, "relativePos": [0, 0]}}
+
+
+def makeProject(numTokens: int) -> dict:
+    components = LazyObject(((str(i), makeComponent(i)) for i in range(1, numTokens + 1)), COMPONENTS_PER_CHUNK)
+    return {
+        "Project Information": {"Name": "benchmark", "Description": "", "Model Entities": numTokens},
+        "Application Information": {"Target Application": "app.exe", "Backend": "uia", "Startup Timeout": 10},
+        "Settings": {"Close App on Exit": False, "AutoClose Warning Shown": False},
+        "Data Structures": {
+            "Target GUI Model": {"root": {"id": 0}, "components": components, "behaviors": {},
+                                 "Entity Count": numTokens, "SuperToken Count": numTokens},
+            "API Model": {"action specifications": [], "component actions": [], "action pipelines": []},
+        },
+    }
+
+
+def timeIt(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run(numTokens: int, directory: str) -> dict:
+    path = os.path.join(directory, "benchmark.fcl")
+
+    def loadJSON():
+        with open(path) as f:
+            json.load(f)
+
+    def loadJSONInfo():
+        with open(path) as f:
+            json.load(f)["Project Information"]
+
+    def loadContainer():
+        with ProjectContainer(path) as container:
+            container.load()
+
+    def loadContainerInfo():
+        with ProjectContainer(path) as container:
+            container.readSection("Project Information")
+
+    formats = [
+        ("json, indented", lambda: jsonstream.saveIndexed(makeProject(numTokens), path, 4, depth=3),
+         loadJSON, loadJSONInfo),
+        ("json, compact", lambda: jsonstream.saveIndexed(makeProject(numTokens), path, depth=3),
+         loadJSON, loadJSONInfo),
+    ]
+    for compression in ProjectContainer.COMPRESSIONS:
+        formats.append((compression, lambda c=compression: ProjectContainer.save(makeProject(numTokens), path, c),
+                        loadContainer, loadContainerInfo))
+
+    results = {}
+    for name, save, load, loadInfo in formats:
+        saveTime = timeIt(save)
+        results[name] = {"size (MB)": os.path.getsize(path) / 1e6, "save (s)": saveTime, "open (s)": timeIt(load),
+                         "open info (s)": timeIt(loadInfo)}
+        os.remove(path)
+    return results
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    for numTokens in sizes:
+        directory = tempfile.mkdtemp()
+        try:
+            results = run(numTokens, directory)
+        finally:
+            shutil.rmtree(directory)
+        print("{:,} tokens".format(numTokens))
+        columns = list(next(iter(results.values())))
+        print("    {:<16}".format("") + "".join("{:>15}".format(column) for column in columns))
+        for name, values in results.items():
+            print("    {:<16}".format(name) + "".join("{:>15.2f}".format(values[column]) for column in columns))
@@ -0,0 +1,89 @@
+"""
+Benchmarks adding components to a target GUI model one at a time with TargetGuiModel.createComponent() against adding
+them all at once with TargetGuiModel.createComponents().
+
+Usage (from the repository root):
+    python scripts/benchmarks/tguim_insert_benchmark.py [numComponents [width]]
+
+Defaults to 50k components under parents that are 5k components wide. The root has numComponents / width windows, and
+each window has width children. Both paths get their own copies of the same super tokens.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+
+import libs.env as env
+env.updateContext("Facile")
+
+from data.tguim.targetguimodel import TargetGuiModel
+from tguiil.supertokens import SuperToken
+
+
+def makeSuperToken(id: int) -> 'SuperToken':
+    token = {"type": "Button", "title": "Component %d" % id, "autoid": str(id), "picHash": None, "pic": None,
+             "rectangle": None, "parentRect": None, "controlIDs": ["Button", str(id)], "parentTitle": "",
+             "texts": ["Component %d" % id], "childrenTexts": [], "isDialog": False}
+    return SuperToken.fromDict({"id": id, "tokens": [token], "ignoreFlag": False, "relativePos": [0, 0, 80, 20]})
+
+
+def makeItems(numComponents: int, width: int) -> list:
+    items = []
+    nextID = 1
+    numWindows = max(1, numComponents // width)
+    for _ in range(numWindows):
+        window = makeSuperToken(nextID)
+        items.append((window, None))
+        nextID += 1
+        for _ in range(width):
+            items.append((makeSuperToken(nextID), window))
+            nextID += 1
+    return items
+
+
+def timeInsertion(insert, items: list) -> tuple:
+    tguim = TargetGuiModel()
+    numSignals = [0]
+
+    def onSignal(*args):
+        numSignals[0] += 1
+
+    tguim.dataChanged.connect(onSignal)
+    start = time.perf_counter()
+    insert(tguim, items)
+    elapsed = time.perf_counter() - start
+    assert len(tguim.getComponents()) == len(items)
+    return tguim, elapsed, numSignals[0]
+
+
+def insertOneAtATime(tguim: 'TargetGuiModel', items: list) -> None:
+    for superToken, parentToken in items:
+        tguim.createComponent(superToken, parentToken)
+
+
+def insertAll(tguim: 'TargetGuiModel', items: list) -> None:
+    tguim.createComponents(items)
+
+
+def main() -> None:
+    numComponents = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+
+    single, singleTime, singleSignals = timeInsertion(insertOneAtATime, makeItems(numComponents, width))
+    bulk, bulkTime, bulkSignals = timeInsertion(insertAll, makeItems(numComponents, width))
+
+    titles = lambda tguim: [[child.getSuperToken().tokens[0].title for child in window.getChildren()]
+                            for window in tguim.getRoot().getChildren()]
+    assert titles(single) == titles(bulk)
+    assert single.getRoot().getNumDescendants() == bulk.getRoot().getNumDescendants()
+
+    print("{:,} components, {:,} wide:".format(len(single.getComponents()), width))
+    print("  createComponent():  {:.2f}s, {:,} dataChanged signals".format(singleTime, singleSignals))
+    print("  createComponents(): {:.2f}s, {:,} dataChanged signals ({:.1f}x faster)".format(
+        bulkTime, bulkSignals, singleTime / bulkTime))
+
+
+if __name__ == "__main__":
+    main()
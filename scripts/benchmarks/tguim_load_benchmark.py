@@ -0,0 +1,87 @@
+"""
+Benchmarks rebuilding a target GUI model from its dictionary with TargetGuiModel.fromDict().
+
+Usage (from the repository root):
+    python scripts/benchmarks/tguim_load_benchmark.py [numComponents [width]]
+
+Defaults to 50k components under parents that are 5k components wide. The root has numComponents / width windows,
+each window has width children, and the children's timestamps are shuffled so that every child list must be sorted.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
+
+import libs.env as env
+env.updateContext("Facile")
+
+from data.entity import Entity
+from data.tguim.targetguimodel import TargetGuiModel
+
+
+def makeComponent(id: int, parent: int, depth: int, timestamp: float) -> dict:
+    token = {"type": "Button", "title": "Component %d" % id, "autoid": str(id), "picHash": None, "pic": None,
+             "rectangle": None, "parentRect": None, "controlIDs": ["Button", str(id)],
+             "texts": ["Component %d" % id], "childrenTexts": [], "isDialog": False}
+    return {"id": id, "srcBehaviors": [], "destBehaviors": [], "children": [], "isEC": False, "depth": depth,
+            "timestamp": timestamp, "properties": None, "parent": parent,
+            "superToken": {"id": id, "tokens": [token], "ignoreFlag": False, "relativePos": [0, 0, 80, 20]}}
+
+
+def makeModel(numComponents: int, width: int) -> dict:
+    rng = random.Random(0)
+    root = {"id": 0, "srcBehaviors": [], "destBehaviors": [], "children": [], "isEC": False, "depth": -1,
+            "timestamp": 0.0, "properties": None, "parent": None, "superToken": None}
+    components = {}
+    nextID = 1
+    numWindows = max(1, numComponents // width)
+    for _ in range(numWindows):
+        window = makeComponent(nextID, None, 0, float(nextID))
+        components[str(nextID)] = window
+        root["children"].append(nextID)
+        nextID += 1
+
+        timestamps = [float(numComponents + i) for i in range(width)]
+        rng.shuffle(timestamps)
+        for timestamp in timestamps:
+            child = makeComponent(nextID, window["id"], 1, timestamp)
+            components[str(nextID)] = child
+            window["children"].append(nextID)
+            nextID += 1
+
+    return {"root": root, "components": components, "behaviors": {}, "Entity Count": nextID,
+            "SuperToken Count": nextID}
+
+
+def main() -> None:
+    numComponents = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+
+    model = makeModel(numComponents, width)
+    numCreated = [0]
+
+    def onCreation():
+        numCreated[0] += 1
+
+    Entity.onCreation = onCreation
+    try:
+        start = time.perf_counter()
+        tguim = TargetGuiModel.fromDict(model)
+        elapsed = time.perf_counter() - start
+    finally:
+        Entity.onCreation = None
+
+    windows = tguim.getRoot().getChildren()
+    assert len(tguim.getComponents()) == len(model["components"])
+    assert all(len(window.getChildren()) == width for window in windows)
+    assert all(a.timestamp <= b.timestamp for a, b in zip(windows[0].getChildren(), windows[0].getChildren()[1:]))
+
+    print("{:,} components, {:,} wide: fromDict took {:.2f}s ({:,} entities created)".format(
+        len(model["components"]), width, elapsed, numCreated[0]))
+
+
+if __name__ == "__main__":
+    main()
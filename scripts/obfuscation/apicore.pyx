@@ -9,8 +9,13 @@ include "data\\tguim\\visibilitybehavior.py"
 include "tguiil\\supertokens.py"
 include "data\\tguim\\component.py"
 include "data\\tguim\\targetguimodel.py"
+include "data\\tguim\\routetable.py"
+include "tguiil\\waiting.py"
 include "tguiil\\application.py"
 include "tguiil\\componentfinder.py"
 
+include "tracer.py"
 include "baseapplication.py"
+include "asyncbaseapplication.py"
+include "apppool.py"
 # ORDER IS IMPORTANT
@@ -28,8 +28,8 @@ if __name__ == '__main__':
 
     os.chdir('..')
     for tmp, path in compilation_copy_files:
-        if path.endswith('baseapplication.py'):
-            newPath = 'baseapplication.py'
+        if path.startswith(os.path.join('tools', 'api_compiler')):
+            newPath = os.path.basename(path)
         else:
             newPath = path
         check_call(f'pyminifier "{os.path.join(srcDir, path)}" > "{os.path.join(dstDir, newPath)}"', shell=True)
@@ -243,17 +243,20 @@ class Action(Entity):
 
 		return []
 
-	def getMethodSignature(self) -> str:
+	def getMethodSignature(self, isAsync: bool = False) -> str:
 		"""
 		Gives the signature for a method using its name and parameter list. Newline at end.
 
+		:param isAsync: If True, the signature is for a coroutine method (async def).
+		:type isAsync: bool
 		:return: Method Signature
 		:rtype: str
 		"""
 
 		name = self.getMethodName()
 		params = self.getParamStr()
-		output = "\tdef " + name + "(self" + params + ") -> " + self.getRType() + ":\n"
+		output = "\tasync def " if isAsync else "\tdef "
+		output += name + "(self" + params + ") -> " + self.getRType() + ":\n"
 		return output
 
 	def getRType(self) -> str:
@@ -310,23 +313,37 @@ class Action(Entity):
 		"""
 		raise ActionException("getDocStr() must be called from the action type's class.")
 
-	def getMethodCode(self):
+	def getMethodCode(self, isAsync: bool = False):
 		"""
 		Must be overwritten in children classes; raises exception here if not.
 		"""
 		raise ActionException("getMethodCode() must be defined in the action type's class.")
 
-	def getMethod(self) -> str:
+	def getTracedComponentID(self) -> int:
+		"""
+		Gets the ID of the component that calls to this action are attributed to when tracing a generated API.
+
+		:return: None, since actions other than component actions aren't tied to a component.
+		:rtype: NoneType
+		"""
+		return None
+
+	def getMethod(self, isAsync: bool = False) -> str:
 		"""
 		Generates the entirety of the code needed for the action, including spacing afterwards.
 
+		:param isAsync: If True, generates a coroutine method for the async API.
+		:type isAsync: bool
 		:return: callable definition (method) that performs the action if executed
 		:rtype: str
 		"""
 
-		code = self.getMethodSignature()
+		code = ''
+		if not isAsync:  # Lets the generated API record a span for each call when tracing is enabled
+			code += '\t@traced(' + str(self.getTracedComponentID()) + ')\n'
+		code += self.getMethodSignature(isAsync)
 		code += self.getDocStr()
-		code += self.getMethodCode()
+		code += self.getMethodCode(isAsync)
 		code += '\n'
 
 		return code
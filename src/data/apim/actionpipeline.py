@@ -76,6 +76,7 @@ class ActionPipeline(Action):
 		
 		self._actions.append(action)
 		
+		self.markDirty()
 		self.updated.emit()
 	
 	def removeAction(self, action: 'ActionWrapper') -> bool:
@@ -100,6 +101,7 @@ class ActionPipeline(Action):
 			self.removePort(port)
 			
 		self._actions.remove(action)
+		self.markDirty()
 		self.updated.emit()
 		return True
 	
@@ -135,6 +137,7 @@ class ActionPipeline(Action):
 			raise WireException("The connection is not a valid configuration.")
 		
 		newWire = self._wireSet.addWire(portA, portB)
+		self.markDirty()
 		self.updated.emit()
 
 		return newWire
@@ -174,6 +177,7 @@ class ActionPipeline(Action):
 		
 		# now we can delete the wire
 		self._wireSet.deleteWire(portA, portB)
+		self.markDirty()
 		self.updated.emit()
 	
 	def changeSequence(self, actionSequence: List['Action']) -> None:
@@ -199,6 +203,7 @@ class ActionPipeline(Action):
 			raise ActionException("Different set of actions detected from original ordering.")
 		
 		self._actions = actionSequence
+		self.markDirty()
 		self.updated.emit()
 		
 	def removePort(self, port: 'Port') -> bool:
@@ -229,6 +234,7 @@ class ActionPipeline(Action):
 		else:
 			raise pt.PortException("The port does not have an action.")
 		
+		self.markDirty()
 		self.updated.emit()
 		
 	def connectionIsValid(self, portA: 'Port', portB: 'Port') -> bool:
@@ -365,10 +371,14 @@ class ActionPipeline(Action):
 			out += '\t\t"""\n\n'
 			return out
 
-	def getMethodCode(self) -> str:
+	def getMethodCode(self, isAsync: bool = False) -> str:
 		"""
 		Generates the entirety of the code necessary for the action, including space afterwards.
 
+		In the async API, each action is awaited, so a cancelled pipeline stops between actions.
+
+		:param isAsync: If True, generates the code for the async API.
+		:type isAsync: bool
 		:return: code 'guts' that will be contained in the action pipeline's call/method
 		:rtype: str
 		"""
@@ -393,7 +403,8 @@ class ActionPipeline(Action):
 					for o in a.getOutputPorts()[1:]:
 						code += ", " + self.getVarName(o)
 				code += ' = '
-			code += 'self.' + a.getMethodName() + '('
+			code += 'await self.' if isAsync else 'self.'
+			code += a.getMethodName() + '('
 
 			if a.getInputPorts():
 				# First port
@@ -424,6 +435,8 @@ class ActionPipeline(Action):
 					code += ", " + outType + '(' + self.getVarName(o) + ')'
 			code += '\n'
 
+		if isAsync:
+			code += '\t\texcept asyncio.CancelledError:\n\t\t\traise\n'
 		code += '\t\texcept Exception as e:\n\t\t\tprint(e)\n\t\t\traise ActionException("The action could not be ' \
 				'performed successfully. Please look at the errors above, or message us for support.")\n'
 
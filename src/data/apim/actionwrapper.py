@@ -208,15 +208,17 @@ class ActionWrapper(act.Action):
 
 		return self._actionRef.getMethodName()
 
-	def getMethodCode(self) -> str:
+	def getMethodCode(self, isAsync: bool = False) -> str:
 		"""
 		Returns the code "guts" of the actionRef
 
+		:param isAsync: If True, generates the code for the async API.
+		:type isAsync: bool
 		:return: Code to perform referenced action
 		:rtype: str
 		"""
 		
-		return self._actionRef.getMethodCode()
+		return self._actionRef.getMethodCode(isAsync)
 
 	def asDict(self) -> dict:
 		"""
@@ -132,6 +132,7 @@ class ApiModel(QObject):
 		"""
 		if actionPipeline not in self._actionPipelines:
 			self._actionPipelines.append(actionPipeline)
+			actionPipeline.markDirty()
 		
 	def removeActionPipeline(self, actionPipeline: 'ActionPipeline') -> bool:
 		"""
@@ -145,6 +146,7 @@ class ApiModel(QObject):
 		"""
 		try:
 			self._actionPipelines.remove(actionPipeline)
+			actionPipeline.markDirty()  # The API model is rewritten when any of its actions change
 			return True
 		except:
 			return False
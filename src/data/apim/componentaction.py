@@ -85,6 +85,19 @@ class ComponentAction(act.Action):
 
 		return self._target
 	
+	def setTargetComponent(self, targetComponent: 'Component') -> None:
+		"""
+		Sets the target component of the action, e.g. when the old target was merged into another component.
+		
+		:param targetComponent: The component to act on
+		:type targetComponent: Component
+		:return: None
+		:rtype: NoneType
+		"""
+		
+		self._target = targetComponent
+		self.markDirty()
+	
 	def getDocStr(self) -> str:
 		"""
 		Generates the docstring for the action. Adds the necessary spacing after docstring.
@@ -139,14 +152,32 @@ class ComponentAction(act.Action):
 			return '_' + self.getName().replace(' ', '_')  # TODO: We have to make sure that these actions have unique names
 		return '_' + str(self._target.getId()) + '_' + self.getName().replace(' ', '_')
 
-	def getMethodCode(self) -> str:
+	def getTracedComponentID(self) -> int:
+		"""
+		Gets the ID of the component that calls to this action are attributed to when tracing a generated API.
+
+		:return: The target component's ID
+		:rtype: int
+		"""
+		return self._target.getId()
+
+	def getMethodCode(self, isAsync: bool = False) -> str:
 		"""
 		Returns the code spec
 
+		In the async API, the action is delegated to the synchronous application so that all accessibility calls run
+		in the async application's executor.
+
+		:param isAsync: If True, generates the code for the async API.
+		:type isAsync: bool
 		:return: code necessary to perform action
 		:rtype: str
 		"""
 		
+		if isAsync:
+			args = ''.join(', ' + p.getName() + '=' + p.getName() for p in self._inputs)
+			return '\t\treturn await self._run(self._app.' + self.getMethodName() + args + ')\n'
+		
 		if self._target.getSuperToken().getTokens()[0].type not in ['Menu', 'MenuItem']:
 			code = '\t\tcomp = self._findComponent(' + str(self._target.getId()) + ')\n'
 		else:
@@ -36,7 +36,7 @@ class CompilationProfile:
 		Pdf = 1
 	
 	def __init__(self, docTypes: Set['CompilationProfile.DocType'], compResOpts: Set['MatchOption'],
-	             apiFolderDir, interpExeDir, installApi: bool):
+	             apiFolderDir, interpExeDir, installApi: bool, asyncApi: bool = False):
 		"""
 		Construct the CompilationProfile containing the information from ApiCompilerDialog.
 		"""
@@ -46,3 +46,4 @@ class CompilationProfile:
 		self.apiFolderDir = apiFolderDir
 		self.interpExeDir = interpExeDir
 		self.installApi = installApi
+		self.asyncApi = asyncApi
@@ -33,6 +33,7 @@ class Entity(QObject):
     count: int = 0  # Class variable used to uniquely identify every entity created.
     updated = Signal()
     onCreation = None # If not None, this is a function that will be called when an entity is created.
+    changeTracker = None  # If not None, the ChangeTracker that is told when an entity is created or modified.
 
     def __init__(self):
         """
@@ -46,6 +47,7 @@ class Entity(QObject):
         Entity.count += 1
         self._id: int = Entity.count
         self._properties = None
+        self.markDirty()
 
         if Entity.onCreation:
             Entity.onCreation()
@@ -81,6 +83,9 @@ class Entity(QObject):
         """
 
         self._properties = propertiesObj
+        if propertiesObj is not None:
+            propertiesObj.setOwner(self)
+        self.markDirty()
 
     def getName(self) -> str:
         """
@@ -120,6 +125,26 @@ class Entity(QObject):
         """
         return self.getProperties().getProperty("Annotation")[1].setValue(annotation)
 
+    def markDirty(self) -> None:
+        """
+        Marks this entity as changed, so that it's written the next time the project is saved.
+
+        :return: None
+        :rtype: NoneType
+        """
+        if Entity.changeTracker is not None:
+            Entity.changeTracker.entityChanged(self)
+
+    def markRemoved(self) -> None:
+        """
+        Marks this entity as removed from its model, so that it's deleted the next time the project is saved.
+
+        :return: None
+        :rtype: NoneType
+        """
+        if Entity.changeTracker is not None:
+            Entity.changeTracker.entityRemoved(self)
+
     def triggerUpdate(self) -> None:
         """
         Tries to emit the updated signal, but don't do anything if updated can't be emitted.
@@ -128,6 +153,7 @@ class Entity(QObject):
         :return: None
         :rtype: NoneType
         """
+        self.markDirty()
         try:
             self.updated.emit()
         except:
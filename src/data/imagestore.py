@@ -0,0 +1,327 @@
+"""
+..
+    /------------------------------------------------------------------------------\
+    |                 -- FACADE TECHNOLOGIES INC.  CONFIDENTIAL --                 |
+    |------------------------------------------------------------------------------|
+    |                                                                              |
+    |    Copyright [2019] Facade Technologies Inc.                                 |
+    |    All Rights Reserved.                                                      |
+    |                                                                              |
+    | NOTICE:  All information contained herein is, and remains the property of    |
+    | Facade Technologies Inc. and its suppliers if any.  The intellectual and     |
+    | and technical concepts contained herein are proprietary to Facade            |
+    | Technologies Inc. and its suppliers and may be covered by U.S. and Foreign   |
+    | Patents, patents in process, and are protected by trade secret or copyright  |
+    | law.  Dissemination of this information or reproduction of this material is  |
+    | strictly forbidden unless prior written permission is obtained from Facade   |
+    | Technologies Inc.                                                            |
+    |                                                                              |
+    \------------------------------------------------------------------------------/
+This module contains the ImageStore class, which keeps token pictures out of the project file.
+"""
+
+import hashlib
+import io
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+
+class LazyImage:
+    """
+    A handle to an image in an ImageStore. The image is only decoded when a token's picture is accessed, and the
+    decoded image is kept in the store's bounded cache rather than by the handle.
+    """
+
+    isLazyImage = True  # Lets Token recognize handles without importing this module (which the API doesn't have)
+
+    def __init__(self, store: 'ImageStore', key: str):
+        self._store = store
+        self.key = key
+
+    def resolve(self) -> 'PIL.Image':
+        """
+        Gets the decoded image.
+
+        :return: the image
+        :rtype: PIL.Image
+        """
+        return self._store.get(self.key)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self  # Handles are immutable, and the store can't be copied.
+
+
+class ImageStore:
+    """
+    An append-only container of PNG images, stored next to the project file and keyed by the hash of each image's
+    pixels. Identical pictures are only stored once, no matter how many tokens have them.
+
+    The file starts with a magic string and is followed by records of (32-byte SHA-256 digest, 4-byte big-endian
+    length, PNG data). The index is rebuilt by reading the record headers when the store is opened; a partial record
+    at the end of the file (e.g. from a crash while saving) is ignored and overwritten.
+
+    Images are read from a memory map of the file and decoded on demand. Decoded images are kept in a least recently
+    used cache with a memory cap, so memory use depends on which images are being looked at, not on the size of
+    the store.
+    """
+
+    MAGIC = b"FCLIMG1\n"
+    _HEADER = struct.Struct(">32sI")
+    DEFAULT_MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, path: str, maxCacheBytes: int = None):
+        """
+        Constructs an ImageStore. The file is created when the first image is added.
+
+        :param path: The path to the store's file
+        :type path: str
+        :param maxCacheBytes: The most memory that decoded images may use. Defaults to DEFAULT_MAX_CACHE_BYTES.
+        :type maxCacheBytes: int
+        """
+        self._path = path
+        self._index = None  # maps hex digest to (data offset, data length)
+        self._end = len(ImageStore.MAGIC)  # where the next record goes
+        self._lock = threading.RLock()
+        self._file = None
+        self._map = None  # read-only memory map of the file, created on first read
+        self._cache = OrderedDict()  # maps hex digest to decoded image, least recently used first
+        self._cacheBytes = 0
+        self._maxCacheBytes = ImageStore.DEFAULT_MAX_CACHE_BYTES if maxCacheBytes is None else maxCacheBytes
+
+    def __deepcopy__(self, memo):
+        return self  # The store is a file; copies of a project share it until they're saved elsewhere.
+
+    def getPath(self) -> str:
+        """
+        Gets the path to the store's file.
+
+        :return: The store's file path
+        :rtype: str
+        """
+        return self._path
+
+    def _loadIndex(self):
+        if self._index is not None:
+            return
+        self._index = {}
+
+        if not os.path.exists(self._path):
+            return
+
+        with open(self._path, "rb") as f:
+            if f.read(len(ImageStore.MAGIC)) != ImageStore.MAGIC:
+                raise IOError("{} is not a Facile image store.".format(self._path))
+
+            fileSize = os.fstat(f.fileno()).st_size
+            offset = len(ImageStore.MAGIC)
+            while offset + ImageStore._HEADER.size <= fileSize:
+                digest, length = ImageStore._HEADER.unpack(f.read(ImageStore._HEADER.size))
+                dataOffset = offset + ImageStore._HEADER.size
+                if dataOffset + length > fileSize:
+                    break  # Partial record
+                self._index[digest.hex()] = (dataOffset, length)
+                offset = dataOffset + length
+                f.seek(offset)
+            self._end = offset
+
+    @staticmethod
+    def hashImage(image: 'PIL.Image') -> str:
+        """
+        Gets the key of an image: the SHA-256 of its mode, size and pixels.
+
+        :param image: The image to hash
+        :type image: PIL.Image
+        :return: the hex digest
+        :rtype: str
+        """
+        h = hashlib.sha256("{}:{}x{}:".format(image.mode, *image.size).encode())
+        h.update(image.tobytes())
+        return h.hexdigest()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            self._loadIndex()
+            return key in self._index
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._loadIndex()
+            return len(self._index)
+
+    def keys(self) -> list:
+        """
+        Gets the keys of all stored images.
+
+        :return: the keys
+        :rtype: list[str]
+        """
+        with self._lock:
+            self._loadIndex()
+            return list(self._index)
+
+    def put(self, image: 'PIL.Image', key: str = None) -> str:
+        """
+        Adds an image to the store unless an identical one is already stored.
+
+        :param image: The image to store
+        :type image: PIL.Image
+        :param key: The image's key if it is already known. It is computed otherwise.
+        :type key: str
+        :return: The image's key
+        :rtype: str
+        """
+        if key is None:
+            key = ImageStore.hashImage(image)
+
+        with self._lock:
+            self._loadIndex()
+            if key in self._index:
+                return key
+
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG")
+            self._append(key, buffer.getvalue())
+        return key
+
+    def putBytes(self, key: str, data: bytes) -> None:
+        """
+        Adds an already encoded image to the store unless its key is already stored.
+
+        :param key: The image's key
+        :type key: str
+        :param data: The image, encoded as PNG
+        :type data: bytes
+        """
+        with self._lock:
+            self._loadIndex()
+            if key not in self._index:
+                self._append(key, data)
+
+    def _append(self, key: str, data: bytes):
+        self._unmap()  # A mapped file can't be resized on Windows
+        mode = "r+b" if os.path.exists(self._path) else "w+b"
+        with open(self._path, mode) as f:
+            if mode == "w+b":
+                f.write(ImageStore.MAGIC)
+            f.seek(self._end)
+            f.write(ImageStore._HEADER.pack(bytes.fromhex(key), len(data)))
+            f.write(data)
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._index[key] = (self._end + ImageStore._HEADER.size, len(data))
+        self._end += ImageStore._HEADER.size + len(data)
+
+    def _unmap(self):
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = None
+            self._file = None
+
+    def close(self):
+        """
+        Unmaps the store's file and empties the cache of decoded images.
+        """
+        with self._lock:
+            self._unmap()
+            self._cache.clear()
+            self._cacheBytes = 0
+
+    def getBytes(self, key: str) -> bytes:
+        """
+        Gets the encoded image with the given key.
+
+        :param key: The image's key
+        :type key: str
+        :return: the PNG data, or None if there is no such image.
+        :rtype: bytes
+        """
+        with self._lock:
+            self._loadIndex()
+            if key not in self._index:
+                return None
+            offset, length = self._index[key]
+            if self._map is None:
+                self._file = open(self._path, "rb")
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._map[offset:offset + length]
+
+    def getLazy(self, key: str) -> 'LazyImage':
+        """
+        Gets a handle to the image with the given key without reading or decoding it.
+
+        :param key: The image's key
+        :type key: str
+        :return: the handle
+        :rtype: LazyImage
+        """
+        return LazyImage(self, key)
+
+    def setMaxCacheBytes(self, maxCacheBytes: int):
+        """
+        Sets the most memory that decoded images may use, evicting the least recently used images if needed.
+
+        :param maxCacheBytes: The memory cap in bytes
+        :type maxCacheBytes: int
+        """
+        with self._lock:
+            self._maxCacheBytes = maxCacheBytes
+            self._evict()
+
+    def getCacheBytes(self) -> int:
+        """
+        Gets the memory used by the cached decoded images.
+
+        :return: the number of bytes
+        :rtype: int
+        """
+        return self._cacheBytes
+
+    @staticmethod
+    def _imageBytes(image) -> int:
+        return image.size[0] * image.size[1] * len(image.getbands())
+
+    def _evict(self):
+        while self._cacheBytes > self._maxCacheBytes and self._cache:
+            key, image = self._cache.popitem(last=False)
+            self._cacheBytes -= ImageStore._imageBytes(image)
+
+    def get(self, key: str) -> 'PIL.Image':
+        """
+        Gets the image with the given key. Decoded images are cached, least recently used first out, until they use
+        more than the store's memory cap.
+
+        :param key: The image's key
+        :type key: str
+        :return: the decoded image, or None if there is no such image.
+        :rtype: PIL.Image
+        """
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+            data = self.getBytes(key)
+            if data is None:
+                return None
+
+            image = self._decode(data)
+            self._cache[key] = image
+            self._cacheBytes += ImageStore._imageBytes(image)
+            self._evict()
+            return image
+
+    @staticmethod
+    def _decode(data: bytes) -> 'PIL.Image':
+        from PIL import Image
+        image = Image.open(io.BytesIO(data))
+        image.load()
+        return image
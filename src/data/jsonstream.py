@@ -0,0 +1,301 @@
+"""
+..
+    /------------------------------------------------------------------------------\
+    |                 -- FACADE TECHNOLOGIES INC.  CONFIDENTIAL --                 |
+    |------------------------------------------------------------------------------|
+    |                                                                              |
+    |    Copyright [2019] Facade Technologies Inc.                                 |
+    |    All Rights Reserved.                                                      |
+    |                                                                              |
+    | NOTICE:  All information contained herein is, and remains the property of    |
+    | Facade Technologies Inc. and its suppliers if any.  The intellectual and     |
+    | and technical concepts contained herein are proprietary to Facade            |
+    | Technologies Inc. and its suppliers and may be covered by U.S. and Foreign   |
+    | Patents, patents in process, and are protected by trade secret or copyright  |
+    | law.  Dissemination of this information or reproduction of this material is  |
+    | strictly forbidden unless prior written permission is obtained from Facade   |
+    | Technologies Inc.                                                            |
+    |                                                                              |
+    \------------------------------------------------------------------------------/
+This module contains a streaming JSON writer and an atomic file writer. They are used to save projects without
+building the whole project as one string in memory, and without leaving a half-written file behind if saving fails.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+class LazyObject:
+	"""
+	A JSON object whose (key, value) pairs are produced while it is being written, so that only one value needs to
+	exist in memory at a time.
+	"""
+	
+	def __init__(self, items, chunkSize: int = 0):
+		"""
+		Constructs a LazyObject.
+		
+		:param items: An iterable of (key, value) pairs. Values may themselves be LazyObjects or LazyArrays.
+		:type items: iterable
+		:param chunkSize: If greater than 0 and the object is written with saveIndexed(), the byte range of every run
+						  of chunkSize entries is recorded, so that the entries can be parsed in parallel.
+		:type chunkSize: int
+		"""
+		self._items = items
+		self.chunkSize = chunkSize
+	
+	def items(self):
+		return self._items
+
+
+class LazyArray:
+	"""
+	A JSON array whose elements are produced while it is being written.
+	"""
+	
+	def __init__(self, elements):
+		"""
+		Constructs a LazyArray.
+		
+		:param elements: An iterable of values. Values may themselves be LazyObjects or LazyArrays.
+		:type elements: iterable
+		"""
+		self._elements = elements
+	
+	def __iter__(self):
+		return iter(self._elements)
+
+
+class _IndexingWriter:
+	"""
+	Writes text to a file while counting the bytes written and hashing them.
+	"""
+	
+	def __init__(self, file):
+		self._file = file
+		self._hash = hashlib.sha256()
+		self.size = 0
+	
+	def write(self, text: str) -> None:
+		data = text.encode('utf-8')
+		self._hash.update(data)
+		self.size += len(data)
+		self._file.write(text)
+	
+	def hexdigest(self) -> str:
+		return self._hash.hexdigest()
+
+
+def dump(obj, file, indent: int = None) -> None:
+	"""
+	Writes obj to file as JSON. Containers are written piece by piece, so LazyObjects and LazyArrays are never
+	materialized; each of their values is written with a single json.dumps call unless it is lazy too. Without
+	indent, the output uses compact separators.
+	
+	:param obj: Any JSON serializable value, which may contain LazyObjects and LazyArrays.
+	:param file: A file opened for writing text
+	:type file: file
+	:param indent: The number of spaces to indent by, or None for compact output.
+	:type indent: int
+	:return: None
+	:rtype: NoneType
+	"""
+	_dump(obj, file.write, indent, 0)
+
+
+def _keyToStr(key) -> str:
+	# Same conversions as the json module
+	if isinstance(key, str):
+		return key
+	if key is True:
+		return 'true'
+	if key is False:
+		return 'false'
+	if key is None:
+		return 'null'
+	return str(key)
+
+
+def _dumpWhole(obj, write, indent: int, level: int) -> None:
+	# Much faster than _dump for containers without lazy parts. JSON strings never contain raw newlines, so
+	# indenting every line of the output is safe.
+	try:
+		if indent is None:
+			text = json.dumps(obj, separators=(',', ':'))
+		else:
+			text = json.dumps(obj, indent=indent).replace('\n', '\n' + ' ' * (indent * level))
+	except TypeError:  # obj has lazy parts after all
+		_dump(obj, write, indent, level)
+	else:
+		write(text)
+
+
+def _dump(obj, write, indent: int, level: int, index: tuple = None) -> None:
+	# index is None, or (writer, sections, chunks, depth, path) when writing with saveIndexed()
+	if isinstance(obj, (dict, LazyObject)):
+		opening, closing = '{', '}'
+		entries = obj.items()
+	elif isinstance(obj, (list, tuple, LazyArray)):
+		opening, closing = '[', ']'
+		entries = ((None, value) for value in obj)
+	else:
+		write(json.dumps(obj))
+		return
+	
+	# The entries of lazy containers are entities that are written whole, unless they are lazy themselves.
+	isLazy = isinstance(obj, (LazyObject, LazyArray))
+	
+	isObject = opening == '{'
+	keySep = ':' if indent is None else ': '
+	newline = '' if indent is None else '\n' + ' ' * (indent * (level + 1))
+	
+	recordValues = index is not None and isObject and level < index[3]
+	chunkSize = obj.chunkSize if index is not None and isinstance(obj, LazyObject) else 0
+	if chunkSize:
+		writer = index[0]
+		chunks = index[2].setdefault(index[4].rstrip("/"), [])
+	
+	write(opening)
+	first = True
+	count = 0
+	for key, value in entries:
+		if not first:
+			write(',')
+		first = False
+		write(newline)
+		if chunkSize and count % chunkSize == 0:
+			chunks.append([writer.size, 0])
+		if isObject:
+			write(json.dumps(_keyToStr(key)))
+			write(keySep)
+		
+		childIndex = None
+		if index is not None:
+			childIndex = index[:4] + (index[4] + _keyToStr(key) + "/",)
+		if recordValues:
+			start = index[0].size
+			_dump(value, write, indent, level + 1, childIndex)
+			index[1][childIndex[4].rstrip("/")] = [start, index[0].size - start]
+		elif isLazy and not isinstance(value, (LazyObject, LazyArray)):
+			_dumpWhole(value, write, indent, level + 1)
+		else:
+			_dump(value, write, indent, level + 1, childIndex)
+		
+		count += 1
+		if chunkSize:
+			chunks[-1][1] = writer.size - chunks[-1][0]
+	if not first and indent is not None:
+		write('\n' + ' ' * (indent * level))
+	write(closing)
+
+
+@contextmanager
+def atomicWrite(path: str, binary: bool = False):
+	"""
+	Opens a temporary file next to path for writing. When the with block finishes, the file is flushed, synced to disk
+	and renamed over path, so path always holds either the old or the new contents. If the block raises, path is left
+	untouched and the temporary file is removed.
+	
+	:param path: The file to replace
+	:type path: str
+	:param binary: If True, the file is opened for writing bytes instead of text.
+	:type binary: bool
+	:return: the temporary file, opened for writing text (or bytes)
+	"""
+	directory = os.path.dirname(os.path.abspath(path))
+	fd, tmpPath = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+	try:
+		# mkstemp makes the file private; keep the permissions the file would have had otherwise.
+		os.chmod(tmpPath, os.stat(path).st_mode if os.path.exists(path) else 0o644)
+		# No newline translation, so that byte offsets are exact
+		with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', newline='')) as file:
+			yield file
+			file.flush()
+			os.fsync(file.fileno())
+		os.replace(tmpPath, path)
+	except BaseException:
+		try:
+			os.remove(tmpPath)
+		except OSError:
+			pass
+		raise
+
+
+def save(obj, path: str, indent: int = None) -> None:
+	"""
+	Streams obj to path as JSON and atomically replaces path.
+	
+	:param obj: Any JSON serializable value, which may contain LazyObjects and LazyArrays.
+	:param path: The file to write
+	:type path: str
+	:param indent: The number of spaces to indent by, or None for compact output.
+	:type indent: int
+	:return: None
+	:rtype: NoneType
+	"""
+	with atomicWrite(path) as file:
+		dump(obj, file, indent)
+
+
+def saveIndexed(obj, path: str, indent: int = None, depth: int = 2) -> dict:
+	"""
+	Streams obj to path as JSON like save(), and gets an index of where its values were written.
+	
+	:param obj: Any JSON serializable value, which may contain LazyObjects and LazyArrays.
+	:param path: The file to write
+	:type path: str
+	:param indent: The number of spaces to indent by, or None for compact output.
+	:type indent: int
+	:param depth: The number of levels of objects whose values are indexed.
+	:type depth: int
+	:return: "sections", the [offset, length] in bytes of every value in the objects of the first depth levels, keyed
+			 by the path of keys joined with "/" (e.g. "Data Structures/API Model"); "chunks", the [offset, length]
+			 of each run of entries in LazyObjects that have a chunkSize, keyed by the path of the LazyObject (see
+			 loadChunk()); "size", the number of bytes in the file; and "sha256", the hex digest of the file's
+			 contents.
+	:rtype: dict
+	"""
+	sections = {}
+	chunks = {}
+	with atomicWrite(path) as file:
+		writer = _IndexingWriter(file)
+		_dump(obj, writer.write, indent, 0, (writer, sections, chunks, depth, ""))
+	return {"sections": sections, "chunks": chunks, "size": writer.size, "sha256": writer.hexdigest()}
+
+
+def loadSection(path: str, offset: int, length: int):
+	"""
+	Reads one value from a JSON file without parsing the rest of it.
+	
+	:param path: The JSON file
+	:type path: str
+	:param offset: The byte offset of the value, as indexed by saveIndexed()
+	:type offset: int
+	:param length: The number of bytes in the value
+	:type length: int
+	:return: The value
+	"""
+	with open(path, 'rb') as file:
+		file.seek(offset)
+		return json.loads(file.read(length).decode('utf-8'))
+
+
+def loadChunk(path: str, offset: int, length: int) -> dict:
+	"""
+	Reads a run of entries of a JSON object, as indexed by saveIndexed(), without parsing the rest of the file.
+	
+	:param path: The JSON file
+	:type path: str
+	:param offset: The byte offset of the first entry's key
+	:type offset: int
+	:param length: The number of bytes up to the end of the last entry's value
+	:type length: int
+	:return: The entries, as a dictionary
+	:rtype: dict
+	"""
+	with open(path, 'rb') as file:
+		file.seek(offset)
+		return json.loads('{' + file.read(length).decode('utf-8') + '}')
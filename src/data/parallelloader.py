@@ -0,0 +1,126 @@
+"""
+..
+    /------------------------------------------------------------------------------\
+    |                 -- FACADE TECHNOLOGIES INC.  CONFIDENTIAL --                 |
+    |------------------------------------------------------------------------------|
+    |                                                                              |
+    |    Copyright [2019] Facade Technologies Inc.                                 |
+    |    All Rights Reserved.                                                      |
+    |                                                                              |
+    | NOTICE:  All information contained herein is, and remains the property of    |
+    | Facade Technologies Inc. and its suppliers if any.  The intellectual and     |
+    | and technical concepts contained herein are proprietary to Facade            |
+    | Technologies Inc. and its suppliers and may be covered by U.S. and Foreign   |
+    | Patents, patents in process, and are protected by trade secret or copyright  |
+    | law.  Dissemination of this information or reproduction of this material is  |
+    | strictly forbidden unless prior written permission is obtained from Facade   |
+    | Technologies Inc.                                                            |
+    |                                                                              |
+    \------------------------------------------------------------------------------/
+This module loads the components of large projects in parallel, using a pool of worker processes.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from data.projectmanifest import ProjectManifest
+
+# The number of components in each run of the components section that a worker parses. Projects record these runs in
+# their manifest when they're saved.
+COMPONENTS_PER_CHUNK = 2000
+
+# Below this many components, starting the worker processes takes longer than loading the project in one process.
+MIN_PARALLEL_COMPONENTS = 20000
+
+
+def _initializeWorker() -> None:
+	"""
+	Runs once in each worker process. Worker processes start with the "API" context, which doesn't import Facile's
+	data structures.
+	"""
+	import libs.env as env
+	env.updateContext("Facile")
+
+
+def _loadChunk(projectFile: str, chunk) -> list:
+	"""
+	Parses a run of the components section and builds the parts of the components that aren't Qt objects.
+	
+	Runs in a worker process. Each component's dictionary is returned with its "superToken" and "properties" already
+	built, since SuperTokens, Tokens and Properties are plain Python objects that can be sent back to Facile. Token
+	pictures aren't read; they stay in the image store until they're first used.
+	
+	:param projectFile: The project's .fcl file.
+	:type projectFile: str
+	:param chunk: The run, as returned by ProjectManifest.getChunks().
+	:type chunk: list or str
+	:return: A list of (id, component dictionary) pairs.
+	:rtype: list
+	"""
+	from tguiil.supertokens import SuperToken
+	from data.properties import Properties
+	
+	components = ProjectManifest.readChunk(projectFile, chunk)
+	for compDict in components.values():
+		compDict["superToken"] = SuperToken.fromDict(compDict["superToken"])
+		compDict["properties"] = Properties.fromDict(compDict["properties"])
+	return list(components.items())
+
+
+def _attachImages(superToken: 'SuperToken', imageStore: 'ImageStore') -> None:
+	"""
+	Gives the tokens of a SuperToken that was built in a worker process the lazy handles of their pictures.
+	"""
+	if superToken is None or imageStore is None:
+		return
+	for token in superToken.tokens:
+		if token.picHash:
+			token.pic = imageStore.getLazy(token.picHash)
+		elif token.hasPicture():  # An inline picture from before the image store; move it to the store
+			token.picHash = imageStore.put(token.pic)
+			token.pic = imageStore.getLazy(token.picHash)
+
+
+def loadComponents(projectFile: str, chunks: list, imageStore: 'ImageStore' = None, maxWorkers: int = None) -> dict:
+	"""
+	Loads the components section of a project in parallel.
+	
+	The chunks are parsed by a pool of worker processes, and the results are put back together in the order of the
+	file. Only turning the results into Qt objects and linking them (TargetGuiModel.fromDict) is left for the main
+	thread.
+	
+	:param projectFile: The project's .fcl file.
+	:type projectFile: str
+	:param chunks: The runs of the components section, from the project's manifest.
+	:type chunks: list
+	:param imageStore: The project's image store, which the token pictures are read from when first used.
+	:type imageStore: ImageStore
+	:param maxWorkers: The number of worker processes, or None to use one per CPU.
+	:type maxWorkers: int
+	:return: The components section, mapping IDs to component dictionaries with built SuperTokens and Properties.
+	:rtype: dict
+	"""
+	maxWorkers = min(maxWorkers or os.cpu_count() or 1, len(chunks)) or 1
+	components = {}
+	with ProcessPoolExecutor(maxWorkers, initializer=_initializeWorker) as pool:
+		futures = [pool.submit(_loadChunk, projectFile, chunk) for chunk in chunks]
+		for future in futures:
+			for id, compDict in future.result():
+				_attachImages(compDict["superToken"], imageStore)
+				components[id] = compDict
+	return components
+
+
+def shouldLoadInParallel(manifest: ProjectManifest) -> bool:
+	"""
+	Determines whether a project is big enough, and was saved with the chunk index, to be loaded in parallel.
+	
+	:param manifest: The manifest of the project's .fcl file, or None.
+	:type manifest: ProjectManifest
+	:return: True if loadComponents() should be used.
+	:rtype: bool
+	"""
+	if manifest is None or not manifest.getChunks("Data Structures/Target GUI Model/components"):
+		return False
+	numComponents = manifest.getCount("Components") or 0
+	return numComponents >= MIN_PARALLEL_COMPONENTS and (os.cpu_count() or 1) > 1
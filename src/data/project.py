@@ -24,6 +24,7 @@ This module contains the Project class.
 from typing import Dict, Tuple
 import json
 import os
+import shutil
 from subprocess import PIPE
 
 import psutil
@@ -33,9 +34,18 @@ from PySide2.QtCore import Qt, QTimer
 from data.tguim.targetguimodel import TargetGuiModel
 from data.apim.apimodel import ApiModel
 from data.entity import Entity
+import data.jsonstream as jsonstream
+from data.imagestore import ImageStore
+from data.projectjournal import ChangeTracker, ProjectJournal
+from data.projectmanifest import ProjectManifest
+from data.projectcontainer import ProjectContainer
+import data.parallelloader as parallelloader
+from data.projectsaver import SaveSnapshot
 from qt_models.projectexplorermodel import ProjectExplorerModel
 from tguiil.explorer import Explorer
 from tguiil.observer import Observer
+from tguiil.supertokens import SuperToken
+from tguiil.tokens import Token
 import data.statemachine as sm
 
 import libs.env as env
@@ -92,7 +102,13 @@ class Project:
 		self.autoCloseAppOnExit = None
 		self.acaWarningShown = False
 		self._notif = None  # This temporarily holds a dialog
+		self._imageStore = None
+		self._compression = ProjectContainer.DEFAULT_COMPRESSION  # If None, .fcl files are plain JSON
 		self._timer = None
+		self._journal = None
+		self._snapshotID = None  # The ID of the .fcl snapshot that the journal applies to
+		self._changeTracker = ChangeTracker()
+		self._entityDicts = {}  # The dictionary of each component and visibility behavior, as of the last save
 		
 		# project information
 		self.setProjectDir(os.path.abspath(projectDir))
@@ -364,6 +380,97 @@ class Project:
 		"""
 		
 		return os.path.join(self._projectDir, self._name + ".fcl")
+	
+	def setCompression(self, compression: str) -> None:
+		"""
+		Sets how the project's .fcl file is compressed. The next full save writes the file with the chosen
+		compression.
+		
+		:param compression: "deflate" or "lzma" to save a compressed ProjectContainer, or None to save plain JSON.
+		:type compression: str
+		:return: None
+		:rtype: NoneType
+		"""
+		
+		if compression is not None and compression not in ProjectContainer.COMPRESSIONS:
+			raise ValueError("Unknown compression: {}".format(compression))
+		self._compression = compression
+	
+	def getCompression(self) -> str:
+		"""
+		Gets how the project's .fcl file is compressed.
+		
+		:return: "deflate" or "lzma", or None if the .fcl file is plain JSON.
+		:rtype: str
+		"""
+		
+		return self._compression
+
+	def getImageStoreFile(self) -> str:
+		"""
+		Gets the path to the project's image store, which holds the pictures of the project's tokens.
+		
+		:return: The path to the project's .fcli file
+		:rtype: str
+		"""
+		
+		return os.path.join(self._projectDir, self._name + ".fcli")
+
+	def getJournalFile(self) -> str:
+		"""
+		Gets the path to the project's journal, which holds the changes saved since the .fcl file was last rewritten.
+		
+		:return: The path to the project's .fclj file
+		:rtype: str
+		"""
+		
+		return os.path.join(self._projectDir, self._name + ".fclj")
+	
+	def getJournal(self) -> ProjectJournal:
+		"""
+		Gets the project's journal. A new journal is opened if the project's directory or name changed.
+		
+		:return: The project's journal
+		:rtype: ProjectJournal
+		"""
+		
+		if self._journal is None or self._journal.getPath() != self.getJournalFile():
+			self._journal = ProjectJournal(self.getJournalFile())
+		return self._journal
+	
+	def trackChanges(self) -> None:
+		"""
+		Makes this project the one that entities and SuperTokens report their changes to. This should be called for
+		the project that is open in Facile; changes are only written incrementally for the tracked project.
+		
+		:return: None
+		:rtype: NoneType
+		"""
+		
+		Entity.changeTracker = self._changeTracker
+		SuperToken.changeTracker = self._changeTracker
+	
+	def hasUnsavedChanges(self) -> bool:
+		"""
+		Determines whether anything in the project changed since it was last saved.
+		
+		:return: True if the project has unsaved changes.
+		:rtype: bool
+		"""
+		
+		return self._changeTracker.hasChanges()
+
+	def getImageStore(self) -> ImageStore:
+		"""
+		Gets the project's image store. A new store is opened if the project's directory or name changed.
+		
+		:return: The project's image store
+		:rtype: ImageStore
+		"""
+		
+		if self._imageStore is None or self._imageStore.getPath() != self.getImageStoreFile():
+			self._imageStore = ImageStore(self.getImageStoreFile())
+		return self._imageStore
 
 	def startTargetApplication(self) -> None:
 		"""
@@ -423,8 +530,25 @@ class Project:
 		:rtype: Project
 		"""
 		
-		with open(projectFile) as mainProjectFile:
-			projectJSON = json.loads(mainProjectFile.read())
+		journal = None
+		snapshotID = None
+		imageStore = None
+		manifest = ProjectManifest.read(projectFile)
+		if parallelloader.shouldLoadInParallel(manifest):
+			projectJSON, imageStore = Project._loadInParallel(projectFile, manifest)
+		else:
+			projectJSON = Project._readSnapshot(projectFile)
+		
+		# Replay the changes saved since the snapshot was written. This also recovers every save that finished
+		# before a crash, since each one is flushed to the journal before save() returns.
+		snapshotID = projectJSON["Project Information"].get("Snapshot ID")
+		journal = ProjectJournal(os.path.splitext(projectFile)[0] + ".fclj")
+		numRecords = 0
+		for record in journal.records(snapshotID):
+			ProjectJournal.apply(projectJSON, record)
+			numRecords += 1
+		if numRecords:
+			logger.info("Replayed {} saves from the project journal.".format(numRecords))
 		
 		projectDir = os.path.dirname(projectFile)
 		name = projectJSON["Project Information"]["Name"]
@@ -434,20 +558,87 @@ class Project:
 		startupTimeout = projectJSON["Application Information"]["Startup Timeout"]
 		autoClose = projectJSON["Settings"]["Close App on Exit"]
 		warningShown = projectJSON["Settings"]["AutoClose Warning Shown"]
+		# Projects from before compressed containers are plain JSON. They're compressed the next time they're saved.
+		compression = projectJSON["Settings"].get("Compression", ProjectContainer.DEFAULT_COMPRESSION)
 		
 		loadedProject = Project(name, description, exe, backend, projectDir, startupTimeout)
+		loadedProject.setCompression(compression)
 		loadedProject.autoCloseAppOnExit = autoClose
 		loadedProject.acaWarningShown = warningShown
+		loadedProject._journal = journal
+		if imageStore is not None and imageStore.getPath() == loadedProject.getImageStoreFile():
+			loadedProject._imageStore = imageStore
+		loadedProject._snapshotID = snapshotID
 
 		Entity.onCreation = onEntityCreation
-		loadedProject._targetGUIModel = TargetGuiModel.fromDict(projectJSON["Data Structures"]["Target GUI Model"])
-		loadedProject._apiModel = ApiModel.fromDict(projectJSON["Data Structures"]["API Model"],
-													loadedProject._targetGUIModel)
+		imageStore = loadedProject.getImageStore()  # Token pictures are decoded from it when first used
+		numImages = len(imageStore)
+		Token.imageStore = imageStore
+		try:
+			loadedProject._targetGUIModel = TargetGuiModel.fromDict(projectJSON["Data Structures"]["Target GUI Model"])
+			loadedProject._apiModel = ApiModel.fromDict(projectJSON["Data Structures"]["API Model"],
+														loadedProject._targetGUIModel)
+		finally:
+			Token.imageStore = None
+			Entity.onCreation = None
+
+		# Projects saved before the image store existed have their pictures inline. Now that they're in the store,
+		# rewrite the project file without them.
+		if len(imageStore) > numImages:
+			logger.info("Moved token pictures into the image store. Resaving the project.")
+			loadedProject.save()
 
-		Entity.onCreation = None
 		onCompletion()
 		return loadedProject
 
+	@staticmethod
+	def _loadInParallel(projectFile: str, manifest: ProjectManifest) -> Tuple[dict, ImageStore]:
+		"""
+		Reads a .fcl snapshot section by section, parsing the components in worker processes.
+		
+		:param projectFile: The project's .fcl file
+		:type projectFile: str
+		:param manifest: The manifest of the .fcl file
+		:type manifest: ProjectManifest
+		:return: The project dictionary, and the image store that the token pictures are read from.
+		:rtype: tuple[dict, ImageStore]
+		"""
+		
+		projectJSON = {}
+		for section in ("Project Information", "Application Information", "Settings"):
+			projectJSON[section] = manifest.readSection(projectFile, section)
+		
+		tguimSection = "Data Structures/Target GUI Model/"
+		tguimDict = {}
+		for key in ("root", "behaviors", "Entity Count", "SuperToken Count"):
+			tguimDict[key] = manifest.readSection(projectFile, tguimSection + key)
+		
+		name = projectJSON["Project Information"]["Name"]
+		imageStore = ImageStore(os.path.join(os.path.dirname(projectFile), name + ".fcli"))
+		chunks = manifest.getChunks(tguimSection + "components")
+		tguimDict["components"] = parallelloader.loadComponents(projectFile, chunks, imageStore)
+		
+		projectJSON["Data Structures"] = {"Target GUI Model": tguimDict,
+										  "API Model": manifest.readSection(projectFile, "Data Structures/API Model")}
+		return projectJSON, imageStore
+
+	@staticmethod
+	def _readSnapshot(projectFile: str) -> dict:
+		"""
+		Reads a whole .fcl snapshot, whether it's a compressed container or plain JSON.
+		
+		:param projectFile: The project's .fcl file
+		:type projectFile: str
+		:return: The project dictionary, as it is in the snapshot (changes in the journal aren't applied).
+		:rtype: dict
+		"""
+		
+		if ProjectContainer.isContainer(projectFile):
+			with ProjectContainer(projectFile) as container:
+				return container.load()
+		with open(projectFile) as mainProjectFile:
+			return json.loads(mainProjectFile.read())
+
 	@staticmethod
 	def getEntityCount(mainFile:str) -> None:
 		"""
@@ -457,6 +648,15 @@ class Project:
 		:type mainFile: str
 		:return:
 		"""
+		manifest = ProjectManifest.read(mainFile)
+		if manifest is not None:
+			return manifest.getCount("Model Entities")
+		
+		if ProjectContainer.isContainer(mainFile):
+			with ProjectContainer(mainFile) as container:
+				return container.readSection("Project Information").get("Model Entities", 1_000_000)
+		
+		# Projects saved before manifests existed have to be parsed.
 		mainProjectFile = open(mainFile)
 		contents = mainProjectFile.read()
 		projectJSON = json.loads(contents)
@@ -464,34 +664,414 @@ class Project:
 
 		return projectJSON["Project Information"].get("Model Entities", 1_000_000)
 	
-	def save(self) -> None:
+	@staticmethod
+	def getProjectInfo(projectFile: str) -> dict:
+		"""
+		Gets the "Project Information" section of a project file (name, description, number of entities) without
+		loading the project. This is fast enough to call for every recent project.
+		
+		:param projectFile: The project's .fcl file.
+		:type projectFile: str
+		:return: The project information, or None if it can't be read quickly (e.g. the .fcl file is plain JSON and has
+				 no manifest).
+		:rtype: dict
+		"""
+		
+		manifest = ProjectManifest.read(projectFile)
+		if manifest is not None:
+			return manifest.getSection("Project Information")
+		if ProjectContainer.isContainer(projectFile):
+			try:
+				with ProjectContainer(projectFile) as container:
+					return container.readSection("Project Information")
+			except Exception as e:
+				logger.exception(e)
+		return None
+	
+	@staticmethod
+	def readInfoSections(projectFile: str) -> dict:
+		"""
+		Reads the project information, application information and settings sections of a project without loading
+		the project. Changes saved in the project's journal are included.
+		
+		This only reads the manifest when there is one. Otherwise it reads a member of a container, or parses a plain
+		JSON file, which is still much faster than loading the project.
+		
+		:param projectFile: The project's .fcl file.
+		:type projectFile: str
+		:return: The three sections, by name.
+		:rtype: dict
+		"""
+		
+		sectionNames = ("Project Information", "Application Information", "Settings")
+		manifest = ProjectManifest.read(projectFile)
+		if manifest is not None:  # Every save updates the manifest, including saves that only write the journal
+			return {name: manifest.getSection(name) for name in sectionNames}
+		
+		if ProjectContainer.isContainer(projectFile):
+			with ProjectContainer(projectFile) as container:
+				sections = {name: container.readSection(name) for name in sectionNames}
+		else:
+			snapshot = Project._readSnapshot(projectFile)
+			sections = {name: snapshot[name] for name in sectionNames}
+		journal = ProjectJournal(os.path.splitext(projectFile)[0] + ".fclj")
+		for record in journal.records(sections["Project Information"].get("Snapshot ID")):
+			sections.update(record.get("sections", {}))
+		return sections
+	
+	@staticmethod
+	def copyFiles(projectFile: str, newDir: str, newName: str, newDescription: str) -> str:
+		"""
+		Makes a new project by copying the files of an existing one. Neither project is loaded.
+		
+		The .fcl snapshot is hard-linked when the file system allows it. Saves replace the snapshot rather than
+		modifying it, so the two projects share it until one of them writes a new one. The image store and journal
+		are appended to, so they're copied. The new name and description are appended to the new project's journal,
+		and its manifest is rewritten with them.
+		
+		:param projectFile: The existing project's .fcl file.
+		:type projectFile: str
+		:param newDir: The directory of the new project.
+		:type newDir: str
+		:param newName: The name of the new project.
+		:type newName: str
+		:param newDescription: The description of the new project.
+		:type newDescription: str
+		:return: The new project's .fcl file.
+		:rtype: str
+		"""
+		
+		sections = Project.readInfoSections(projectFile)
+		info = dict(sections["Project Information"])
+		info["Name"] = newName
+		info["Description"] = newDescription
+		sections["Project Information"] = info
+		
+		oldBase = os.path.splitext(projectFile)[0]
+		newBase = os.path.join(newDir, newName)
+		newFile = newBase + os.path.splitext(projectFile)[1]
+		if os.path.exists(oldBase + ".fcli"):
+			shutil.copyfile(oldBase + ".fcli", newBase + ".fcli")
+		
+		manifest = ProjectManifest.read(projectFile)
+		try:
+			os.link(projectFile, newFile)
+		except OSError:  # e.g. the directories are on different drives
+			shutil.copy2(projectFile, newFile)  # Keeps the modification time, so the manifest stays valid
+		
+		snapshotID = info.get("Snapshot ID")
+		if snapshotID is None:
+			# The snapshot is from before journals existed, so the new name has to be written into it.
+			snapshot = Project._readSnapshot(newFile)
+			snapshot.update(sections)
+			jsonstream.save(snapshot, newFile)
+			return newFile
+		
+		if os.path.exists(oldBase + ".fclj"):
+			shutil.copyfile(oldBase + ".fclj", newBase + ".fclj")
+		journal = ProjectJournal(newBase + ".fclj")
+		if journal.getSnapshotID() != snapshotID:
+			journal.reset(snapshotID)
+		journal.append({"sections": sections})
+		
+		if manifest is not None:
+			try:
+				ProjectManifest.create(newFile, sections, manifest.getCounts(), previous=manifest).write(newFile)
+			except OSError as e:
+				logger.exception(e)
+		return newFile
+	
+	def save(self, indent: int = None, full: bool = False) -> None:
+		"""
+		Writes a project out to disk.
+		
+		Normally only the entities that changed since the last save are written, by appending them to the project's
+		journal (.fclj). The whole project is written to the .fcl file (a snapshot) when there is no snapshot yet, when
+		the journal has grown too large, when the .fcl file isn't in the project's format (e.g. it's plain JSON but the
+		project is compressed), when an indent is given, or when full is True. Writing a snapshot starts a new journal.
+		Snapshots are compressed ProjectContainers unless an indent is given or the project's compression is None.
+		
+		To save without blocking the UI, use a ProjectSaver, which calls createSaveSnapshot() and
+		writeSaveSnapshot() on different threads.
+		
+		:param indent: The number of spaces to indent a .fcl file by, or None for a compact file.
+		:type indent: int
+		:param full: If True, write a snapshot even if the changes could be appended to the journal.
+		:type full: bool
+		:return: None
+		:rtype: NoneType
+		"""
+		
+		self.writeSaveSnapshot(self.createSaveSnapshot(indent, full))
+	
+	def createSaveSnapshot(self, indent: int = None, full: bool = False) -> SaveSnapshot:
+		"""
+		Captures everything that the next save will write. This must be called on the main thread, since that's where
+		the models are modified.
+		
+		Each entity's dictionary is kept between saves and only rebuilt when the entity changes, so capturing the
+		project is cheap: the snapshot shares the dictionaries of unchanged entities with earlier snapshots, and
+		nothing in it is modified afterwards. If full is True, every dictionary is rebuilt.
+		
+		:param indent: The number of spaces to indent a .fcl file by, or None for a compact file.
+		:type indent: int
+		:param full: If True, write a snapshot even if the changes could be appended to the journal.
+		:type full: bool
+		:return: The captured project, ready to be written by writeSaveSnapshot() on any thread.
+		:rtype: SaveSnapshot
+		"""
+		
+		snapshot = SaveSnapshot(self.getProjectFile(), self.getJournal(), indent)
+		snapshot.compression = self._compression if indent is None else None
+		snapshot.counts = {"Model Entities": Entity.count,
+						   "Components": len(self._targetGUIModel.getComponents()),
+						   "Visibility Behaviors": len(self._targetGUIModel.getVisibilityBehaviors()),
+						   "Action Pipelines": len(self._apiModel.getActionPipelines())}
+		
+		incremental = not (full or indent is not None)
+		if incremental:
+			projectFile = snapshot.projectFile
+			journal = snapshot.journal
+			incremental = os.path.exists(projectFile) and self._snapshotID is not None and \
+			              journal.getSnapshotID() == self._snapshotID and \
+			              ProjectContainer.isContainer(projectFile) == (snapshot.compression is not None) and \
+			              not journal.needsCompaction(os.path.getsize(projectFile))
+		
+		# Changes made after this (e.g. by the observer) are kept for the next save.
+		snapshot.changes = self._changeTracker.takeChanges()
+		if full:
+			self._entityDicts.clear()
+		
+		# Token pictures are put in the image store as the tokens are converted to dictionaries.
+		Token.imageStore = self.getImageStore()
+		try:
+			changedIDs, apimChanged = self._updateEntityDicts(snapshot.changes)
+			snapshot.previousSnapshotID = self._snapshotID
+			if incremental:
+				snapshot.record = self._getChangeRecord(changedIDs, snapshot.changes[1], apimChanged)
+			else:
+				self._snapshotID = ProjectJournal.newSnapshotID()
+				snapshot.snapshotID = self._snapshotID
+				snapshot.projectDict = self._getSnapshotDict()
+		except:
+			self._changeTracker.restoreChanges(snapshot.changes)
+			self._snapshotID = snapshot.previousSnapshotID
+			raise
+		finally:
+			Token.imageStore = None
+		
+		return snapshot
+	
+	def writeSaveSnapshot(self, snapshot: SaveSnapshot, onProgress = None) -> None:
+		"""
+		Writes a snapshot created by createSaveSnapshot(). This may be called on a worker thread, because it only
+		reads the snapshot. Snapshots must be written in the order that they were created.
+		
+		If writing fails, the snapshot's changes are recorded again so that the next save writes them.
+		
+		:param snapshot: The snapshot to write.
+		:type snapshot: SaveSnapshot
+		:param onProgress: If not None, called with the number of components written so far and the total.
+		:type onProgress: callable
+		:return: None
+		:rtype: NoneType
+		"""
+		
+		try:
+			if snapshot.record is not None:
+				snapshot.journal.append(snapshot.record)
+				self._writeManifest(snapshot, snapshot.record["sections"])
+				if onProgress:
+					onProgress(1, 1)
+			else:
+				projectDict = dict(snapshot.projectDict)
+				projectDict["Data Structures"] = dict(projectDict["Data Structures"])
+				tguimDict = dict(projectDict["Data Structures"]["Target GUI Model"])
+				tguimDict["components"] = jsonstream.LazyObject(Project._reportProgress(tguimDict["components"],
+																						onProgress),
+																 parallelloader.COMPONENTS_PER_CHUNK)
+				projectDict["Data Structures"]["Target GUI Model"] = tguimDict
+				
+				# Stream the project file to a temporary file, then atomically replace the old one. Where the sections
+				# are is recorded for the manifest.
+				if snapshot.compression is not None:
+					index = ProjectContainer.save(projectDict, snapshot.projectFile, snapshot.compression, depth=3)
+				else:
+					index = jsonstream.saveIndexed(projectDict, snapshot.projectFile, snapshot.indent, depth=3)
+				
+				# If this doesn't happen because of a crash, the old journal is ignored because its snapshot ID
+				# doesn't match.
+				snapshot.journal.reset(snapshot.snapshotID)
+				self._writeManifest(snapshot, snapshot.projectDict, index)
+		except:
+			self._changeTracker.restoreChanges(snapshot.changes)
+			if snapshot.snapshotID is not None and self._snapshotID == snapshot.snapshotID:
+				self._snapshotID = snapshot.previousSnapshotID
+			raise
+	
+	@staticmethod
+	def _writeManifest(snapshot: SaveSnapshot, sections: dict, index: dict = None) -> None:
 		"""
-		Writes a project out to disk as a set of files. (.fcl, .tguim, .apim)
+		Writes the manifest of a .fcl file after a save. The manifest only speeds up reading the project, so failing
+		to write it doesn't fail the save; the .fcl file is parsed instead until the next save.
 		
+		:param snapshot: The snapshot that was written.
+		:type snapshot: SaveSnapshot
+		:param sections: A dictionary with the info sections that were saved.
+		:type sections: dict
+		:param index: The index of the .fcl file if it was written, or None if only the journal was written.
+		:type index: dict
 		:return: None
 		:rtype: NoneType
 		"""
 		
-		projectDict = {}
-		projectDict["Project Information"] = {}
-		projectDict["Project Information"]["Name"] = self._name
-		projectDict["Project Information"]["Description"] = self._description
-		projectDict["Project Information"]["Model Entities"] = Entity.count
-		projectDict["Application Information"] = {}
-		projectDict["Application Information"]["Target Application"] = self._executable
-		projectDict["Application Information"]["Backend"] = self._backend
-		projectDict["Application Information"]["Startup Timeout"] = self._startupTimeout
-		projectDict["Settings"] = {}
-		projectDict["Settings"]["Close App on Exit"] = self.autoCloseAppOnExit
-		projectDict["Settings"]["AutoClose Warning Shown"] = self.acaWarningShown
+		infoSections = {name: sections[name] for name in ("Project Information", "Application Information",
+														   "Settings")}
+		try:
+			previous = None if index else ProjectManifest.read(snapshot.projectFile)
+			manifest = ProjectManifest.create(snapshot.projectFile, infoSections, snapshot.counts, index, previous)
+			manifest.write(snapshot.projectFile)
+		except OSError as e:
+			logger.exception(e)
+	
+	@staticmethod
+	def _reportProgress(components: dict, onProgress):
+		"""
+		Generates the (id, dictionary) pairs of components, calling onProgress every so often.
+		"""
+		total = len(components)
+		for i, item in enumerate(components.items()):
+			if onProgress and i % 1000 == 0:
+				onProgress(i, total)
+			yield item
+		if onProgress:
+			onProgress(total, total)
+	
+	def _updateEntityDicts(self, changes: tuple) -> tuple:
+		"""
+		Rebuilds the stored dictionaries of the components and visibility behaviors that changed.
+		
+		:param changes: The changes taken from the project's ChangeTracker.
+		:type changes: tuple[set, set, set]
+		:return: The IDs of the entities that changed and weren't removed, and whether an entity of the API model
+				 changed.
+		:rtype: tuple[set, bool]
+		"""
+		
+		changedIDs, removedIDs, superTokens = changes
+		tguim = self._targetGUIModel
+		
+		changedIDs = set(changedIDs)
+		for superToken in superTokens:
+			component = tguim.getComponentWithSuperToken(superToken)
+			if component is not None:
+				changedIDs.add(component.getId())
+		
+		apimChanged = False
+		rootID = tguim.getRoot().getId()
+		for id in changedIDs - removedIDs:
+			entity = tguim.getEntity(id)
+			if entity is not None:
+				self._entityDicts[id] = entity.asDict()
+			elif id != rootID:
+				apimChanged = True
+		for id in removedIDs:
+			self._entityDicts.pop(id, None)
+		
+		return changedIDs - removedIDs, apimChanged
+	
+	def _getEntityDict(self, entity: 'Entity') -> dict:
+		"""
+		Gets the stored dictionary of a component or visibility behavior, building it if there isn't one yet.
+		"""
+		d = self._entityDicts.get(entity.getId())
+		if d is None:
+			d = self._entityDicts[entity.getId()] = entity.asDict()
+		return d
+	
+	def _getInfoSections(self) -> dict:
+		"""
+		Gets the sections of the project file that aren't data structures.
+		
+		:return: The project information, application information and settings sections.
+		:rtype: dict
+		"""
+		
+		sections = {}
+		sections["Project Information"] = {}
+		sections["Project Information"]["Name"] = self._name
+		sections["Project Information"]["Description"] = self._description
+		sections["Project Information"]["Model Entities"] = Entity.count
+		sections["Project Information"]["Snapshot ID"] = self._snapshotID
+		sections["Application Information"] = {}
+		sections["Application Information"]["Target Application"] = self._executable
+		sections["Application Information"]["Backend"] = self._backend
+		sections["Application Information"]["Startup Timeout"] = self._startupTimeout
+		sections["Settings"] = {}
+		sections["Settings"]["Close App on Exit"] = self.autoCloseAppOnExit
+		sections["Settings"]["AutoClose Warning Shown"] = self.acaWarningShown
+		sections["Settings"]["Compression"] = self._compression
+		return sections
+	
+	def _getSnapshotDict(self) -> dict:
+		"""
+		Gets the dictionary of the whole project, using the stored entity dictionaries.
+		
+		:return: The project dictionary, laid out like a .fcl file.
+		:rtype: dict
+		"""
+		
+		tguim = self._targetGUIModel
+		tguimDict = {"root": tguim.getRoot().asDict(),
+					 "components": {id: self._getEntityDict(comp) for id, comp in tguim.getComponents().items()},
+					 "behaviors": {id: self._getEntityDict(vb) for id, vb in tguim.getVisibilityBehaviors().items()},
+					 "Entity Count": Entity.count,
+					 "SuperToken Count": SuperToken.id_counter}
+		
+		projectDict = self._getInfoSections()
 		projectDict["Data Structures"] = {}
-		projectDict["Data Structures"]["Target GUI Model"] = self._targetGUIModel.asDict()
+		projectDict["Data Structures"]["Target GUI Model"] = tguimDict
 		projectDict["Data Structures"]["API Model"] = self._apiModel.asDict()
-
-		# save the project file
-		with open(self.getProjectFile(), "w") as file:
-			s = json.dumps(projectDict, indent=4)
-			file.write(s)
+		return projectDict
+	
+	def _getChangeRecord(self, changedIDs: set, removedIDs: set, apimChanged: bool) -> dict:
+		"""
+		Gets a journal record with the entities that changed.
+		
+		Changed components and visibility behaviors are stored individually. The API model is small compared to the
+		target GUI model, so it's stored whole when any of its entities changed.
+		
+		:param changedIDs: The IDs of the entities that changed and weren't removed.
+		:type changedIDs: set
+		:param removedIDs: The IDs of the entities that were removed.
+		:type removedIDs: set
+		:param apimChanged: True if an entity of the API model changed.
+		:type apimChanged: bool
+		:return: The record to append to the journal.
+		:rtype: dict
+		"""
+		
+		tguim = self._targetGUIModel
+		
+		components = {}
+		behaviors = {}
+		for id in changedIDs:
+			if tguim.getComponent(id) is not None:
+				components[id] = self._entityDicts[id]
+			elif tguim.getVisibilityBehavior(id) is not None:
+				behaviors[id] = self._entityDicts[id]
+		
+		record = {"sections": self._getInfoSections(),
+				  "root": tguim.getRoot().asDict(),
+				  "components": components,
+				  "behaviors": behaviors,
+				  "removed behaviors": [id for id in removedIDs if tguim.getVisibilityBehavior(id) is None],
+				  "removed components": [id for id in removedIDs if tguim.getComponent(id) is None],
+				  "Entity Count": Entity.count,
+				  "SuperToken Count": SuperToken.id_counter}
+		if apimChanged:
+			record["API Model"] = self._apiModel.asDict()
+		return record
 
 	def addToRecents(self) -> None:
 		"""
@@ -0,0 +1,278 @@
+"""
+..
+    /------------------------------------------------------------------------------\
+    |                 -- FACADE TECHNOLOGIES INC.  CONFIDENTIAL --                 |
+    |------------------------------------------------------------------------------|
+    |                                                                              |
+    |    Copyright [2019] Facade Technologies Inc.                                 |
+    |    All Rights Reserved.                                                      |
+    |                                                                              |
+    | NOTICE:  All information contained herein is, and remains the property of    |
+    | Facade Technologies Inc. and its suppliers if any.  The intellectual and     |
+    | and technical concepts contained herein are proprietary to Facade            |
+    | Technologies Inc. and its suppliers and may be covered by U.S. and Foreign   |
+    | Patents, patents in process, and are protected by trade secret or copyright  |
+    | law.  Dissemination of this information or reproduction of this material is  |
+    | strictly forbidden unless prior written permission is obtained from Facade   |
+    | Technologies Inc.                                                            |
+    |                                                                              |
+    \------------------------------------------------------------------------------/
+
+This module contains the ProjectContainer class, which reads and writes compressed project files.
+"""
+
+import hashlib
+import io
+import json
+import zipfile
+
+import data.jsonstream as jsonstream
+
+
+class _HashingFile:
+	"""
+	Writes bytes to a file while counting and hashing them. It can't seek, so zipfile writes the archive in one pass.
+	"""
+	
+	def __init__(self, file):
+		self._file = file
+		self._hash = hashlib.sha256()
+		self.size = 0
+	
+	def write(self, data: bytes) -> int:
+		self._hash.update(data)
+		self.size += len(data)
+		return self._file.write(data)
+	
+	def tell(self) -> int:
+		return self.size
+	
+	def flush(self) -> None:
+		self._file.flush()
+	
+	def hexdigest(self) -> str:
+		return self._hash.hexdigest()
+
+
+class ProjectContainer:
+	"""
+	A compressed project file (.fcl).
+	
+	The container is a zip archive in which each section of the project is a separate JSON member, so any section
+	can be decompressed and parsed without reading the others. Members are named after the path of keys to their
+	section, e.g. "Data Structures/API Model.json". The entries of LazyObjects that have a chunkSize (the components
+	of the target GUI model) are split over several members, so that they can be parsed one run at a time, or in
+	parallel. The "Format.json" member records the format version, the compression, and the layout of the sections.
+	
+	Token pictures aren't in the container; they're in the project's image store, which is already compressed.
+	
+	Project files saved before containers existed are plain JSON, which isContainer() tells apart. They are still
+	read as they are, and become containers the next time the whole project is saved.
+	"""
+	
+	VERSION = 1
+	FORMAT_MEMBER = "Format.json"
+	COMPRESSIONS = {"deflate": zipfile.ZIP_DEFLATED, "lzma": zipfile.ZIP_LZMA}
+	DEFAULT_COMPRESSION = "deflate"  # lzma makes smaller files, but saves several times slower
+	
+	def __init__(self, path: str):
+		"""
+		Constructs a ProjectContainer for reading. The file is opened by the with statement.
+		
+		:param path: The project's .fcl file.
+		:type path: str
+		"""
+		self._path = path
+		self._zipFile = None
+		self._format = None
+	
+	def __enter__(self) -> 'ProjectContainer':
+		self._zipFile = zipfile.ZipFile(self._path, "r")
+		try:
+			self._format = self.readMember(ProjectContainer.FORMAT_MEMBER)
+			if self._format.get("Format Version", 0) > ProjectContainer.VERSION:
+				raise ValueError("{} was saved by a newer version of Facile (project format version {})."
+								 .format(self._path, self._format["Format Version"]))
+		except:
+			self._zipFile.close()
+			raise
+		return self
+	
+	def __exit__(self, excType, excValue, traceback) -> None:
+		self._zipFile.close()
+	
+	@staticmethod
+	def isContainer(path: str) -> bool:
+		"""
+		Determines whether a project file is a compressed container rather than plain JSON. Only the first bytes of
+		the file are read.
+		
+		:param path: The project's .fcl file.
+		:type path: str
+		:return: True if the file is a container.
+		:rtype: bool
+		"""
+		try:
+			with open(path, "rb") as f:
+				return f.read(4) == b"PK\x03\x04"
+		except OSError:
+			return False
+	
+	@staticmethod
+	def save(obj: dict, path: str, compression: str = DEFAULT_COMPRESSION, depth: int = 3) -> dict:
+		"""
+		Streams obj to path as a container, and atomically replaces path.
+		
+		Objects in the first depth levels are split into a member for each of their values, as long as one of their
+		values is an object; other values are written whole. Members are written one at a time with jsonstream, so a
+		LazyObject is never materialized.
+		
+		:param obj: The project's dictionary, which may contain LazyObjects and LazyArrays.
+		:type obj: dict
+		:param path: The file to write.
+		:type path: str
+		:param compression: "deflate" or "lzma".
+		:type compression: str
+		:param depth: The number of levels of objects that may be split into members.
+		:type depth: int
+		:return: An index like the one from jsonstream.saveIndexed(), except that "sections" maps the path of each
+				 section to the name of its member, and "chunks" maps the path of each LazyObject with a chunkSize to
+				 the names of the members its entries were split over. "format" is "container".
+		:rtype: dict
+		"""
+		if compression not in ProjectContainer.COMPRESSIONS:
+			raise ValueError("Unknown compression: {}".format(compression))
+		
+		sections = {}
+		chunks = {}
+		with jsonstream.atomicWrite(path, binary=True) as file:
+			hashingFile = _HashingFile(file)
+			with zipfile.ZipFile(hashingFile, "w", ProjectContainer.COMPRESSIONS[compression]) as zf:
+				ProjectContainer._writeSections(zf, obj, "", depth, sections, chunks)
+				layout = {"Format Version": ProjectContainer.VERSION,
+						  "Compression": compression,
+						  "Sections": list(sections),
+						  "Chunks": chunks}
+				zf.writestr(ProjectContainer.FORMAT_MEMBER, json.dumps(layout, indent=4))
+			hashingFile.flush()
+		return {"format": "container", "sections": sections, "chunks": chunks, "size": hashingFile.size,
+				"sha256": hashingFile.hexdigest()}
+	
+	@staticmethod
+	def _writeSections(zf: zipfile.ZipFile, obj, path: str, depth: int, sections: dict, chunks: dict) -> None:
+		# path is the path of obj's keys, ending with "/" unless obj is the whole project
+		for key, value in obj.items():
+			valuePath = path + jsonstream._keyToStr(key)
+			if isinstance(value, jsonstream.LazyObject) and value.chunkSize:
+				chunks[valuePath] = ProjectContainer._writeChunks(zf, value, valuePath)
+			elif depth > 1 and isinstance(value, dict) and \
+					any(isinstance(v, (dict, jsonstream.LazyObject)) for v in value.values()):
+				ProjectContainer._writeSections(zf, value, valuePath + "/", depth - 1, sections, chunks)
+			else:
+				sections[valuePath] = valuePath + ".json"
+				ProjectContainer._writeMember(zf, sections[valuePath], value)
+	
+	@staticmethod
+	def _writeChunks(zf: zipfile.ZipFile, obj: jsonstream.LazyObject, path: str) -> list:
+		# Writes each run of chunkSize entries to its own member, and gets the names of the members.
+		names = []
+		run = {}
+		for key, value in obj.items():
+			run[key] = value
+			if len(run) == obj.chunkSize:
+				names.append("{}/{}.json".format(path, len(names)))
+				ProjectContainer._writeMember(zf, names[-1], run)
+				run = {}
+		if run:
+			names.append("{}/{}.json".format(path, len(names)))
+			ProjectContainer._writeMember(zf, names[-1], run)
+		return names
+	
+	@staticmethod
+	def _writeMember(zf: zipfile.ZipFile, name: str, value) -> None:
+		if isinstance(value, dict):
+			value = jsonstream.LazyObject(value.items())  # So that its values are written whole, which is faster
+		with zf.open(name, "w", force_zip64=True) as member:
+			with io.TextIOWrapper(member, encoding="utf-8", newline="") as text:
+				jsonstream.dump(value, text)
+	
+	def getFormatVersion(self) -> int:
+		"""
+		Gets the version of the format that the container was written in.
+		
+		:return: The format version
+		:rtype: int
+		"""
+		return self._format["Format Version"]
+	
+	def getCompression(self) -> str:
+		"""
+		Gets the compression that the container was written with.
+		
+		:return: "deflate" or "lzma"
+		:rtype: str
+		"""
+		return self._format["Compression"]
+	
+	def getChunks(self, path: str) -> list:
+		"""
+		Gets the names of the members that the entries of a section were split over.
+		
+		:param path: The path of keys to the section joined with "/", e.g. "Data Structures/Target GUI Model/components".
+		:type path: str
+		:return: The names of the members, or None if the section wasn't split into chunks.
+		:rtype: list
+		"""
+		return self._format["Chunks"].get(path)
+	
+	def readMember(self, name: str):
+		"""
+		Decompresses and parses one member of the container.
+		
+		:param name: The name of the member, e.g. "Data Structures/API Model.json".
+		:type name: str
+		:return: The member's value
+		"""
+		with self._zipFile.open(name) as member:
+			return json.load(io.TextIOWrapper(member, encoding="utf-8"))
+	
+	def readSection(self, path: str):
+		"""
+		Reads one section of the project, decompressing only the members it's stored in.
+		
+		:param path: The path of keys to the section joined with "/", e.g. "Data Structures/Target GUI Model", or ""
+					 for the whole project.
+		:type path: str
+		:return: The section's value
+		"""
+		if path in self._format["Sections"]:
+			return self.readMember(path + ".json")
+		
+		if path in self._format["Chunks"]:
+			value = {}
+			for name in self._format["Chunks"][path]:
+				value.update(self.readMember(name))
+			return value
+		
+		# An object that was split into members; put it back together
+		prefix = path + "/" if path else ""
+		paths = [p for p in list(self._format["Sections"]) + list(self._format["Chunks"]) if p.startswith(prefix)]
+		if not paths:
+			raise KeyError(path)
+		value = {}
+		for sectionPath in paths:
+			keys = sectionPath[len(prefix):].split("/")
+			parent = value
+			for key in keys[:-1]:
+				parent = parent.setdefault(key, {})
+			parent[keys[-1]] = self.readSection(sectionPath)
+		return value
+	
+	def load(self) -> dict:
+		"""
+		Reads the whole project.
+		
+		:return: The project's dictionary
+		:rtype: dict
+		"""
+		return self.readSection("")
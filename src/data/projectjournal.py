@@ -0,0 +1,364 @@
+"""
+..
+    /------------------------------------------------------------------------------\
+    |                 -- FACADE TECHNOLOGIES INC.  CONFIDENTIAL --                 |
+    |------------------------------------------------------------------------------|
+    |                                                                              |
+    |    Copyright [2019] Facade Technologies Inc.                                 |
+    |    All Rights Reserved.                                                      |
+    |                                                                              |
+    | NOTICE:  All information contained herein is, and remains the property of    |
+    | Facade Technologies Inc. and its suppliers if any.  The intellectual and     |
+    | and technical concepts contained herein are proprietary to Facade            |
+    | Technologies Inc. and its suppliers and may be covered by U.S. and Foreign   |
+    | Patents, patents in process, and are protected by trade secret or copyright  |
+    | law.  Dissemination of this information or reproduction of this material is  |
+    | strictly forbidden unless prior written permission is obtained from Facade   |
+    | Technologies Inc.                                                            |
+    |                                                                              |
+    \------------------------------------------------------------------------------/
+This module contains the ChangeTracker and ProjectJournal classes, which let a project be saved by appending only
+the entities that changed since the last save instead of rewriting the whole project file.
+"""
+
+import json
+import os
+import threading
+import uuid
+
+
+class ChangeTracker:
+	"""
+	Records which entities and SuperTokens have changed since the project was last saved.
+	
+	Entities report themselves through Entity.changeTracker and SuperTokens through SuperToken.changeTracker. Only IDs
+	are kept for entities, so a tracker never keeps a deleted entity alive. SuperTokens are kept because the observer
+	thread adds tokens to them directly; they're resolved to their components when the project is saved.
+	"""
+	
+	def __init__(self):
+		"""
+		Constructs a ChangeTracker with no changes.
+		"""
+		self._lock = threading.Lock()  # The observer thread reports changes while the main thread saves
+		self._changed = set()
+		self._removed = set()
+		self._superTokens = set()
+	
+	def __deepcopy__(self, memo):
+		# A copied project starts without changes; it's saved in full because it has no snapshot yet.
+		return ChangeTracker()
+	
+	def entityChanged(self, entity: 'Entity') -> None:
+		"""
+		Records that an entity was created or modified.
+		
+		:param entity: The entity that changed.
+		:type entity: Entity
+		:return: None
+		:rtype: NoneType
+		"""
+		with self._lock:
+			self._changed.add(entity.getId())
+	
+	def entityRemoved(self, entity: 'Entity') -> None:
+		"""
+		Records that an entity was removed from its model.
+		
+		:param entity: The entity that was removed.
+		:type entity: Entity
+		:return: None
+		:rtype: NoneType
+		"""
+		with self._lock:
+			self._changed.discard(entity.getId())
+			self._removed.add(entity.getId())
+	
+	def superTokenChanged(self, superToken: 'SuperToken') -> None:
+		"""
+		Records that a token was added to a SuperToken.
+		
+		:param superToken: The SuperToken that changed.
+		:type superToken: SuperToken
+		:return: None
+		:rtype: NoneType
+		"""
+		with self._lock:
+			self._superTokens.add(superToken)
+	
+	def hasChanges(self) -> bool:
+		"""
+		Tells whether anything changed since the changes were last taken.
+		
+		:return: True if there are changes that haven't been saved.
+		:rtype: bool
+		"""
+		with self._lock:
+			return bool(self._changed or self._removed or self._superTokens)
+	
+	def takeChanges(self) -> tuple:
+		"""
+		Gets the recorded changes and forgets them, as one atomic step.
+		
+		:return: The IDs of changed entities, the IDs of removed entities, and the changed SuperTokens.
+		:rtype: tuple[set, set, set]
+		"""
+		with self._lock:
+			changes = (self._changed, self._removed, self._superTokens)
+			self._changed, self._removed, self._superTokens = set(), set(), set()
+			return changes
+	
+	def restoreChanges(self, changes: tuple) -> None:
+		"""
+		Puts back changes that were taken, for example when writing them failed.
+		
+		:param changes: A tuple returned by takeChanges().
+		:type changes: tuple[set, set, set]
+		:return: None
+		:rtype: NoneType
+		"""
+		changed, removed, superTokens = changes
+		with self._lock:
+			self._changed |= changed - self._removed
+			self._removed |= removed
+			self._superTokens |= superTokens
+	
+	def clear(self) -> None:
+		"""
+		Forgets all recorded changes.
+		
+		:return: None
+		:rtype: NoneType
+		"""
+		self.takeChanges()
+
+
+class ProjectJournal:
+	"""
+	An append-only file of changes made to a project since its last full snapshot.
+	
+	The first line is a header naming the snapshot that the journal applies to. Every other line is one save: a JSON
+	object with the sections and entities that changed. Each line is flushed to disk before a save returns, and a
+	partially written last line (from a crash while saving) is ignored when the journal is read.
+	"""
+	
+	# When either limit is reached, the next save writes a full snapshot and starts a new journal.
+	MAX_RECORDS = 100
+	MAX_SIZE_RATIO = 0.5  # journal size relative to the snapshot size
+	
+	def __init__(self, path: str):
+		"""
+		Constructs a ProjectJournal.
+		
+		:param path: The journal file. It doesn't need to exist.
+		:type path: str
+		"""
+		self._path = path
+		self._snapshotID = None
+		self._numRecords = 0
+		self._scan()
+	
+	@staticmethod
+	def newSnapshotID() -> str:
+		"""
+		Creates an ID to store in a new snapshot, so that a journal is never replayed over a snapshot it wasn't
+		written against.
+		
+		:return: A new, unique snapshot ID.
+		:rtype: str
+		"""
+		return uuid.uuid4().hex
+	
+	def getPath(self) -> str:
+		"""
+		Gets the path of the journal file.
+		
+		:return: The path of the journal file.
+		:rtype: str
+		"""
+		return self._path
+	
+	def getSnapshotID(self) -> str:
+		"""
+		Gets the ID of the snapshot that the journal applies to.
+		
+		:return: The snapshot ID, or None if the journal is empty.
+		:rtype: str
+		"""
+		return self._snapshotID
+	
+	def getNumRecords(self) -> int:
+		"""
+		Gets the number of saves in the journal.
+		
+		:return: The number of records after the header.
+		:rtype: int
+		"""
+		return self._numRecords
+	
+	def getSize(self) -> int:
+		"""
+		Gets the size of the journal file.
+		
+		:return: The size in bytes, or 0 if there is no journal file.
+		:rtype: int
+		"""
+		try:
+			return os.path.getsize(self._path)
+		except OSError:
+			return 0
+	
+	def needsCompaction(self, snapshotSize: int) -> bool:
+		"""
+		Tells whether the journal has grown enough that a full snapshot should be written instead of another record.
+		
+		:param snapshotSize: The size of the snapshot file in bytes.
+		:type snapshotSize: int
+		:return: True if the next save should be a full snapshot.
+		:rtype: bool
+		"""
+		if self._numRecords >= ProjectJournal.MAX_RECORDS:
+			return True
+		return self.getSize() > snapshotSize * ProjectJournal.MAX_SIZE_RATIO
+	
+	def reset(self, snapshotID: str) -> None:
+		"""
+		Starts a new, empty journal for a snapshot. Any previous records are discarded.
+		
+		:param snapshotID: The ID stored in the snapshot that was just written.
+		:type snapshotID: str
+		:return: None
+		:rtype: NoneType
+		"""
+		self.remove()
+		self._write({"snapshot": snapshotID}, "w")
+		self._snapshotID = snapshotID
+	
+	def append(self, record: dict) -> None:
+		"""
+		Appends one save to the journal and flushes it to disk.
+		
+		:param record: The changes to store. See ProjectJournal.apply() for the layout.
+		:type record: dict
+		:return: None
+		:rtype: NoneType
+		"""
+		if self._snapshotID is None:
+			raise RuntimeError("The journal must be reset for a snapshot before records can be appended.")
+		self._write(record, "a")
+		self._numRecords += 1
+	
+	def records(self, snapshotID: str):
+		"""
+		Iterates over the records that apply to a snapshot.
+		
+		:param snapshotID: The ID stored in the snapshot that was loaded.
+		:type snapshotID: str
+		:return: A generator of record dictionaries, oldest first. Nothing is generated if the journal belongs to
+				 another snapshot.
+		:rtype: generator
+		"""
+		if snapshotID is None or snapshotID != self._snapshotID:
+			return
+		for record in self._readRecords():
+			yield record
+	
+	def remove(self) -> None:
+		"""
+		Deletes the journal file, if there is one.
+		
+		:return: None
+		:rtype: NoneType
+		"""
+		try:
+			os.remove(self._path)
+		except FileNotFoundError:
+			pass
+		self._snapshotID = None
+		self._numRecords = 0
+	
+	@staticmethod
+	def apply(projectDict: dict, record: dict) -> None:
+		"""
+		Applies one record to a project dictionary in place.
+		
+		Records may have these keys, all optional:
+		
+		- "sections": top-level project sections (e.g. "Settings") that replace the ones in the project.
+		- "root": the dictionary of the target GUI model's root.
+		- "components" and "behaviors": changed entity dictionaries by ID.
+		- "removed behaviors": IDs of visibility behaviors that were removed.
+		- "removed components": IDs of components that were removed, e.g. by merging duplicates.
+		- "API Model": the whole API model dictionary.
+		- "Entity Count" and "SuperToken Count": the counters of the target GUI model.
+		
+		:param projectDict: The project dictionary, as loaded from a snapshot.
+		:type projectDict: dict
+		:param record: The record to apply.
+		:type record: dict
+		:return: None
+		:rtype: NoneType
+		"""
+		projectDict.update(record.get("sections", {}))
+		structures = projectDict["Data Structures"]
+		tguim = structures["Target GUI Model"]
+		
+		if "root" in record:
+			tguim["root"] = record["root"]
+		tguim["components"].update(record.get("components", {}))
+		tguim["behaviors"].update(record.get("behaviors", {}))
+		for id in record.get("removed behaviors", []):
+			tguim["behaviors"].pop(str(id), None)
+		for id in record.get("removed components", []):
+			tguim["components"].pop(str(id), None)
+		for key in ("Entity Count", "SuperToken Count"):
+			if key in record:
+				tguim[key] = record[key]
+		
+		if "API Model" in record:
+			structures["API Model"] = record["API Model"]
+	
+	def _write(self, obj: dict, mode: str) -> None:
+		with open(self._path, mode) as f:
+			f.write(json.dumps(obj))
+			f.write("\n")
+			f.flush()
+			os.fsync(f.fileno())
+	
+	def _readLines(self):
+		try:
+			f = open(self._path, "rb")
+		except FileNotFoundError:
+			return
+		with f:
+			end = 0
+			for line in f:
+				if not line.endswith(b"\n"):
+					return  # a record that was being written when the application stopped
+				try:
+					obj = json.loads(line.decode("utf-8"))
+				except ValueError:
+					return
+				end += len(line)
+				yield end, obj
+	
+	def _readRecords(self):
+		lines = self._readLines()
+		next(lines, None)  # header
+		for _, record in lines:
+			yield record
+	
+	def _scan(self) -> None:
+		lines = self._readLines()
+		first = next(lines, None)
+		if first is None or not isinstance(first[1], dict) or "snapshot" not in first[1]:
+			return
+		end, header = first
+		self._snapshotID = header["snapshot"]
+		for end, _ in lines:
+			self._numRecords += 1
+		
+		# Drop a partially written record so the next one starts on its own line.
+		if self.getSize() > end:
+			with open(self._path, "r+b") as f:
+				f.truncate(end)
@@ -0,0 +1,259 @@
+"""
+..
+    /------------------------------------------------------------------------------\
+    |                 -- FACADE TECHNOLOGIES INC.  CONFIDENTIAL --                 |
+    |------------------------------------------------------------------------------|
+    |                                                                              |
+    |    Copyright [2019] Facade Technologies Inc.                                 |
+    |    All Rights Reserved.                                                      |
+    |                                                                              |
+    | NOTICE:  All information contained herein is, and remains the property of    |
+    | Facade Technologies Inc. and its suppliers if any.  The intellectual and     |
+    | and technical concepts contained herein are proprietary to Facade            |
+    | Technologies Inc. and its suppliers and may be covered by U.S. and Foreign   |
+    | Patents, patents in process, and are protected by trade secret or copyright  |
+    | law.  Dissemination of this information or reproduction of this material is  |
+    | strictly forbidden unless prior written permission is obtained from Facade   |
+    | Technologies Inc.                                                            |
+    |                                                                              |
+    \------------------------------------------------------------------------------/
+This module contains the ProjectManifest class. A manifest is a small file next to a project's .fcl file that describes
+the project, so that its information can be shown and its sections can be found without parsing the whole .fcl file.
+"""
+
+import hashlib
+import json
+import os
+
+import data.jsonstream as jsonstream
+from data.projectcontainer import ProjectContainer
+
+
+class ProjectManifest:
+	"""
+	The contents of a project's manifest (.fclm).
+	
+	A manifest holds the project information, application information and settings sections, the number of entities
+	in the project, where each section of the .fcl snapshot is (its [offset, length] in bytes if the snapshot is plain
+	JSON, or the name of its member if the snapshot is a compressed ProjectContainer), and the snapshot's size,
+	modification time and SHA-256 checksum.
+	
+	A manifest is only used while the size and modification time of the .fcl file match the ones it recorded, so a
+	.fcl file that was replaced by another program is never read through a stale manifest.
+	"""
+	
+	VERSION = 1
+	
+	def __init__(self, contents: dict):
+		"""
+		Constructs a ProjectManifest.
+		
+		:param contents: The manifest's dictionary, as written by ProjectManifest.write().
+		:type contents: dict
+		"""
+		self._contents = contents
+	
+	@staticmethod
+	def getPath(projectFile: str) -> str:
+		"""
+		Gets the path of the manifest of a project file.
+		
+		:param projectFile: The project's .fcl file.
+		:type projectFile: str
+		:return: The path of the project's .fclm file.
+		:rtype: str
+		"""
+		return os.path.splitext(projectFile)[0] + ".fclm"
+	
+	@staticmethod
+	def create(projectFile: str, sections: dict, counts: dict, index: dict = None,
+			   previous: 'ProjectManifest' = None) -> 'ProjectManifest':
+		"""
+		Creates the manifest of a project that was just saved.
+		
+		:param projectFile: The project's .fcl file.
+		:type projectFile: str
+		:param sections: The project information, application information and settings sections.
+		:type sections: dict
+		:param counts: The number of entities in the project, by kind.
+		:type counts: dict
+		:param index: The index returned by jsonstream.saveIndexed() or ProjectContainer.save() if the snapshot was
+					  written, or None if only the journal was written.
+		:type index: dict
+		:param previous: The manifest of the snapshot, used when only the journal was written.
+		:type previous: ProjectManifest
+		:return: The new manifest
+		:rtype: ProjectManifest
+		"""
+		contents = {"Format Version": ProjectManifest.VERSION}
+		contents.update(sections)
+		contents["Counts"] = counts
+		if index is not None:
+			stat = os.stat(projectFile)
+			contents["Sections"] = index["sections"]
+			contents["Chunks"] = index.get("chunks", {})
+			contents["File"] = {"Size": index["size"], "Modified": stat.st_mtime_ns, "SHA-256": index["sha256"],
+								"Format": index.get("format", "json")}
+		elif previous is not None:
+			contents["Sections"] = previous._contents["Sections"]
+			contents["Chunks"] = previous._contents.get("Chunks", {})
+			contents["File"] = previous._contents["File"]
+		return ProjectManifest(contents)
+	
+	@staticmethod
+	def read(projectFile: str) -> 'ProjectManifest':
+		"""
+		Reads the manifest of a project file.
+		
+		:param projectFile: The project's .fcl file.
+		:type projectFile: str
+		:return: The manifest, or None if there isn't one, it can't be read, or it doesn't match the .fcl file.
+		:rtype: ProjectManifest
+		"""
+		try:
+			with open(ProjectManifest.getPath(projectFile)) as f:
+				contents = json.loads(f.read())
+			stat = os.stat(projectFile)
+		except (OSError, ValueError):
+			return None
+		
+		if not isinstance(contents, dict) or contents.get("Format Version") != ProjectManifest.VERSION:
+			return None
+		file = contents.get("File")
+		if not file or file["Size"] != stat.st_size or file["Modified"] != stat.st_mtime_ns:
+			return None
+		return ProjectManifest(contents)
+	
+	def write(self, projectFile: str) -> None:
+		"""
+		Writes the manifest next to a project file. The old manifest is replaced atomically.
+		
+		:param projectFile: The project's .fcl file.
+		:type projectFile: str
+		:return: None
+		:rtype: NoneType
+		"""
+		with jsonstream.atomicWrite(ProjectManifest.getPath(projectFile)) as f:
+			f.write(json.dumps(self._contents, indent=4))
+	
+	def getSection(self, name: str) -> dict:
+		"""
+		Gets one of the sections stored in the manifest.
+		
+		:param name: "Project Information", "Application Information" or "Settings".
+		:type name: str
+		:return: The section
+		:rtype: dict
+		"""
+		return self._contents[name]
+	
+	def getCount(self, kind: str) -> int:
+		"""
+		Gets the number of entities of a kind.
+		
+		:param kind: "Model Entities", "Components", "Visibility Behaviors" or "Action Pipelines".
+		:type kind: str
+		:return: The number of entities, or None if it isn't known.
+		:rtype: int
+		"""
+		return self._contents["Counts"].get(kind)
+	
+	def isContainer(self) -> bool:
+		"""
+		Determines whether the .fcl snapshot is a compressed ProjectContainer rather than plain JSON.
+		
+		:return: True if the snapshot is a container.
+		:rtype: bool
+		"""
+		return self._contents["File"].get("Format", "json") == "container"
+	
+	def getCounts(self) -> dict:
+		"""
+		Gets the number of entities of every kind that the manifest records.
+		
+		:return: The numbers of entities, by kind.
+		:rtype: dict
+		"""
+		return dict(self._contents["Counts"])
+	
+	def getChecksum(self) -> str:
+		"""
+		Gets the SHA-256 checksum of the .fcl snapshot.
+		
+		:return: The hex digest
+		:rtype: str
+		"""
+		return self._contents["File"]["SHA-256"]
+	
+	def hasSection(self, path: str) -> bool:
+		"""
+		Determines whether the byte range of a section of the .fcl snapshot is known.
+		
+		:param path: The path of keys to the section joined with "/", e.g. "Data Structures/API Model".
+		:type path: str
+		:return: True if the section can be read with readSection().
+		:rtype: bool
+		"""
+		return path in self._contents["Sections"]
+	
+	def getChunks(self, path: str) -> list:
+		"""
+		Gets the runs of entries of a section that was written in chunks, so that they can be parsed in parallel with
+		readChunk().
+		
+		:param path: The path of keys to the section joined with "/", e.g. "Data Structures/Target GUI Model/components".
+		:type path: str
+		:return: A list of [offset, length] pairs (or the names of container members), or None if the section wasn't
+				 written in chunks.
+		:rtype: list
+		"""
+		return self._contents.get("Chunks", {}).get(path)
+	
+	@staticmethod
+	def readChunk(projectFile: str, chunk) -> dict:
+		"""
+		Reads one of the runs of entries returned by getChunks().
+		
+		:param projectFile: The project's .fcl file.
+		:type projectFile: str
+		:param chunk: The [offset, length] of the run in a JSON snapshot, or the name of its member in a container.
+		:type chunk: list or str
+		:return: The entries, as a dictionary
+		:rtype: dict
+		"""
+		if isinstance(chunk, str):
+			with ProjectContainer(projectFile) as container:
+				return container.readMember(chunk)
+		offset, length = chunk
+		return jsonstream.loadChunk(projectFile, offset, length)
+	
+	def readSection(self, projectFile: str, path: str):
+		"""
+		Reads one section of the .fcl snapshot by seeking straight to it, or by decompressing only its member.
+		
+		:param projectFile: The project's .fcl file.
+		:type projectFile: str
+		:param path: The path of keys to the section joined with "/", e.g. "Data Structures/Target GUI Model".
+		:type path: str
+		:return: The section's value, as it is in the snapshot (changes in the journal aren't applied).
+		"""
+		if self.isContainer():
+			with ProjectContainer(projectFile) as container:
+				return container.readSection(path)
+		offset, length = self._contents["Sections"][path]
+		return jsonstream.loadSection(projectFile, offset, length)
+	
+	def verify(self, projectFile: str) -> bool:
+		"""
+		Determines whether the contents of the .fcl snapshot match the checksum. This reads the whole file.
+		
+		:param projectFile: The project's .fcl file.
+		:type projectFile: str
+		:return: True if the checksum matches.
+		:rtype: bool
+		"""
+		digest = hashlib.sha256()
+		with open(projectFile, "rb") as f:
+			for block in iter(lambda: f.read(1 << 20), b""):
+				digest.update(block)
+		return digest.hexdigest() == self.getChecksum()
@@ -0,0 +1,249 @@
+"""
+..
+    /------------------------------------------------------------------------------\
+    |                 -- FACADE TECHNOLOGIES INC.  CONFIDENTIAL --                 |
+    |------------------------------------------------------------------------------|
+    |                                                                              |
+    |    Copyright [2019] Facade Technologies Inc.                                 |
+    |    All Rights Reserved.                                                      |
+    |                                                                              |
+    | NOTICE:  All information contained herein is, and remains the property of    |
+    | Facade Technologies Inc. and its suppliers if any.  The intellectual and     |
+    | and technical concepts contained herein are proprietary to Facade            |
+    | Technologies Inc. and its suppliers and may be covered by U.S. and Foreign   |
+    | Patents, patents in process, and are protected by trade secret or copyright  |
+    | law.  Dissemination of this information or reproduction of this material is  |
+    | strictly forbidden unless prior written permission is obtained from Facade   |
+    | Technologies Inc.                                                            |
+    |                                                                              |
+    \------------------------------------------------------------------------------/
+This module contains the ProjectSaver class, which saves projects on a worker thread so that the UI doesn't freeze,
+and the SaveSnapshot class, which holds what a save writes.
+"""
+
+from PySide2.QtCore import QObject, QThread, QTimer, Signal, Slot
+
+from libs.logging import main_logger as logger
+
+
+class SaveSnapshot:
+	"""
+	Everything that one save writes, captured by Project.createSaveSnapshot() and written by
+	Project.writeSaveSnapshot(). Nothing in a snapshot is modified after it is created, so it can be written on another
+	thread while the project keeps changing.
+	"""
+	
+	def __init__(self, projectFile: str, journal: 'ProjectJournal', indent: int = None):
+		"""
+		Constructs an empty SaveSnapshot.
+		
+		:param projectFile: The project's .fcl file.
+		:type projectFile: str
+		:param journal: The project's journal.
+		:type journal: ProjectJournal
+		:param indent: The number of spaces to indent a .fcl file by, or None for a compact file.
+		:type indent: int
+		"""
+		self.projectFile = projectFile
+		self.journal = journal
+		self.indent = indent
+		self.compression = None  # How a .fcl snapshot is compressed, or None for plain JSON
+		self.record = None  # The journal record, if only the changes are written
+		self.projectDict = None  # The whole project, if a full snapshot is written
+		self.snapshotID = None  # The ID of the full snapshot, if one is written to a .fcl file
+		self.previousSnapshotID = None
+		self.changes = (set(), set(), set())  # The changes taken from the project's ChangeTracker
+		self.counts = {}  # The number of entities of each kind, for the manifest
+	
+	def isFull(self) -> bool:
+		"""
+		Determines whether the whole project is written, rather than only the changes.
+		
+		:return: True if the whole project is written.
+		:rtype: bool
+		"""
+		return self.record is None
+
+
+class _SaveWorker(QThread):
+	"""
+	Writes one SaveSnapshot each time it's started.
+	"""
+	
+	progress = Signal(int, int)
+	failed = Signal(str)
+	
+	def __init__(self, project: 'Project'):
+		QThread.__init__(self)
+		self._project = project
+		self._snapshot = None
+	
+	def setSnapshot(self, snapshot: SaveSnapshot) -> None:
+		self._snapshot = snapshot
+	
+	def run(self) -> None:
+		try:
+			self._project.writeSaveSnapshot(self._snapshot, lambda done, total: self.progress.emit(done, total))
+		except Exception as e:
+			logger.exception(e)
+			self.failed.emit(str(e))
+		finally:
+			self._snapshot = None
+
+
+class ProjectSaver(QObject):
+	"""
+	Saves a project without blocking the main thread.
+	
+	When a save is requested, the project is captured on the main thread with Project.createSaveSnapshot(), which is
+	cheap because unchanged entities aren't converted again. The snapshot is then written by a worker thread. Only one
+	save runs at a time; saves requested while one is running are combined into a single save that starts when it
+	finishes.
+	
+	The observer may keep adding tokens to SuperTokens while a save is running. That only records the SuperToken in the
+	project's ChangeTracker, and the worker never reads the models, so those tokens are written by the next save.
+	
+	The saver can also save the project periodically (autosave) when it has unsaved changes.
+	"""
+	
+	saveStarted = Signal(bool)  # True if the whole project is being written
+	saveProgress = Signal(int, int)  # components written, total components
+	saveFinished = Signal()
+	saveFailed = Signal(str)  # error message
+	
+	def __init__(self, project: 'Project', autosaveInterval: int = 0):
+		"""
+		Constructs a ProjectSaver.
+		
+		:param project: The project to save.
+		:type project: Project
+		:param autosaveInterval: The number of seconds between autosaves, or 0 to disable autosave.
+		:type autosaveInterval: int
+		"""
+		QObject.__init__(self)
+		self._project = project
+		self._pending = False
+		self._pendingFull = False
+		self._failed = False
+		
+		self._worker = _SaveWorker(project)
+		self._worker.progress.connect(self.saveProgress)
+		self._worker.failed.connect(self._onFailed)
+		self._worker.finished.connect(self._onWorkerFinished)
+		
+		self._autosaveTimer = QTimer(self)
+		self._autosaveTimer.timeout.connect(self._onAutosave)
+		self._autosaveInterval = 0
+		self.setAutosaveInterval(autosaveInterval)
+	
+	def getProject(self) -> 'Project':
+		"""
+		Gets the project that is saved.
+		
+		:return: The project that is saved.
+		:rtype: Project
+		"""
+		return self._project
+	
+	def setAutosaveInterval(self, seconds: int) -> None:
+		"""
+		Sets how often the project is saved automatically. The project is only saved if it has unsaved changes.
+		
+		:param seconds: The number of seconds between autosaves, or 0 to disable autosave.
+		:type seconds: int
+		:return: None
+		:rtype: NoneType
+		"""
+		self._autosaveInterval = max(0, seconds)
+		self._autosaveTimer.stop()
+		if self._autosaveInterval > 0:
+			self._autosaveTimer.start(self._autosaveInterval * 1000)
+	
+	def getAutosaveInterval(self) -> int:
+		"""
+		Gets how often the project is saved automatically.
+		
+		:return: The number of seconds between autosaves, or 0 if autosave is disabled.
+		:rtype: int
+		"""
+		return self._autosaveInterval
+	
+	def isSaving(self) -> bool:
+		"""
+		Determines whether a save is being written.
+		
+		:return: True if the worker thread is writing a save.
+		:rtype: bool
+		"""
+		return self._worker.isRunning()
+	
+	@Slot()
+	def save(self, full: bool = False) -> None:
+		"""
+		Saves the project in the background. If a save is already running, another one is started when it finishes.
+		
+		This must be called on the main thread.
+		
+		:param full: If True, write the whole project even if the changes could be appended to the journal.
+		:type full: bool
+		:return: None
+		:rtype: NoneType
+		"""
+		if self._worker.isRunning():
+			self._pending = True
+			self._pendingFull = self._pendingFull or full
+			return
+		
+		snapshot = self._project.createSaveSnapshot(full=full)
+		self._failed = False
+		self._worker.setSnapshot(snapshot)
+		self.saveStarted.emit(snapshot.isFull())
+		self._worker.start()
+	
+	def wait(self) -> None:
+		"""
+		Blocks until the running save and any save requested during it are written. Used before Facile exits.
+		
+		:return: None
+		:rtype: NoneType
+		"""
+		while True:
+			self._worker.wait()
+			if not self._pending:
+				return
+			self._startPending()
+	
+	def stop(self) -> None:
+		"""
+		Stops autosaving and waits for the running save to finish.
+		
+		:return: None
+		:rtype: NoneType
+		"""
+		self._autosaveTimer.stop()
+		self.wait()
+	
+	def _startPending(self) -> None:
+		full = self._pendingFull
+		self._pending = False
+		self._pendingFull = False
+		self.save(full)
+	
+	@Slot(str)
+	def _onFailed(self, message: str) -> None:
+		self._failed = True
+		self.saveFailed.emit(message)
+	
+	@Slot()
+	def _onWorkerFinished(self) -> None:
+		if not self._failed:
+			self.saveFinished.emit()
+		if self._pending and not self._worker.isRunning():
+			self._startPending()
+	
+	@Slot()
+	def _onAutosave(self) -> None:
+		if self._worker.isRunning() or self._pending or not self._project.hasUnsavedChanges():
+			return
+		logger.info("Autosaving the project.")
+		self.save()
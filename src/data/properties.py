@@ -56,6 +56,7 @@ class Properties:
         :rtype: Properties
         """
         self._categories = OrderedDict()
+        self._owner = None
 
     def newCategory(self, category: str) -> None:
         """
@@ -88,10 +89,13 @@ class Properties:
         """
         if category not in self._categories.keys():
             raise Exception("{} does not exist".format(category))
-        self._categories[category].append(Property(name, value, type, readOnly))
+        newProperty = Property(name, value, type, readOnly)
+        newProperty.setOwner(self._owner)
+        self._categories[category].append(newProperty)
 
     @staticmethod
-    def createPropertiesObject(predefinedCategories: list, customCategories: dict) -> 'Properties':
+    def createPropertiesObject(predefinedCategories: list, customCategories: dict,
+                               values: dict = None) -> 'Properties':
         """
         Property Factory, that is a static method, that createes properties objects for predefined and custom categories.
 
@@ -99,6 +103,9 @@ class Properties:
         :type predefinedCategories: list
         :param customCategories: Categories that can be made from a list.
         :type customCategories: dict
+        :param values: Optional initial values by property name, which replace the defaults. Setting them here takes
+                       one pass over the properties, instead of one getProperty() search per value.
+        :type values: dict
         :return: Properties objects.
         :rtype: Properties
         """
@@ -145,10 +152,59 @@ class Properties:
                 readOnly = property["readOnly"]
                 newProperties.addProperty(category, name, default, type, readOnly)
 
+        if values:
+            for props in newProperties._categories.values():
+                for prop in props:
+                    if prop.getName() in values:
+                        prop.setValue(values[prop.getName()])
+
         return newProperties
 
+    @staticmethod
+    def createPropertiesObjects(predefinedCategories: list, customCategories: dict, valuesList: list) -> list:
+        """
+        Creates many properties objects with the same categories at once, e.g. for components that are created in
+        bulk. The categories are worked out once, and each properties object is then built in one pass.
+
+        :param predefinedCategories: Category that was already defined from a list.
+        :type predefinedCategories: list
+        :param customCategories: Categories that can be made from a list.
+        :type customCategories: dict
+        :param valuesList: The initial values by property name of each properties object to create, which replace
+                           the defaults.
+        :type valuesList: list[dict]
+        :return: The properties objects, in the same order as valuesList.
+        :rtype: list[Properties]
+        """
+        template = Properties.createPropertiesObject(predefinedCategories, customCategories)
+        spec = [(category, [(prop.getName(), prop.getValue(), prop.getType(), prop.isReadOnly()) for prop in props])
+                for category, props in template._categories.items()]
+
+        propertiesObjects = []
+        for values in valuesList:
+            newProperties = Properties()
+            for category, props in spec:
+                newProperties._categories[category] = [Property(name, values.get(name, default), type, readOnly)
+                                                       for name, default, type, readOnly in props]
+            propertiesObjects.append(newProperties)
+        return propertiesObjects
+
     # TODO: move this functionality to the qt_models.propeditormodel module
     #  Having this method here requires us to import qt_models, which seems unnecessary.
+    def setOwner(self, owner: 'Entity') -> None:
+        """
+        Sets the entity that these properties belong to, so that setting any of them marks the entity as changed.
+
+        :param owner: The entity that has these properties.
+        :type owner: Entity
+        :return: None
+        :rtype: NoneType
+        """
+        self._owner = owner
+        for props in self._categories.values():
+            for prop in props:
+                prop.setOwner(owner)
+
     def getModel(self) -> 'PropModel':
         """
         Gets a new PropModel object for this properties object.
@@ -48,6 +48,7 @@ class Property:
         self._value = value
         self._type = type
         self._readOnly = readOnly
+        self._owner = None  # The entity whose Properties object contains this property
 
     def isReadOnly(self) -> bool:
         """
@@ -95,8 +96,21 @@ class Property:
         :rtype: bool
         """
         self._value = newValue
+        if self._owner is not None:
+            self._owner.markDirty()
         return True
 
+    def setOwner(self, owner: 'Entity') -> None:
+        """
+        Sets the entity that this property belongs to. The entity is marked as changed whenever the value is set.
+
+        :param owner: The entity that has this property.
+        :type owner: Entity
+        :return: None
+        :rtype: NoneType
+        """
+        self._owner = owner
+
     def __str__(self):
         return "{}:{}".format(self._name, self._value)
 
@@ -39,6 +39,7 @@ from data.configvars import ConfigVars
 from data.apim.actionpipeline import ActionPipeline
 from gui.apicompilerdialog import ApiCompilerDialog
 from graphics.tguim.tguimscene import TGUIMScene
+from libs.logging import explorer_logger as logger
 
 
 class StateMachine:
@@ -262,12 +263,10 @@ class StateMachine:
 					self.view.ui.actionManualExplore.setChecked(False)
 					self.view.ui.actionAutoExplore.setChecked(False)
 		
-		# If we've been requested to stop exploration and we're in the exploration state, update the tguim by
-		# resolving component collisions, then go to the MODEL_MANIPULATION state.
+		# If we've been requested to stop exploration and we're in the exploration state, go to the
+		# MODEL_MANIPULATION state, which pauses the observer and updates the tguim by resolving component collisions.
 		elif event == StateMachine.Event.STOP_EXPLORATION:
 			if self.curState == StateMachine.State.EXPLORATION:
-				# tguim = self._project.getTargetGUIModel() # TODO: Uncomment and work on
-				# tguim.resolveComponentCollisions()
 				nextState = StateMachine.State.MODEL_MANIPULATION
 		
 		# Advance to the next state
@@ -351,8 +350,12 @@ class StateMachine:
 			if len(recentProjects) == 0:
 				ui.menuRecent_Projects_2.addAction("No recent projects.")
 			else:
-				for proj in recentProjects[:10]:
-					action = ui.menuRecent_Projects_2.addAction(proj)
+				for projFile in recentProjects[:10]:
+					action = ui.menuRecent_Projects_2.addAction(projFile)
+					info = proj.Project.getProjectInfo(projFile)  # Read from the manifest, not the whole file
+					if info:
+						action.setStatusTip("{} - {} ({} entities)".format(info.get("Name"), info.get("Description"),
+																		   info.get("Model Entities")))
 					action.triggered.connect(v.onOpenRecentProject)
 					icon = QIcon()
 					icon.addPixmap(QPixmap(":/icon/resources/icons/office/open-door.png"), QIcon.Normal, QIcon.Off)
@@ -485,14 +488,24 @@ class StateMachine:
 			ui.projectExplorerView.expand(index)
 			ui.targetGUIModelView.scene().update()
 		
-		if event == StateMachine.Event.PROJECT_OPENED:
-			# v.setWindowTitle("Facile - " + self._project.getMainProjectFile())
-			p.save()
-			p.addToRecents()
+		def showTargetGUIModel() -> None:
+			"""
+			Creates the graphics of the target GUI model and shows them.
+			
+			:return: None
+			:rtype: NoneType
+			"""
 			scene = TGUIMScene(p.getTargetGUIModel())
 			ui.targetGUIModelView.setScene(scene)
 			scene.itemSelected.connect(v.onItemSelected)
 			scene.itemBlink.connect(v.onItemBlink)
+		
+		if event == StateMachine.Event.PROJECT_OPENED:
+			# v.setWindowTitle("Facile - " + self._project.getMainProjectFile())
+			p.trackChanges()
+			p.save()
+			p.addToRecents()
+			showTargetGUIModel()
 			p.getTargetGUIModel().dataChanged.connect(lambda: ui.projectExplorerView.update())
 			projectExplorerModel = v._project.getProjectExplorerModel(ui.projectExplorerView)
 			ui.projectExplorerView.setModel(projectExplorerModel)
@@ -508,8 +521,25 @@ class StateMachine:
 		if previousState == StateMachine.State.EXPLORATION:
 			o = self._project.getObserver()
 			e = self._project.getExplorer()
-			if o: o.pause()
+			if o:
+				# The observer adds components from its own thread, so it must stop before they're merged.
+				o.pause()
+				o.wait()
 			if e: e.pause()
+			
+			# Merge the duplicate components that were created while exploring.
+			componentActions = p.getAPIModel().getActionsByType()[1]
+			report = p.getTargetGUIModel().resolveComponentCollisions(componentActions)
+			logger.info(str(report))
+			if report:
+				# The observer still maps the merged components' super tokens. Reload it so that the next exploration
+				# matches tokens to the components that were kept.
+				if o:
+					o.loadSuperTokens(p.getTargetGUIModel())
+				showTargetGUIModel()
+				explorerModel = ui.projectExplorerView.model()
+				explorerModel.beginResetModel()
+				explorerModel.endResetModel()
 		
 		if self._project.getProcess():
 			ui.actionAutoExplore.setEnabled(True)
@@ -0,0 +1,417 @@
+"""
+..
+    /------------------------------------------------------------------------------\
+    |                 -- FACADE TECHNOLOGIES INC.  CONFIDENTIAL --                 |
+    |------------------------------------------------------------------------------|
+    |                                                                              |
+    |    Copyright [2019] Facade Technologies Inc.                                 |
+    |    All Rights Reserved.                                                      |
+    |                                                                              |
+    | NOTICE:  All information contained herein is, and remains the property of    |
+    | Facade Technologies Inc. and its suppliers if any.  The intellectual and     |
+    | and technical concepts contained herein are proprietary to Facade            |
+    | Technologies Inc. and its suppliers and may be covered by U.S. and Foreign   |
+    | Patents, patents in process, and are protected by trade secret or copyright  |
+    | law.  Dissemination of this information or reproduction of this material is  |
+    | strictly forbidden unless prior written permission is obtained from Facade   |
+    | Technologies Inc.                                                            |
+    |                                                                              |
+    \------------------------------------------------------------------------------/
+
+This module contains the CollisionResolver class, which finds components in the target GUI model that represent the
+same component of the target GUI and merges them, and the MergeReport class, which describes what was merged.
+"""
+
+import heapq
+
+if 'CONTEXT' not in locals():
+    try:  # Facile
+        from libs.env import CONTEXT
+        from libs.env import InvalidContextException
+    except ImportError:  # Sphinx
+        from .libs.env import CONTEXT
+        from .libs.env import InvalidContextException
+
+if CONTEXT in ("Facile", "Sphinx"):
+    from tguiil.tokens import Token, getTitleWords
+else:
+    raise InvalidContextException(CONTEXT)
+
+
+class MergeReport:
+    """
+    Describes the components that were merged by one run of the CollisionResolver.
+    """
+
+    def __init__(self):
+        """
+        Constructs an empty MergeReport.
+        """
+
+        # (ID of the component that was kept, ID of the component merged into it, match decision, match score)
+        self.merges = []
+        self.numComponentsChecked = 0  # components that were compared with their siblings
+        self.numComparisons = 0  # pairs of components scored with the token matcher
+        self.numBehaviorsRewired = 0
+        self.numActionsRetargeted = 0
+
+    def getMergedIDs(self) -> dict:
+        """
+        Gets the IDs of the merged components mapped to the IDs of the components they are now part of.
+
+        :return: A dictionary mapping each merged component's ID to the ID of the component it was merged into.
+        :rtype: dict
+        """
+
+        merged = {mergedID: keptID for keptID, mergedID, decision, score in self.merges}
+        for mergedID in merged:
+            keptID = merged[mergedID]
+            while keptID in merged:  # A kept component may have been merged into an older one later in the run
+                keptID = merged[keptID]
+            merged[mergedID] = keptID
+        return merged
+
+    def __len__(self) -> int:
+        return len(self.merges)
+
+    def __str__(self) -> str:
+        lines = ["Merged {} components after checking {} ({} comparisons). Rewired {} visibility behaviors and "
+                 "retargeted {} actions.".format(len(self.merges), self.numComponentsChecked, self.numComparisons,
+                                                 self.numBehaviorsRewired, self.numActionsRetargeted)]
+        for keptID, mergedID, decision, score in self.merges:
+            lines.append("\t{} -> {} ({}, {:.2f})".format(mergedID, keptID, decision.name, score))
+        return "\n".join(lines)
+
+
+class CollisionResolver:
+    """
+    The CollisionResolver finds duplicate components in a target GUI model and merges them. Duplicates are created
+    when the observer doesn't match a new token to the super token it belongs to, which happens more the longer the
+    target GUI is explored.
+
+    Only siblings can be duplicates of each other (top-level windows are the root's children). Siblings are grouped by
+    a blocking key made of the fields that the token matcher requires to be equal. Within a group, the components that
+    were kept are indexed by title and by the words in their titles, and a component is only scored against the ones
+    with the same title or a title sharing a word with it. Only when there are none is it scored against every kept
+    component in the group. The scoring is the same as the observer's: an exact match is taken right away, otherwise
+    the closest match is taken.
+
+    The resolver remembers which components have been checked, so each run only compares the components that were
+    created (or moved to a new parent by a merge) since the last run.
+    """
+
+    def __init__(self, tguim: 'TargetGuiModel'):
+        """
+        Constructs a CollisionResolver for a target GUI model.
+
+        :param tguim: The target GUI model to find duplicates in.
+        :type tguim: TargetGuiModel
+        """
+        self._tguim = tguim
+        self._checked = set()  # IDs of the components that have been compared with their siblings
+
+    @staticmethod
+    def getBlockingKey(component: 'Component') -> tuple:
+        """
+        Gets the fields of a component that must be equal for it to match another one. The token matcher never
+        matches tokens with different types, automation IDs, parent types or top-level parent types, and all tokens
+        of a super token share them.
+
+        :param component: The component to get the key of.
+        :type component: Component
+        :return: The blocking key of the component.
+        :rtype: tuple
+        """
+        token = component.getSuperToken().tokens[0]
+        return token.type, token.autoid, token.parentType, token.topLevelParentType
+
+    def resolve(self, actions: list = ()) -> 'MergeReport':
+        """
+        Merges the duplicate components among the components that haven't been checked yet and their siblings.
+
+        :param actions: The component actions that may target the merged components, e.g. the ones in the API
+                        model. The trigger actions of the visibility behaviors are always included.
+        :type actions: list[ComponentAction]
+        :return: A report of what was merged.
+        :rtype: MergeReport
+        """
+        report = MergeReport()
+
+        # Parents are visited from the top down, because merging two components moves the children of one of them
+        # under the other, where they have to be checked against their new siblings.
+        work = []
+        queued = set()
+        for id, component in self._tguim.getComponents().items():
+            parent = component.getParent()
+            if id not in self._checked and parent.getId() not in queued:
+                queued.add(parent.getId())
+                heapq.heappush(work, (parent.depth, parent.getId(), parent))
+
+        while work:
+            depth, parentID, parent = heapq.heappop(work)
+            queued.discard(parentID)
+            kept = self._resolveChildren(parent, report)
+            for component in kept:
+                if any(child.getId() not in self._checked for child in component.getChildren()) and \
+                        component.getId() not in queued:
+                    queued.add(component.getId())
+                    heapq.heappush(work, (component.depth, component.getId(), component))
+
+        mergedIDs = report.getMergedIDs()
+        if mergedIDs:
+            self._retargetActions(actions, mergedIDs, report)
+        return report
+
+    def _resolveChildren(self, parent: 'Component', report: 'MergeReport') -> list:
+        """
+        Merges the duplicates among a component's children.
+
+        :param parent: The component whose children are checked.
+        :type parent: Component
+        :param report: The report to add the merges to.
+        :type report: MergeReport
+        :return: The children that gained children from a merge.
+        :rtype: list[Component]
+        """
+
+        # maps blocking key to ({title: [kept components]}, {title word: {ID: kept component}}). Checked children are
+        # kept until shown otherwise.
+        groups = {}
+        unchecked = []
+        for child in parent.getChildren():
+            if child.getId() in self._checked:
+                CollisionResolver._addKept(groups.setdefault(CollisionResolver.getBlockingKey(child), ({}, {})), child)
+            else:
+                unchecked.append(child)
+
+        merged = {}
+        grown = {}
+        for component in unchecked:
+            report.numComponentsChecked += 1
+            self._checked.add(component.getId())
+            group = groups.setdefault(CollisionResolver.getBlockingKey(component), ({}, {}))
+
+            match, decision, score = self._findMatch(component, group, report)
+            if match is None:
+                CollisionResolver._addKept(group, component)
+                continue
+
+            # The component that was created first is kept, so IDs that the user has seen stay valid where possible.
+            keep, dup = (match, component) if match.timestamp <= component.timestamp else (component, match)
+            if keep is component:
+                CollisionResolver._removeKept(group, match)
+            self._merge(keep, dup, report)
+            CollisionResolver._addKept(group, keep)  # The titles of the duplicate's tokens are now the kept one's too
+            report.merges.append((keep.getId(), dup.getId(), decision, score))
+            merged[dup.getId()] = dup
+            grown.pop(dup.getId(), None)
+            if keep.getChildren():
+                grown[keep.getId()] = keep
+
+        if merged:
+            parent._children = [child for child in parent._children if child.getId() not in merged]
+            parent._indexChildren()
+            for keep in grown.values():
+                keep._computeAggregates()
+            component = parent
+            while component is not None:
+                component._computeAggregates()
+                component = component.getParent()
+            parent.markDirty()
+
+        return list(grown.values())
+
+    @staticmethod
+    def _getTitleWords(component: 'Component') -> set:
+        """
+        Gets the words in the titles of all of a component's tokens.
+
+        :param component: The component to get the title words of.
+        :type component: Component
+        :return: The words of the component's titles, in lowercase.
+        :rtype: set
+        """
+        words = set()
+        for token in component.getSuperToken().getTokens():
+            words |= getTitleWords(token.title)
+        return words
+
+    @staticmethod
+    def _addKept(group: tuple, component: 'Component') -> None:
+        """
+        Adds a component to the kept components of a group, or indexes the words of its new titles if it is already
+        there.
+
+        :param group: The kept components with the component's blocking key, by title and by title word.
+        :type group: tuple
+        :param component: The component to add.
+        :type component: Component
+        :return: None
+        :rtype: NoneType
+        """
+        titles, words = group
+        bucket = titles.setdefault(component.getSuperToken().tokens[0].title, [])
+        if component not in bucket:
+            bucket.append(component)
+        for word in CollisionResolver._getTitleWords(component):
+            words.setdefault(word, {})[component.getId()] = component
+
+    @staticmethod
+    def _removeKept(group: tuple, component: 'Component') -> None:
+        """
+        Removes a component from the kept components of a group.
+
+        :param group: The kept components with the component's blocking key, by title and by title word.
+        :type group: tuple
+        :param component: The component to remove.
+        :type component: Component
+        :return: None
+        :rtype: NoneType
+        """
+        titles, words = group
+        titles[component.getSuperToken().tokens[0].title].remove(component)
+        for word in CollisionResolver._getTitleWords(component):
+            words[word].pop(component.getId(), None)
+
+    def _findMatch(self, component: 'Component', group: tuple, report: 'MergeReport') -> tuple:
+        """
+        Finds the kept component that a component is a duplicate of.
+
+        The kept components with the same title are scored first, then the ones whose titles share words with the
+        component's, most shared words first. If there are none, every kept component in the group is scored, since
+        the token matcher can still find two components with different titles close (e.g. a button whose title changed
+        completely).
+
+        :param component: The component to find a match for.
+        :type component: Component
+        :param group: The kept components with the same blocking key as the component, by title and by title word.
+        :type group: tuple
+        :param report: The report to count comparisons in.
+        :type report: MergeReport
+        :return: The matching component (or None), the match decision, and the match score.
+        :rtype: tuple
+        """
+        titles, words = group
+        candidates = list(titles.get(component.getSuperToken().tokens[0].title, []))
+        seen = set(candidate.getId() for candidate in candidates)
+
+        # maps component ID to [number of shared title words, component]
+        similar = {}
+        for word in CollisionResolver._getTitleWords(component):
+            for id, other in words.get(word, {}).items():
+                if id not in seen:
+                    similar.setdefault(id, [0, other])[0] += 1
+        candidates.extend(other for numShared, other in sorted(similar.values(), key=lambda item: -item[0]))
+
+        if not candidates:
+            candidates = [other for others in titles.values() for other in others]
+
+        tokens = component.getSuperToken().getTokens()
+        bestMatch, bestScore = None, 0
+        for candidate in candidates:
+            report.numComparisons += 1
+            superToken = candidate.getSuperToken()
+            for token in tokens:
+                decision, score = superToken.shouldContain(token)
+                if decision == Token.Match.EXACT:
+                    return candidate, decision, score
+                elif decision == Token.Match.CLOSE and score > bestScore:
+                    bestMatch, bestScore = candidate, score
+
+        if bestMatch is None:
+            return None, Token.Match.NO, 0
+        return bestMatch, Token.Match.CLOSE, bestScore
+
+    def _merge(self, keep: 'Component', dup: 'Component', report: 'MergeReport') -> None:
+        """
+        Merges a component into one of its siblings: its tokens, children and visibility behaviors are moved to the
+        sibling, and it is removed from the model. The parent's children list and the aggregates are updated by the
+        caller.
+
+        :param keep: The component to keep.
+        :type keep: Component
+        :param dup: The component to merge into the kept one.
+        :type dup: Component
+        :param report: The report to count the rewired visibility behaviors in.
+        :type report: MergeReport
+        :return: None
+        :rtype: NoneType
+        """
+        tguim = self._tguim
+
+        # When windows are merged, everything in the duplicate window moves to the kept window.
+        isWindow = dup.depth == 0
+        moved = []
+        if isWindow:
+            moved = list(dup.getChildren())
+            for component in moved:
+                moved.extend(component.getChildren())
+        behaviors = set(dup.getSrcVisibilityBehaviors()) | set(dup.getDestVisibilityBehaviors())
+        if isWindow:
+            behaviors |= set(tguim.getBehaviorsFromWindow(dup)) | set(tguim.getBehaviorsToWindow(dup))
+
+        for vb in behaviors:
+            tguim._removeBehaviorEdges(vb)
+        for component in reversed(moved):
+            tguim._unindexComponent(component)
+        tguim._unindexComponent(dup)
+
+        for vb in dup.getSrcVisibilityBehaviors():
+            dup.removeSrcVisibilityBehavior(vb)
+            vb.setSrcComponent(keep)
+            keep.addSrcVisibilityBehavior(vb)
+            report.numBehaviorsRewired += 1
+        for vb in dup.getDestVisibilityBehaviors():
+            dup.removeDestVisibilityBehavior(vb)
+            vb.setDestComponent(keep)
+            keep.addDestVisibilityBehavior(vb)
+            report.numBehaviorsRewired += 1
+
+        for token in dup.getSuperToken().getTokens():
+            keep.getSuperToken().addToken(token)
+
+        if dup.getChildren():
+            for child in dup.getChildren():
+                child._parent = keep
+                child.markDirty()
+                self._checked.discard(child.getId())  # It has new siblings to be compared with
+            children = keep._children + dup._children
+            keep._children = sorted(children, key=lambda child: child.timestamp)
+            keep._indexChildren()
+            dup._children = []
+        keep.markDirty()
+
+        tguim._removeComponent(dup, keep)
+        for component in moved:
+            tguim._indexComponent(component)
+        for vb in behaviors:
+            tguim._addBehaviorEdges(vb)
+
+    def _retargetActions(self, actions: list, mergedIDs: dict, report: 'MergeReport') -> None:
+        """
+        Points the component actions that target merged components at the components they were merged into.
+
+        :param actions: The component actions to check, in addition to the visibility behaviors' trigger actions.
+        :type actions: list[ComponentAction]
+        :param mergedIDs: Maps the ID of each merged component to the ID of the component it was merged into.
+        :type mergedIDs: dict
+        :param report: The report to count the retargeted actions in.
+        :type report: MergeReport
+        :return: None
+        :rtype: NoneType
+        """
+        tguim = self._tguim
+        triggers = {}
+        for vb in tguim.getVisibilityBehaviors().values():
+            action = vb.getTriggerAction()
+            if action is not None:
+                triggers.setdefault(action, []).append(vb)
+
+        for action in set(actions) | set(triggers):
+            target = action.getTargetComponent()
+            if target is None or target.getId() not in mergedIDs:
+                continue
+            action.setTargetComponent(tguim.getComponent(mergedIDs[target.getId()]))
+            report.numActionsRetargeted += 1
+            for vb in triggers.get(action, []):
+                vb.setTriggerAction(action)  # The method name has the target's ID in it
@@ -22,6 +22,7 @@ This module contains the Component class.
 """
 
 from datetime import datetime
+from threading import Lock
 
 if 'CONTEXT' not in locals():
     try:  # Facile
@@ -52,6 +53,9 @@ class Component(Entity):
     Components are organized in a tree in the TargetGuiModel class.
     """
 
+    PROPERTY_CATEGORIES = ["Base", "GUI Component", "Visual"]
+    _aggregateLock = Lock()  # Guards the subtree aggregates, which the observer's thread updates too
+
     def __init__(self, tguim: 'TargetGuiModel', parent: 'Component' = None, superToken: 'SuperToken' = None):
         """
         Constructs a Component object.
@@ -68,51 +72,69 @@ class Component(Entity):
         self._superToken: 'SuperToken' = superToken
         self._parent: 'Component' = parent
         self._children = []
-        self._srcVisibilityBehaviors = []
-        self._destVisibilityBehaviors = []
+        # A child's position in _children is _childIndexBase + the child's _siblingKey. Adding a child at either end
+        # only changes the base or the new child's key, so positions never have to be searched for.
+        self._childIndexBase = 0
+        self._siblingKey = 0
+        self._srcVisibilityBehaviors = {}  # Used as ordered sets, so membership checks take O(1) time
+        self._destVisibilityBehaviors = {}
         self._model = tguim
         self.timestamp = datetime.now().timestamp()
         self.depth = -1  # -1 if root, 0 if window, etc.
-        self.isExtraComponent = False
+        self._isExtraComponent = False
         self.loadedFromTGUIM = False  # This is only set to true when loaded from a tguim file,
         # then promptly set back to false
 
+        # Aggregates of the subtree rooted at this component (including itself). Adding a child or changing a
+        # component updates them along the path to the root.
+        self._hasPicture = superToken is not None and superToken.hasPicture()
+        self._numDescendants = 0
+        self._height = 1  # The number of levels in the subtree
+        self._numPictureComponents = int(self._hasPicture)
+        self._numExtraComponents = 0
+        if superToken is not None:
+            superToken.setOwner(self)
+
         if parent is not None:
             parent.addChild(self)
-
-            propToken = superToken.getTokens()[0]
-            predefinedCategories = ["Base", "GUI Component", "Visual"]
-            customCategories = {}
-            props = Properties.createPropertiesObject(predefinedCategories, customCategories)
-            assert(props is not None)
-            # Set base property values
-            props.getProperty("ID")[1].setValue(self.getId())
-            props.getProperty("Name")[1].setValue(propToken.controlIDs[-1])
-            props.getProperty("Type")[1].setValue("Component")
-
-            # Set component property values
-            props.getProperty("Title")[1].setValue(propToken.title)
-            props.getProperty("Parent Title")[1].setValue(propToken.parentTitle)
-            props.getProperty("Class Name")[1].setValue(propToken.type)
-            props.getProperty("Is Dialog")[1].setValue(propToken.isDialog)
-
-            # Set visual property values
-            geometry = superToken.posRelativeToParent
-            props.getProperty("X")[1].setValue(geometry[0])
-            props.getProperty("Y")[1].setValue(geometry[1])
-            props.getProperty("Width")[1].setValue(geometry[2])
-            props.getProperty("Height")[1].setValue(geometry[3])
-            # props.getProperty("Has Moved")[1].setValue(self._graphicsItem.getNumMoves() != 0)
-
-            self.setProperties(props)
-
-            nxtParent = parent
-            while nxtParent:
-                self.depth += 1
-                nxtParent = nxtParent.getParent()
+            self.setProperties(self._createProperties())
+            self.depth = parent.depth + 1
 
         self.triggerUpdate()
 
+    def _createProperties(self) -> 'Properties':
+        """
+        Creates the properties of the component from its SuperToken's first token.
+
+        :return: The component's new properties.
+        :rtype: Properties
+        """
+
+        props = Properties.createPropertiesObject(Component.PROPERTY_CATEGORIES, {}, self._getPropertyValues())
+        assert(props is not None)
+        return props
+
+    def _getPropertyValues(self) -> dict:
+        """
+        Gets the initial values of the component's properties, from its SuperToken's first token.
+
+        :return: The values by property name.
+        :rtype: dict
+        """
+
+        propToken = self._superToken.tokens[0]
+        geometry = self._superToken.posRelativeToParent
+        return {
+            # Base property values
+            "ID": self.getId(), "Name": propToken.controlIDs[-1], "Type": "Component",
+            # Component property values
+            "Title": propToken.title, "Parent Title": propToken.parentTitle, "Class Name": propToken.type,
+            "Is Dialog": propToken.isDialog,
+            # Visual property values
+            "X": geometry[0], "Y": geometry[1], "Width": geometry[2], "Height": geometry[3],
+            # "Has Moved": self._graphicsItem.getNumMoves() != 0,
+        }
+
     def getSuperToken(self) -> 'SuperToken':
         """
         Gets the component's SuperToken
@@ -129,7 +151,7 @@ class Component(Entity):
         :return: The list of all the visibility behaviors coming out from this component
         :rtype: List of VisibilityBehavior
         """
-        return self._srcVisibilityBehaviors
+        return list(self._srcVisibilityBehaviors)
 
     def getDestVisibilityBehaviors(self):
         """
@@ -138,7 +160,7 @@ class Component(Entity):
         :return: The list of all the visibility behaviors coming into this component
         :rtype: List of VisibilityBehavior
         """
-        return self._destVisibilityBehaviors
+        return list(self._destVisibilityBehaviors)
 
     def getModel(self) -> 'TargetGuiModel':
         """
@@ -196,6 +218,9 @@ class Component(Entity):
         The path is a list of 2-element tuples where the first element is a component,
         and the second element is the position of that component amongst its siblings.
 
+        This takes O(depth) time, since each position is looked up in O(1) time. The path isn't cached because
+        positions change whenever a sibling is added in front of a component, and callers modify the list.
+
         :return: The path to the component from the root.
         :rtype: list
         """
@@ -221,26 +246,17 @@ class Component(Entity):
 
     def getNumDescendants(self) -> int:
         """
-        Gets the number of components descended from this component in the tree.
+        Gets the number of components descended from this component in the tree. This takes O(1) time.
 
         :return: The number of descendant components.
         :rtype: int
         """
 
-        numDescendants = 0
-
-        if len(self.getChildren()) == 0:
-            return 0
-
-        for child in self.getChildren():
-            numDescendants += 1
-            numDescendants += child.getNumDescendants()
-
-        return numDescendants
+        return self._numDescendants
 
     def getMaxDepth(self, curDepth: int = 1) -> int:
         """
-        Gets How many levels deep the tree goes below the component.
+        Gets How many levels deep the tree goes below the component. This takes O(1) time.
 
         :param curDepth: The level in the tree the component is at. (Root=1)
         :type: curDepth: int
@@ -248,28 +264,109 @@ class Component(Entity):
         :rtype: int
         """
 
-        maxDepth = [curDepth]
+        return curDepth + self._height - 1
+
+    def hasPicturesInSubtree(self) -> bool:
+        """
+        Determines whether any token of this component or its descendants has a picture. This takes O(1) time.
+
+        :return: True if there is a picture in the component's subtree.
+        :rtype: bool
+        """
+
+        return self._numPictureComponents > 0
+
+    def getNumExtraComponents(self) -> int:
+        """
+        Gets the number of extra components in this component's subtree, including itself. This takes O(1) time.
+
+        :return: The number of extra components.
+        :rtype: int
+        """
+
+        return self._numExtraComponents
+
+    @property
+    def isExtraComponent(self) -> bool:
+        return self._isExtraComponent
+
+    @isExtraComponent.setter
+    def isExtraComponent(self, isExtraComponent: bool) -> None:
+        if isExtraComponent == self._isExtraComponent:
+            return
+        self._isExtraComponent = isExtraComponent
+        delta = 1 if isExtraComponent else -1
+        with Component._aggregateLock:
+            component = self
+            while component is not None:
+                component._numExtraComponents += delta
+                component = component._parent
+
+    def pictureAdded(self) -> None:
+        """
+        Records that a token with a picture was added to this component's super token. The SuperToken calls this,
+        usually from the observer's thread.
+
+        :return: None
+        :rtype: NoneType
+        """
 
-        for child in self.getChildren():
-            maxDepth.append(child.getMaxDepth(curDepth + 1))
+        with Component._aggregateLock:
+            if self._hasPicture:
+                return
+            self._hasPicture = True
+            component = self
+            while component is not None:
+                component._numPictureComponents += 1
+                component = component._parent
+
+    def _addToAggregates(self, child: 'Component') -> None:
+        """
+        Adds a new child's subtree to the aggregates of this component and its ancestors in O(depth) time.
+        """
 
-        return max(maxDepth)
+        with Component._aggregateLock:
+            height = child._height + 1
+            component = self
+            while component is not None:
+                component._numDescendants += child._numDescendants + 1
+                component._numPictureComponents += child._numPictureComponents
+                component._numExtraComponents += child._numExtraComponents
+                if component._height < height:
+                    component._height = height
+                height = component._height + 1
+                component = component._parent
+
+    def _computeAggregates(self) -> None:
+        """
+        Computes this component's aggregates from its children's, which must already be up to date. Used when a
+        whole tree is built at once.
+        """
+
+        children = self._children
+        self._numDescendants = len(children) + sum(child._numDescendants for child in children)
+        self._height = 1 + max((child._height for child in children), default=0)
+        self._numPictureComponents = int(self._hasPicture) + sum(child._numPictureComponents for child in children)
+        self._numExtraComponents = int(self._isExtraComponent) + sum(child._numExtraComponents for child in children)
 
     def getPositionInSiblings(self) -> int:
         """
-        Gets the index of itself in its parent's children list.
+        Gets the index of itself in its parent's children list in O(1) time.
 
         :return: the index of itself in its parent's children list.
         :rtype: int
         """
-        if self._parent == None:
+        if self._parent is None:
             return 0
-        return self._parent.getChildren().index(self)
+        return self._parent._childIndexBase + self._siblingKey
 
     def addChild(self, child, pos=0) -> None:
         """
         Adds a given component to the list of children components.
 
+        Adding a child at the start or the end of the list keeps the positions of the other children in O(1) time;
+        adding one in the middle renumbers the children.
+
         :param child: A component object to be added to the children list.
         :type child: Component
         :param pos: Optionally position the child in children list. default=0
@@ -278,7 +375,33 @@ class Component(Entity):
         :rtype: NoneType
         """
 
+        numChildren = len(self._children)
+        if pos < 0:
+            pos = max(0, numChildren + pos)  # Same as list.insert
+        pos = min(pos, numChildren)
+
+        child._parent = self
         self._children.insert(pos, child)
+        self._addToAggregates(child)
+        if pos == 0:
+            self._childIndexBase += 1
+            child._siblingKey = -self._childIndexBase
+        elif pos == numChildren:
+            child._siblingKey = pos - self._childIndexBase
+        else:
+            self._indexChildren()
+        self.markDirty()
+
+    def _indexChildren(self) -> None:
+        """
+        Numbers the children by their positions. This must be called whenever the children list is replaced.
+
+        :return: None
+        :rtype: NoneType
+        """
+        self._childIndexBase = 0
+        for i, child in enumerate(self._children):
+            child._siblingKey = i
 
     def addDestVisibilityBehavior(self, newVisBehavior: VisibilityBehavior) -> None:
         """
@@ -292,7 +415,8 @@ class Component(Entity):
         """
 
         if newVisBehavior not in self._destVisibilityBehaviors:
-            self._destVisibilityBehaviors.append(newVisBehavior)
+            self._destVisibilityBehaviors[newVisBehavior] = None
+            self.markDirty()
 
     def removeDestVisibilityBehavior(self, visBehavior: VisibilityBehavior) -> None:
         """
@@ -306,7 +430,8 @@ class Component(Entity):
         """
 
         if visBehavior in self._destVisibilityBehaviors:
-            self._destVisibilityBehaviors.remove(visBehavior)
+            del self._destVisibilityBehaviors[visBehavior]
+            self.markDirty()
 
     def addSrcVisibilityBehavior(self, newVisBehavior: VisibilityBehavior) -> None:
         """
@@ -320,7 +445,8 @@ class Component(Entity):
         """
 
         if newVisBehavior not in self._srcVisibilityBehaviors:
-            self._srcVisibilityBehaviors.append(newVisBehavior)
+            self._srcVisibilityBehaviors[newVisBehavior] = None
+            self.markDirty()
 
     def removeSrcVisibilityBehavior(self, visBehavior: VisibilityBehavior) -> None:
         """
@@ -334,7 +460,8 @@ class Component(Entity):
         """
 
         if visBehavior in self._srcVisibilityBehaviors:
-            self._srcVisibilityBehaviors.remove(visBehavior)
+            del self._srcVisibilityBehaviors[visBehavior]
+            self.markDirty()
 
     def __repr__(self) -> str:
         """
@@ -345,12 +472,14 @@ class Component(Entity):
         """
         return str(self._id)
 
-    def asDict(self) -> dict:
+    def asDict(self, includeImages: bool = True) -> dict:
         """
         Get a dictionary representation of the component.
 
         NOTE: this is not just a getter of the __dict__ attribute.
 
+        :param includeImages: If False, the pictures of the super token's tokens are not stored.
+        :type includeImages: bool
         :return: The dictionary representation of the object.
         :rtype: dict
         """
@@ -369,7 +498,7 @@ class Component(Entity):
             d['properties'] = None
 
         if self._superToken:
-            d['superToken'] = self._superToken.asDict()
+            d['superToken'] = self._superToken.asDict(includeImages)
         else:
             d['superToken'] = None
 
@@ -401,18 +530,23 @@ class Component(Entity):
         if d is None:
             return None
 
-        superToken = SuperToken.fromDict(d['superToken'])
+        superToken = d['superToken']
+        if not isinstance(superToken, SuperToken):  # It's already built if a worker process loaded it
+            superToken = SuperToken.fromDict(superToken)
         comp = Component(tguim, superToken=superToken)
         # comp._children = d['children'] # need to add children one at a time since graphics are
         # created later
         comp._id = d["id"]
         comp._srcVisibilityBehaviors = d['srcBehaviors']
         comp._destVisibilityBehaviors = d['destBehaviors']
-        comp.setProperties(Properties.fromDict(d['properties']))
+        properties = d['properties']
+        if not isinstance(properties, Properties):
+            properties = Properties.fromDict(properties)
+        comp.setProperties(properties)
         comp._parent = d['parent']
         comp.timestamp = d['timestamp']
         comp.depth = d['depth']
-        comp.isExtraComponent = d['isEC']
+        comp._isExtraComponent = d['isEC']  # The aggregates are computed once the tree is linked
         comp.loadedFromTGUIM = True
 
         return comp
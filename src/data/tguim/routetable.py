@@ -0,0 +1,160 @@
+"""
+..
+    /------------------------------------------------------------------------------\
+    |                 -- FACADE TECHNOLOGIES INC.  CONFIDENTIAL --                 |
+    |------------------------------------------------------------------------------|
+    |                                                                              |
+    |    Copyright [2019] Facade Technologies Inc.                                 |
+    |    All Rights Reserved.                                                      |
+    |                                                                              |
+    | NOTICE:  All information contained herein is, and remains the property of    |
+    | Facade Technologies Inc. and its suppliers if any.  The intellectual and     |
+    | and technical concepts contained herein are proprietary to Facade            |
+    | Technologies Inc. and its suppliers and may be covered by U.S. and Foreign   |
+    | Patents, patents in process, and are protected by trade secret or copyright  |
+    | law.  Dissemination of this information or reproduction of this material is  |
+    | strictly forbidden unless prior written permission is obtained from Facade   |
+    | Technologies Inc.                                                            |
+    |                                                                              |
+    \------------------------------------------------------------------------------/
+
+This module contains the RouteTable class, which precomputes the shortest sequences of visibility behaviors
+needed to show one top-level window from another.
+"""
+
+from collections import deque
+
+
+class RouteTable:
+    """
+    The RouteTable models the target GUI as a graph where top-level windows are the nodes and visibility behaviors are
+    the edges. A visibility behavior is an edge from the window containing its source component to the window
+    containing its destination component.
+
+    The edges are read from the target GUI model's window adjacency (TargetGuiModel.getBehaviorsFromWindow and
+    getBehaviorsToWindow). Shortest routes between every pair of windows are computed once, with a breadth-first search
+    from each window, and stored as a next-hop table. Forcing a window to appear then becomes a lookup instead of a
+    search.
+    """
+
+    def __init__(self, tguim: 'TargetGuiModel'):
+        """
+        Constructs a RouteTable from the visibility behaviors in a target GUI model.
+
+        :param tguim: The target GUI model to build the route table from.
+        :type tguim: TargetGuiModel
+        """
+        self._tguim = tguim
+
+        # maps (from window ID, to window ID) to (distance, first visibility behavior to perform)
+        self._nextHop = {}
+
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """
+        Rebuilds the next-hop table from the target GUI model's visibility behaviors.
+
+        :return: None
+        :rtype: NoneType
+        """
+        self._nextHop = {}
+
+        # A backwards BFS from each target window gives every window's distance to it and the first hop to take.
+        for targetWin in self._tguim.getTopLevelWindows():
+            target = targetWin.getId()
+            self._nextHop[(target, target)] = (0, None)
+            work = deque([targetWin])
+            while work:
+                cur = work.popleft()
+                dist = self._nextHop[(cur.getId(), target)][0]
+                for vb in self._tguim.getBehaviorsToWindow(cur):
+                    srcWin = self._tguim.getWindow(vb.getSrcComponent())
+                    if (srcWin.getId(), target) not in self._nextHop:
+                        self._nextHop[(srcWin.getId(), target)] = (dist + 1, vb)
+                        work.append(srcWin)
+
+    def getDistance(self, fromWindow: int, toWindow: int) -> int:
+        """
+        Gets the number of visibility behaviors needed to show one window from another.
+
+        :param fromWindow: The ID of the window to start from.
+        :type fromWindow: int
+        :param toWindow: The ID of the window to show.
+        :type toWindow: int
+        :return: The number of visibility behaviors on the shortest route, or None if there is no route.
+        :rtype: int
+        """
+        if fromWindow == toWindow:
+            return 0
+        hop = self._nextHop.get((fromWindow, toWindow))
+        if hop is None:
+            return None
+        return hop[0]
+
+    def getRoute(self, fromWindow: int, toWindow: int) -> list:
+        """
+        Gets the shortest route between two windows.
+
+        :param fromWindow: The ID of the window to start from.
+        :type fromWindow: int
+        :param toWindow: The ID of the window to show.
+        :type toWindow: int
+        :return: The visibility behaviors to perform in order, or None if there is no route.
+        :rtype: list[VisibilityBehavior]
+        """
+        if self.getDistance(fromWindow, toWindow) is None:
+            return None
+
+        route = []
+        cur = fromWindow
+        while cur != toWindow:
+            dist, vb = self._nextHop[(cur, toWindow)]
+            route.append(vb)
+            cur = self._tguim.getWindow(vb.getDestComponent()).getId()
+        return route
+
+    def getRoutes(self, openWindows: set, toWindow: int, k: int = 1) -> list:
+        """
+        Gets up to k routes that show a window, starting from any of the open windows, shortest first.
+
+        The first route is the shortest one from the closest open window. Alternatives are made by taking a different
+        first visibility behavior out of an open window and following the shortest route from wherever it leads, so
+        that a route whose trigger action fails can be replaced by one that doesn't start with the same action.
+
+        :param openWindows: The IDs of the windows that are currently open.
+        :type openWindows: set
+        :param toWindow: The ID of the window to show.
+        :type toWindow: int
+        :param k: The maximum number of routes to return.
+        :type k: int
+        :return: A list of routes, each being a list of visibility behaviors to perform in order. If the window is
+                 already open, the only route is empty.
+        :rtype: list[list[VisibilityBehavior]]
+        """
+        if toWindow in openWindows:
+            return [[]]
+
+        candidates = []
+        for openWin in openWindows:
+            window = self._tguim.getComponent(openWin)
+            if window is None:  # The window isn't in the model
+                continue
+            for vb in self._tguim.getBehaviorsFromWindow(window):
+                nextWin = self._tguim.getWindow(vb.getDestComponent()).getId()
+                dist = self.getDistance(nextWin, toWindow)
+                if dist is not None:
+                    candidates.append((dist + 1, vb, nextWin))
+
+        candidates.sort(key=lambda candidate: candidate[0])
+
+        routes = []
+        firstHops = set()
+        for dist, vb, nextWin in candidates:
+            if vb.getId() in firstHops:
+                continue
+            firstHops.add(vb.getId())
+            routes.append([vb] + self.getRoute(nextWin, toWindow))
+            if len(routes) >= k:
+                break
+        return routes
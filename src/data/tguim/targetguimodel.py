@@ -21,6 +21,10 @@
 This module contains the TargetGuiModel class.
 """
 
+import gc
+import json
+import re
+from bisect import bisect_left
 from collections import OrderedDict
 from PySide2.QtCore import QObject, Slot, Signal
 
@@ -37,11 +41,13 @@ if CONTEXT in ("Facile", "Sphinx"):
     from tguiil.supertokens import SuperToken
     from data.tguim.component import Component
     from data.tguim.visibilitybehavior import VisibilityBehavior
+    from data.properties import Properties
 elif CONTEXT in ("API"):
     # from ..entity import Entity
     # from ...tguiil.supertokens import SuperToken
     # from .component import Component
     # from .visibilitybehavior import VisibilityBehavior
+    # from ..properties import Properties
     pass
 else:
     raise InvalidContextException(CONTEXT)
@@ -56,9 +62,17 @@ class TargetGuiModel(QObject):
     """
     dataChanged = Signal(int)
     newComponent = Signal(Component)
+    newComponents = Signal(list)  # Emitted once by createComponents() with all of the new components
     newBehavior = Signal(VisibilityBehavior)
     behaviorRemoved = Signal(VisibilityBehavior)
 
+    # The fields that components are indexed by. See findComponents().
+    INDEXED_FIELDS = ("type", "title", "window", "depth", "autoid", "isDialog")
+
+    # Token fields that the runtime matcher never compares. The identifier and process ID are only compared between
+    # tokens from the same run of the application, and generated APIs don't store pictures.
+    RUNTIME_IGNORED_TOKEN_FIELDS = ("appTimeStamp", "identifier", "processID", "pic", "picHash")
+
     def __init__(self) -> 'TargetGuiModel':
         """
         Constructs a TargetGuiModel object.
@@ -75,18 +89,43 @@ class TargetGuiModel(QObject):
         # maps visibility behavior id to visibility behavior
         self._visibilityBehaviors = OrderedDict()
 
+        # The IDs of the visibility behaviors in increasing order, and a map from each ID to its position in that
+        # order. See getNthVisibilityBehavior() and getVisibilityBehaviorPosition().
+        self._behaviorOrder = []
+        self._behaviorPositions = {}
+
+        # Window-level adjacency: maps a top-level window's id to the visibility behaviors whose source (or
+        # destination) is in that window. The inner dicts are used as ordered sets.
+        self._outgoingBehaviors = {}
+        self._incomingBehaviors = {}
+
         # Allows easy lookup of components given a super token
         self._superTokenToComponentMapping = {None: None}
 
-    def resolveComponentCollisions(self) -> None:
-        """
-        Resolves any component collisions that are present, when called.
+        # Secondary indexes for findComponents(). Each maps a field's value to the set of IDs of the components with
+        # that value. Component fields are read from the component's first token, like its properties are.
+        self._indexes = {field: {} for field in TargetGuiModel.INDEXED_FIELDS}
+        self._windowIDs = {}  # maps component id to the id of its top-level window
 
-        :return: None
-        :rtype: NoneType
+        self._collisionResolver = None  # Created the first time collisions are resolved
+
+    def resolveComponentCollisions(self, actions: list = ()) -> 'MergeReport':
+        """
+        Resolves any component collisions that are present, when called: components that represent the same
+        component of the target GUI are merged. Only the components created since the last call (and their siblings)
+        are checked. See CollisionResolver.
+
+        :param actions: The component actions that may target the merged components, e.g. the ones in the API model.
+                        The trigger actions of the visibility behaviors are always retargeted.
+        :type actions: list[ComponentAction]
+        :return: A report of the merged components.
+        :rtype: MergeReport
         """
 
-        pass
+        if self._collisionResolver is None:
+            from data.tguim.collisionresolver import CollisionResolver  # Only used in Facile
+            self._collisionResolver = CollisionResolver(self)
+        return self._collisionResolver.resolve(actions)
 
     def getRoot(self) -> 'Component':
         """
@@ -110,15 +149,150 @@ class TargetGuiModel(QObject):
         """
         Gets a list of all top-level components in the tguim
 
-        :return: list of all top-level components in the tguim
+        :return: list of all top-level components in the tguim, in the order they were created
         :rtype: list
         """
 
-        windows = []
-        for id, comp in self._components:
-            if comp.depth is 0:
-                windows.append(comp)
-        return windows
+        return self.findComponents(depth=0)
+
+    def findComponents(self, type: str = None, title=None, window: 'Component' = None, depth: int = None,
+                       autoid: str = None, isDialog: bool = None) -> list:
+        """
+        Finds the components that match all of the given criteria. Criteria that are None are ignored.
+
+        The model keeps an index for each criterion, so only the components that match are looked at. For example,
+        findComponents(type="Button", window=w) gets all buttons in window w, and
+        findComponents(title=re.compile("Save")) gets all components whose title contains "Save".
+
+        :param type: The class name of the components, e.g. "Button".
+        :type type: str
+        :param title: The title of the components, or a compiled regular expression that is searched for in titles.
+        :type title: str or re.Pattern
+        :param window: The top-level window that the components are in. A window is in itself.
+        :type window: Component
+        :param depth: The depth of the components in the tree (0 for top-level windows).
+        :type depth: int
+        :param autoid: The automation ID of the components.
+        :type autoid: str
+        :param isDialog: Whether the components are dialogs.
+        :type isDialog: bool
+        :return: The matching components, in the order they were created.
+        :rtype: list[Component]
+        """
+
+        criteria = {"type": type, "title": title, "window": window.getId() if window is not None else None,
+                    "depth": depth, "autoid": autoid, "isDialog": isDialog}
+        matches = []
+        for field, value in criteria.items():
+            if value is None:
+                continue
+            index = self._indexes[field]
+            if isinstance(value, re.Pattern):
+                ids = set()
+                for key, keyIDs in index.items():
+                    if key is not None and value.search(key):
+                        ids |= keyIDs
+                matches.append(ids)
+            else:
+                matches.append(index.get(value, set()))
+
+        if not matches:
+            return list(self._components.values())
+
+        # Intersect starting from the smallest set, so the work depends on the number of matches.
+        matches.sort(key=len)
+        ids = set(matches[0])
+        for other in matches[1:]:
+            ids &= other
+        return [self._components[id] for id in sorted(ids)]  # IDs increase as entities are created
+
+    def _indexComponent(self, component: 'Component') -> None:
+        """
+        Adds a component to the indexes used by findComponents(). Its parent must have been indexed already, unless
+        its parent is the root.
+
+        :param component: The component to index
+        :type component: Component
+        :return: None
+        :rtype: NoneType
+        """
+
+        id = component.getId()
+        parent = component.getParent()
+        windowID = id if parent is self._root else self._windowIDs[parent.getId()]
+        self._windowIDs[id] = windowID
+
+        for field, value in self._getIndexValues(component, windowID).items():
+            self._indexes[field].setdefault(value, set()).add(id)
+
+    @staticmethod
+    def _getIndexValues(component: 'Component', windowID: int) -> dict:
+        """
+        Gets the values that a component is indexed by.
+
+        :param component: The component to get the values of.
+        :type component: Component
+        :param windowID: The ID of the component's top-level window.
+        :type windowID: int
+        :return: The component's value of each indexed field.
+        :rtype: dict
+        """
+
+        token = component.getSuperToken().tokens[0]
+        return {"type": token.type, "title": token.title, "window": windowID, "depth": component.depth,
+                "autoid": token.autoid, "isDialog": token.isDialog}
+
+    def getWindow(self, component: 'Component') -> 'Component':
+        """
+        Gets the top-level window that contains a component (or the component itself if it is a window) in O(1) time.
+
+        :param component: The component to get the window of.
+        :type component: Component
+        :return: The window containing the component, or None for the root.
+        :rtype: Component
+        """
+
+        windowID = self._windowIDs.get(component.getId())
+        if windowID is None:
+            return None
+        return self._components[windowID]
+
+    def _unindexComponent(self, component: 'Component') -> None:
+        """
+        Removes a component from the indexes used by findComponents().
+
+        :param component: The component to remove from the indexes
+        :type component: Component
+        :return: None
+        :rtype: NoneType
+        """
+
+        id = component.getId()
+        windowID = self._windowIDs.pop(id)
+        for field, value in self._getIndexValues(component, windowID).items():
+            ids = self._indexes[field][value]
+            ids.discard(id)
+            if not ids:
+                del self._indexes[field][value]
+
+    def _removeComponent(self, component: 'Component', mergedInto: 'Component') -> None:
+        """
+        Removes a component that was merged into another one from the model. The component must not have any children
+        or visibility behaviors left, and must already be removed from the indexes and its parent's children.
+
+        :param component: The component to remove.
+        :type component: Component
+        :param mergedInto: The component that the removed component was merged into.
+        :type mergedInto: Component
+        :return: None
+        :rtype: NoneType
+        """
+
+        del self._components[component.getId()]
+        # The observer still knows the removed component's super token, so components that it creates under that
+        # super token are put under the component it was merged into.
+        self._superTokenToComponentMapping[component.getSuperToken()] = mergedInto
+        component.markRemoved()
 
     def getComponent(self, iD: int) -> 'Component':
         """
@@ -135,6 +309,18 @@ class TargetGuiModel(QObject):
         else:
             return None
 
+    def getComponentWithSuperToken(self, superToken: 'SuperToken') -> 'Component':
+        """
+        Gets the component that was created for a SuperToken.
+
+        :param superToken: The SuperToken of the desired component.
+        :type superToken: SuperToken
+        :return: The component with the given SuperToken, or None if there isn't one.
+        :rtype: Component
+        """
+
+        return self._superTokenToComponentMapping.get(superToken)
+
     def getEntity(self, iD: int) -> 'Component':
         """
         Gets the entity with the specified id.
@@ -178,10 +364,92 @@ class TargetGuiModel(QObject):
 
         self._superTokenToComponentMapping[newSuperToken] = newComponent
         self._components[newComponent.getId()] = newComponent
+        self._indexComponent(newComponent)
         self.dataChanged.emit(newComponent.getId())
         self.newComponent.emit(newComponent)
         return newComponent
 
+    def createComponents(self, items: list) -> list:
+        """
+        Creates components for many SuperTokens at once, e.g. when a session is replayed or components are imported.
+
+        Each item is a (SuperToken, parent SuperToken) pair, like the arguments of createComponent(). A parent
+        SuperToken must either have a component already or come before its children in the list. The components end
+        up in the same places in the tree as if createComponent() had been called for each item, but the tree, the
+        indexes and the subtree aggregates are updated in one pass, and all of the components' properties are created
+        by one call to Properties.createPropertiesObjects(). Listeners get a single newComponents signal and a single
+        dataChanged signal instead of one of each per component.
+
+        :param items: The (SuperToken, parent SuperToken) pairs to create components for, parents first.
+        :type items: list[tuple[SuperToken, SuperToken]]
+        :return: The components that were created, in the same order as the items.
+        :rtype: list[Component]
+        """
+
+        # Nothing created here is garbage, but the garbage collector would still scan the growing heap over and over
+        # while hundreds of thousands of objects are allocated, so it's paused until the components are built.
+        gcWasEnabled = gc.isenabled()
+        gc.disable()
+        try:
+            newComponents = self._buildComponents(items)
+        finally:
+            if gcWasEnabled:
+                gc.enable()
+
+        if newComponents:
+            self.dataChanged.emit(self._root.getId())
+            self.newComponents.emit(newComponents)
+        return newComponents
+
+    def _buildComponents(self, items: list) -> list:
+        """
+        Creates the components for createComponents() and adds them to the tree, the indexes and the aggregates,
+        without notifying listeners.
+
+        :param items: The (SuperToken, parent SuperToken) pairs to create components for, parents first.
+        :type items: list[tuple[SuperToken, SuperToken]]
+        :return: The components that were created, in the same order as the items.
+        :rtype: list[Component]
+        """
+
+        mapping = self._superTokenToComponentMapping
+        newComponents = []
+        newChildren = OrderedDict()  # maps each parent to its new children, in the order they were created
+        for superToken, parentToken in items:
+            parentComponent = self._root if parentToken is None else mapping[parentToken]
+            newComponent = Component(self, superToken=superToken)
+            newComponent._parent = parentComponent
+            newComponent.depth = parentComponent.depth + 1
+
+            mapping[superToken] = newComponent
+            self._components[newComponent.getId()] = newComponent
+            newChildren.setdefault(parentComponent, []).append(newComponent)
+            newComponents.append(newComponent)
+            self._indexComponent(newComponent)
+
+        valuesList = [newComponent._getPropertyValues() for newComponent in newComponents]
+        propertiesObjects = Properties.createPropertiesObjects(Component.PROPERTY_CATEGORIES, {}, valuesList)
+        for newComponent, properties in zip(newComponents, propertiesObjects):
+            newComponent.setProperties(properties)
+
+        # createComponent() puts each new child in front of its siblings.
+        for parentComponent, children in newChildren.items():
+            parentComponent._children[:0] = reversed(children)
+            parentComponent._indexChildren()
+            parentComponent.markDirty()
+
+        # The new components only have new children, so their aggregates are computed bottom-up. Then each new
+        # subtree that hangs off an existing component is added to that component's aggregates and its ancestors'.
+        for newComponent in reversed(newComponents):
+            newComponent._computeAggregates()
+        newIDs = set(newComponent.getId() for newComponent in newComponents)
+        for parentComponent, children in newChildren.items():
+            if parentComponent.getId() not in newIDs:
+                for child in children:
+                    parentComponent._addToAggregates(child)
+
+        return newComponents
+
     def getVisibilityBehaviors(self) -> dict:
         """
         Gets the dictionary of VisibilityBehaviors.
@@ -200,9 +468,159 @@ class TargetGuiModel(QObject):
         :rtype: VisiblityBehavior
         """
 
-        keys = list(self._visibilityBehaviors.keys())
-        keys.sort()
-        return self._visibilityBehaviors[keys[n]]
+        return self._visibilityBehaviors[self._behaviorOrder[n]]
+
+    def getVisibilityBehaviorPosition(self, vb: 'VisibilityBehavior') -> int:
+        """
+        Gets the position of a visibility behavior, such that getNthVisibilityBehavior(position) returns it.
+
+        :param vb: The visibility behavior to get the position of.
+        :type vb: VisibilityBehavior
+        :return: The position of the visibility behavior, or None if it isn't in the model.
+        :rtype: int
+        """
+
+        return self._behaviorPositions.get(vb.getId())
+
+    def getBehaviorsFromWindow(self, window: 'Component') -> list:
+        """
+        Gets the visibility behaviors that can be performed from a top-level window: the ones whose source component
+        is in the window.
+
+        :param window: The top-level window.
+        :type window: Component
+        :return: The visibility behaviors whose source is in the window.
+        :rtype: list[VisibilityBehavior]
+        """
+
+        return list(self._outgoingBehaviors.get(window.getId(), ()))
+
+    def getBehaviorsToWindow(self, window: 'Component') -> list:
+        """
+        Gets the visibility behaviors that affect a top-level window: the ones whose destination component is in the
+        window.
+
+        :param window: The top-level window.
+        :type window: Component
+        :return: The visibility behaviors whose destination is in the window.
+        :rtype: list[VisibilityBehavior]
+        """
+
+        return list(self._incomingBehaviors.get(window.getId(), ()))
+
+    def getReachableWindows(self, windows: list) -> list:
+        """
+        Gets the top-level windows that can be shown from any of the given windows by performing visibility behaviors,
+        including the given windows themselves.
+
+        :param windows: The top-level windows to start from.
+        :type windows: list[Component]
+        :return: The reachable windows, closest first.
+        :rtype: list[Component]
+        """
+
+        reached = dict.fromkeys(window.getId() for window in windows)
+        work = list(reached)
+        for windowID in work:
+            for vb in self._outgoingBehaviors.get(windowID, ()):
+                destID = self._windowIDs[vb.getDestComponent().getId()]
+                if destID not in reached:
+                    reached[destID] = None
+                    work.append(destID)
+        return [self._components[windowID] for windowID in reached]
+
+    def getStartWindows(self) -> list:
+        """
+        Gets the top-level windows that are assumed to be open when the target application starts: the first window
+        that was observed, and every window that no visibility behavior shows.
+
+        The first window is included even if visibility behaviors show it (e.g. a dialog's "close" button going back to
+        the main window), so that cycles through it don't leave the model without a start.
+
+        :return: The start windows, in the order they were created.
+        :rtype: list[Component]
+        """
+
+        windows = self.getTopLevelWindows()
+        return [window for i, window in enumerate(windows) if i == 0 or not self._incomingBehaviors.get(window.getId())]
+
+    def _indexBehavior(self, vb: 'VisibilityBehavior') -> None:
+        """
+        Adds a visibility behavior to the ordered index and the window adjacency.
+
+        :param vb: The visibility behavior to index.
+        :type vb: VisibilityBehavior
+        :return: None
+        :rtype: NoneType
+        """
+
+        id = vb.getId()
+        if not self._behaviorOrder or id > self._behaviorOrder[-1]:
+            self._behaviorPositions[id] = len(self._behaviorOrder)
+            self._behaviorOrder.append(id)
+        else:
+            position = bisect_left(self._behaviorOrder, id)
+            self._behaviorOrder.insert(position, id)
+            self._reindexBehaviors(position)
+
+        self._addBehaviorEdges(vb)
+
+    def _unindexBehavior(self, vb: 'VisibilityBehavior') -> None:
+        """
+        Removes a visibility behavior from the ordered index and the window adjacency.
+
+        :param vb: The visibility behavior to remove from the indexes.
+        :type vb: VisibilityBehavior
+        :return: None
+        :rtype: NoneType
+        """
+
+        position = self._behaviorPositions.pop(vb.getId())
+        del self._behaviorOrder[position]
+        self._reindexBehaviors(position)
+
+        self._removeBehaviorEdges(vb)
+
+    def _addBehaviorEdges(self, vb: 'VisibilityBehavior') -> None:
+        """
+        Adds a visibility behavior to the window adjacency.
+
+        :param vb: The visibility behavior to add.
+        :type vb: VisibilityBehavior
+        :return: None
+        :rtype: NoneType
+        """
+
+        srcWindowID = self._windowIDs[vb.getSrcComponent().getId()]
+        destWindowID = self._windowIDs[vb.getDestComponent().getId()]
+        self._outgoingBehaviors.setdefault(srcWindowID, {})[vb] = None
+        self._incomingBehaviors.setdefault(destWindowID, {})[vb] = None
+
+    def _removeBehaviorEdges(self, vb: 'VisibilityBehavior') -> None:
+        """
+        Removes a visibility behavior from the window adjacency.
+
+        :param vb: The visibility behavior to remove.
+        :type vb: VisibilityBehavior
+        :return: None
+        :rtype: NoneType
+        """
+
+        del self._outgoingBehaviors[self._windowIDs[vb.getSrcComponent().getId()]][vb]
+        del self._incomingBehaviors[self._windowIDs[vb.getDestComponent().getId()]][vb]
+
+    def _reindexBehaviors(self, start: int) -> None:
+        """
+        Updates the positions of the visibility behaviors from a position in the ordered index onwards.
+
+        :param start: The first position to update.
+        :type start: int
+        :return: None
+        :rtype: NoneType
+        """
+
+        for position in range(start, len(self._behaviorOrder)):
+            self._behaviorPositions[self._behaviorOrder[position]] = position
 
     def getVisibilityBehavior(self, iD: int) -> 'VisibilityBehavior':
         """
@@ -229,6 +647,7 @@ class TargetGuiModel(QObject):
         """
         if newVisBehavior.getId() not in self._visibilityBehaviors:
             self._visibilityBehaviors[newVisBehavior.getId()] = newVisBehavior
+            self._indexBehavior(newVisBehavior)
 
         src = newVisBehavior.getSrcComponent()
         dest = newVisBehavior.getDestComponent()
@@ -245,21 +664,26 @@ class TargetGuiModel(QObject):
         :return: None
         :rtype: NoneType
         """
-        if vb not in self._visibilityBehaviors.values():
+        if self._visibilityBehaviors.get(vb.getId()) is not vb:
             return
 
+        self._unindexBehavior(vb)
         vb.getSrcComponent().removeSrcVisibilityBehavior(vb)
         vb.getDestComponent().removeDestVisibilityBehavior(vb)
         del self._visibilityBehaviors[vb.getId()]
+        vb.markRemoved()
         self.behaviorRemoved.emit(vb)
 
-    def asDict(self) -> dict:
+    def asDict(self, lazy: bool = False) -> dict:
         """
         Get a dictionary representation of the visibility behavior.
 
         .. note::
             This is not just a getter of the __dict__ attribute.
 
+        :param lazy: If True, the components and behaviors are LazyObjects that create each entity's dictionary while
+                     being written by data.jsonstream, so the whole model is never in memory as dictionaries.
+        :type lazy: bool
         :return: The dictionary representation of the object.
         :rtype: dict
         """
@@ -267,9 +691,62 @@ class TargetGuiModel(QObject):
 
         tguimDict["root"] = self._root.asDict()
 
+        components = ((int(id), comp.asDict()) for id, comp in self._components.items())
+        behaviors = ((int(id), vb.asDict()) for id, vb in self._visibilityBehaviors.items())
+        if lazy:
+            from data.jsonstream import LazyObject  # Only used when saving a project in Facile
+            tguimDict["components"] = LazyObject(components)
+            tguimDict["behaviors"] = LazyObject(behaviors)
+        else:
+            tguimDict["components"] = dict(components)
+            tguimDict["behaviors"] = dict(behaviors)
+
+        tguimDict["Entity Count"] = Entity.count
+        tguimDict["SuperToken Count"] = SuperToken.id_counter
+
+        return tguimDict
+
+    def asRuntimeDict(self, requiredIDs: list) -> dict:
+        """
+        Get a pruned dictionary representation of the target GUI model for use by a generated API.
+
+        Only the required components, their ancestors, and the components connected by visibility behaviors are kept,
+        and no token pictures are stored. Of each kept SuperToken's tokens, only the most recent one of each set of
+        tokens that the runtime matcher can't tell apart is kept (see _getRuntimeTokens). The result has the same
+        layout as asDict(), so it can be loaded with fromDict().
+
+        :param requiredIDs: IDs of the components that the API interacts with.
+        :type requiredIDs: list[int]
+        :return: The pruned dictionary representation of the target GUI model.
+        :rtype: dict
+        """
+        keep = set()
+        work = [self._components[id] for id in requiredIDs if id in self._components]
+        for vb in self._visibilityBehaviors.values():
+            work.append(vb.getSrcComponent())
+            work.append(vb.getDestComponent())
+
+        while work:
+            comp = work.pop()
+            if comp is self._root or comp.getId() in keep:
+                continue
+            keep.add(comp.getId())
+            work.append(comp.getParent())
+
+        tguimDict = {}
+
+        tguimDict["root"] = self._root.asDict(includeImages=False)
+        tguimDict["root"]["children"] = [id for id in tguimDict["root"]["children"] if id in keep]
+
         tguimDict["components"] = {}
         for id, comp in self._components.items():
-            tguimDict["components"][int(id)] = comp.asDict()
+            if id in keep:
+                compDict = comp.asDict(includeImages=False)
+                compDict["children"] = [childID for childID in compDict["children"] if childID in keep]
+                superTokenDict = compDict["superToken"]
+                if superTokenDict is not None:
+                    superTokenDict["tokens"] = TargetGuiModel._getRuntimeTokens(superTokenDict["tokens"])
+                tguimDict["components"][int(id)] = compDict
 
         tguimDict["behaviors"] = {}
         for id, vb in self._visibilityBehaviors.items():
@@ -280,6 +757,29 @@ class TargetGuiModel(QObject):
 
         return tguimDict
 
+    @staticmethod
+    def _getRuntimeTokens(tokenDicts: list) -> list:
+        """
+        Removes the tokens that a generated API doesn't need to match components.
+
+        Tokens that only differ in RUNTIME_IGNORED_TOKEN_FIELDS give the same result for every token that the runtime
+        matcher compares them to, so only the most recent one of them is kept. A SuperToken that was matched many times
+        while exploring usually keeps one token per state that its component was seen in.
+
+        :param tokenDicts: The dictionaries of a SuperToken's tokens, oldest first.
+        :type tokenDicts: list[dict]
+        :return: The dictionaries of the tokens to keep, oldest first.
+        :rtype: list[dict]
+        """
+        newest = {}
+        for tokenDict in tokenDicts:
+            fields = {key: value for key, value in tokenDict.items()
+                      if key not in TargetGuiModel.RUNTIME_IGNORED_TOKEN_FIELDS}
+            signature = json.dumps(fields, sort_keys=True, default=str)
+            newest.pop(signature, None)  # Re-inserted so that the order follows the newest tokens
+            newest[signature] = tokenDict
+        return list(newest.values())
+
     @staticmethod
     def fromDict(d: dict) -> 'TargetGuiModel':
         """
@@ -287,8 +787,9 @@ class TargetGuiModel(QObject):
 
         This method reconstructs the entire target GUI model in 2 "passes". First, all of the
         components and visibility behaviors are created, but they only store IDs of other
-        components and visibility behaviors. Once all of the objects have been created,
-        the references are finalized. Children of components are not stored until the 2nd pass
+        components and visibility behaviors. Once all of the objects have been created, every
+        reference is resolved through the model's ID lookup tables, and each component's children
+        are sorted by timestamp once. Loading takes O(n log n) time, however wide the tree is.
 
         :param d: The dictionary that represents the target GUI model.
         :type d: dict
@@ -297,58 +798,52 @@ class TargetGuiModel(QObject):
         """
         tguim = TargetGuiModel()
         tguim._root = Component.fromDict(d["root"], tguim)
-
-        # create all components
-        for id, comp in sorted(d['components'].items(), key=lambda item: item[1]['timestamp']):
-            newComp = Component.fromDict(comp, tguim)
-            tguim._components[int(id)] = newComp
+        components = tguim._components
+        behaviors = tguim._visibilityBehaviors
+
+        # create all components, keeping the IDs of each one's children for the 2nd pass
+        childIDs = [(tguim._root, d["root"]["children"])]
+        for id, compDict in sorted(d['components'].items(), key=lambda item: item[1]['timestamp']):
+            newComp = Component.fromDict(compDict, tguim)
+            components[int(id)] = newComp
             tguim._superTokenToComponentMapping[newComp.getSuperToken()] = newComp
+            childIDs.append((newComp, compDict["children"]))
 
         # create all visibility behaviors
         for id, vb in d['behaviors'].items():
             newVB = VisibilityBehavior.fromDict(vb, tguim)
-            tguim._visibilityBehaviors[int(id)] = newVB
-
-        # connect root's children
-        for i in range(len(tguim._root._children)):
-            tguim._root._children[i] = tguim._components[tguim._root._children[i]]
+            behaviors[int(id)] = newVB
 
         # connect all components and visibility behaviors
-        for component in tguim._components.values():
-            if component._parent in tguim._components:
-                component._parent = tguim._components[component._parent]
-            else:
-                component._parent = tguim._root
-
-            for i in range(len(component._children)):
-                component._children[i] = tguim._components[component._children[i]]
-
-            for i in range(len(component._srcVisibilityBehaviors)):
-                component._srcVisibilityBehaviors[i] = tguim._visibilityBehaviors[
-                    component._srcVisibilityBehaviors[i]]
-
-            for i in range(len(component._destVisibilityBehaviors)):
-                component._destVisibilityBehaviors[i] = tguim._visibilityBehaviors[
-                    component._destVisibilityBehaviors[i]]
-
-        for vb in tguim._visibilityBehaviors.values():
-            vb._srcComponent = tguim._components[vb._srcComponent]
-            vb._destComponent = tguim._components[vb._destComponent]
-
-        # Link up all children.
-        work = [(tguim._root, None)]
-        while work:
-            cur, parent = work.pop()
-
-            if parent:
-                parent._children.append(cur)  # tried insert(0, cur) here but it loads backwards every time
-                parent._children = sorted(parent._children, key=lambda com: com.timestamp)
-                child_ids = d["components"][str(cur._id)]["children"]
-            else:
-                child_ids = d["root"]["children"]
-
-            for child in [tguim._components[int(id)] for id in child_ids]:
-                work.append((child, cur))
+        timestamp = lambda com: com.timestamp
+        for component, ids in childIDs:
+            # Ties in timestamps are broken the same way as when children were linked one at a time.
+            component._children = sorted([components[int(id)] for id in reversed(ids)], key=timestamp)
+            component._indexChildren()
+
+            if component is tguim._root:
+                continue
+
+            component._parent = components.get(component._parent, tguim._root)
+            component._srcVisibilityBehaviors = dict.fromkeys(behaviors[id] for id in component._srcVisibilityBehaviors)
+            component._destVisibilityBehaviors = dict.fromkeys(behaviors[id]
+                                                               for id in component._destVisibilityBehaviors)
+
+        for vb in behaviors.values():
+            vb._srcComponent = components[vb._srcComponent]
+            vb._destComponent = components[vb._destComponent]
+
+        # index the components, parents before their children, and the visibility behaviors, then compute the subtree
+        # aggregates (number of descendants, etc.), children before their parents
+        order = [tguim._root]
+        for component in order:
+            order.extend(component._children)
+        for component in order[1:]:
+            tguim._indexComponent(component)
+        for id in sorted(behaviors):
+            tguim._indexBehavior(behaviors[id])
+        for component in reversed(order):
+            component._computeAggregates()
 
         Entity.count = d["Entity Count"]
         SuperToken.id_counter = d["SuperToken Count"]
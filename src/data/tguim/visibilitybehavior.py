@@ -149,6 +149,7 @@ class VisibilityBehavior(Entity):
         :rtype: NoneType
         """
         self._destComponent = destComp
+        self.markDirty()
 
     def setSrcComponent(self, srcComp: 'Component') -> None:
         """
@@ -161,6 +162,7 @@ class VisibilityBehavior(Entity):
         """
 
         self._srcComponent = srcComp
+        self.markDirty()
 
     def setReactionType(self, reactType: ReactionType) -> None:
         """
@@ -184,6 +186,7 @@ class VisibilityBehavior(Entity):
         self._triggerAction = action
         self.getProperties().getProperty("Trigger Action")[1].setValue(action.getName())
         self.methodName = action.getMethodName()
+        self.markDirty()
 
     def getTriggerAction(self) -> 'ComponentAction':
         """
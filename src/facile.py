@@ -26,6 +26,7 @@ user and never imported.
 import sys
 import os
 import warnings
+import multiprocessing
 import libs.env as env
 env.updateContext("Facile")
 
@@ -45,6 +46,8 @@ from libs.logging import archive_logs, root_logger as logger
 
 
 if __name__ == "__main__":
+    # Lets the worker processes that load large projects start from a frozen build
+    multiprocessing.freeze_support()
     archive_logs()
     logger.info("Initializing Application")
     env.dumpVars(logger)
@@ -75,10 +75,16 @@ class TGUIMScene(QGraphicsScene):
 			if parentGraphics is None:
 				self.addItem(graphics)
 
+		def onNewComponents(newComponents):
+			# Parents come before their children, so each parent's graphics already exist.
+			for newComponent in newComponents:
+				onNewComponent(newComponent)
+
 		def onNewBehavior(newBehavior):
 			self.createVisibilityBehaviorGraphics(newBehavior)
 
 		self._targetGuiModel.newComponent.connect(onNewComponent)
+		self._targetGuiModel.newComponents.connect(onNewComponents)
 		self._targetGuiModel.newBehavior.connect(onNewBehavior)
 
 	def createComponentGraphics(self, dataItem: 'Component', parent: 'ComponentGraphics') -> 'ComponentGraphics':
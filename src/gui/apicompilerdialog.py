@@ -194,8 +194,10 @@ class ApiCompilerDialog(QDialog):
 			errors.append('Please choose a valid Python interpreter (path/to/python.exe file).')
 
 		installApi = self.ui.checkBoxInstallAPI.isChecked()
+		asyncApi = self.ui.checkBoxAsyncAPI.isChecked()
 		
-		theCompilationProfile = CompilationProfile(setDocType, setcompResOpts, apiFolderDir, interpExeDir, installApi)
+		theCompilationProfile = CompilationProfile(setDocType, setcompResOpts, apiFolderDir, interpExeDir, installApi,
+		                                           asyncApi)
 		
 		# if there are any errors, show them, then return.
 		if len(errors) != 0:
@@ -219,6 +221,13 @@ class ApiCompilerDialog(QDialog):
 		"""
 		self.setApiCompiler.emit(compProfile)
 		projectName = sm.StateMachine.instance._project.getAPIName()
+		
+		# The project is saved on the main thread by the project saver, and the save has to be written before the
+		# compiler thread starts reading the models.
+		projectSaver = sm.StateMachine.instance.view.getProjectSaver()
+		if projectSaver is not None:
+			projectSaver.save()
+			projectSaver.wait()
 
 		# create and show progressbar dialog
 		self.progress = QProgressDialog("Compiling API...", "Cancel API Generation", 0, 0, parent=self.parent())
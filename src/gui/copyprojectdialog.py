@@ -22,13 +22,13 @@ This module contains the code for the copy project dialog.
 """
 
 import os
-from copy import deepcopy
 from os.path import expanduser
 
 from PySide2.QtCore import Signal, Slot
 from PySide2.QtWidgets import QDialog, QFileDialog, QWidget
 
 from data.project import Project
+from libs.logging import main_logger as logger
 # uses this autogenerated python file to create dialog structure.
 from gui.ui.ui_copyprojectdialog import Ui_Dialog as Ui_CopyProjectDialog
 
@@ -43,17 +43,18 @@ class CopyProjectDialog(QDialog):
 	"""
 	
 	# When a new project is successfully created, this signal will be emitted.
-	# It carries the new project.
-	projectCreated = Signal(Project)
+	# It carries the new project's .fcl file. The project is only loaded by whoever opens it.
+	projectCreated = Signal(str)
 	
-	def __init__(self, parent: QWidget = None, oldProject: Project = None):
+	def __init__(self, parent: QWidget = None, oldProjectFile: str = None):
 		"""
 		Constructs a CopyProjectDialog object.
 		
 		:param parent: the widget to nest this dialog inside of. If None, this dialog will be a window.
 		:type parent: PySide2.QtWidgets.QWidget
-		:param oldProject: The project to copy. If None, the user can select the location of an existing project.
-		:type oldProject: Project
+		:param oldProjectFile: The .fcl file of the project to copy. If None, the user can select the location of an
+							   existing project.
+		:type oldProjectFile: str
 		"""
 		
 		super(CopyProjectDialog, self).__init__(parent)
@@ -61,12 +62,8 @@ class CopyProjectDialog(QDialog):
 		self.ui.setupUi(self)
 		self.setWindowTitle("Copy Existing Project")
 		
-		# set the old project to copy from
-		self._newProject = None
-		if oldProject:
-			self._setProject(oldProject)
-		else:
-			self._oldProject = None
+		# Only the old project's information is read; nothing is loaded until the new project is opened.
+		self._oldProjectFile = None
 		
 		# allow user to select folder to save project in
 		self.ui.oldBrowseBtn.clicked.connect(self._browseForExistingProject)
@@ -86,33 +83,47 @@ class CopyProjectDialog(QDialog):
 		self.ui.newAppEdit.setEnabled(False)
 		self.ui.newDescriptionEdit.setEnabled(False)
 		self.ui.newBrowseBtn.setEnabled(False)
+		
+		if oldProjectFile:
+			self._setOldProject(oldProjectFile)
 	
-	@Slot(Project)
-	def _setOldProject(self, oldProject: Project) -> None:
+	@Slot(str)
+	def _setOldProject(self, oldProjectFile: str) -> None:
 		"""
 		Sets the existing project that will be copied and fills/enables the appropriate fields in the dialog.
+		Only the project's information is read from its files.
 		
-		:param oldProject: The project to copy from
-		:type oldProject: Project
+		:param oldProjectFile: The .fcl file of the project to copy from
+		:type oldProjectFile: str
 		:return: None
 		:rtype: NoneType
 		"""
-		self._oldProject = oldProject
-		self._newProject = deepcopy(self._oldProject)
+		try:
+			sections = Project.readInfoSections(oldProjectFile)
+		except Exception as e:
+			logger.exception(e)
+			self.ui.oldErrorLabel.setText("Errors:\n\tThe selected project could not be read\n")
+			return
 		
-		self.ui.oldPathEdit.setText(self._oldProject.getProjectDir())
-		self.ui.oldNameEdit.setText(self._oldProject.getName())
-		self.ui.oldAppEdit.setText(self._oldProject.getExecutableFile())
-		self.ui.oldDescriptionEdit.setText(self._oldProject.getDescription())
+		self._oldProjectFile = oldProjectFile
+		name = sections["Project Information"]["Name"]
+		description = sections["Project Information"]["Description"]
+		exe = sections["Application Information"]["Target Application"]
+		
+		self.ui.oldErrorLabel.setText("")
+		self.ui.oldPathEdit.setText(os.path.dirname(oldProjectFile))
+		self.ui.oldNameEdit.setText(name)
+		self.ui.oldAppEdit.setText(exe)
+		self.ui.oldDescriptionEdit.setText(description)
 		
 		self.ui.newBrowseBtn.setEnabled(True)
 		self.ui.newNameEdit.setEnabled(True)
 		self.ui.newDescriptionEdit.setEnabled(True)
 		
 		self.ui.newPathEdit.setText("")
-		self.ui.newNameEdit.setText(self._newProject.getName())
-		self.ui.newAppEdit.setText(self._newProject.getExecutableFile())
-		self.ui.newDescriptionEdit.setText(self._newProject.getDescription())
+		self.ui.newNameEdit.setText(name)
+		self.ui.newAppEdit.setText(exe)
+		self.ui.newDescriptionEdit.setText(description)
 	
 	@Slot(str)
 	def _setNewProjectURL(self, url: str) -> None:
@@ -124,7 +135,6 @@ class CopyProjectDialog(QDialog):
 		:return: None
 		:rtype: NoneType
 		"""
-		self._newProject.setProjectDir(url)
 		self.ui.newPathEdit.setText(url)
 	
 	@Slot()
@@ -140,7 +150,7 @@ class CopyProjectDialog(QDialog):
 		fileDialog.setFileMode(QFileDialog.ExistingFile)
 		fileDialog.setDirectory(expanduser("~"))
 		fileDialog.setNameFilter("Facile Project File (*.fcl)")
-		fileDialog.fileSelected.connect(lambda url: self._setOldProject(Project.load(url)))
+		fileDialog.fileSelected.connect(self._setOldProject)
 		fileDialog.exec_()
 	
 	@Slot()
@@ -170,7 +180,7 @@ class CopyProjectDialog(QDialog):
 		It will validate all of the user's input and show error messages if
 		any information is invalid.
 		
-		:emits: projectCreated if a project was successfully created
+		:emits: projectCreated if a project was successfully copied
 		:return: None
 		:rtype: NoneType
 		"""
@@ -193,7 +203,7 @@ class CopyProjectDialog(QDialog):
 		newErrors = []
 		
 		# check existing project for errors (as much as we can)
-		if not self._oldProject:
+		if not self._oldProjectFile:
 			oldErrors.append("must select an existing project")
 		
 		# check new project details for errors
@@ -217,6 +227,16 @@ class CopyProjectDialog(QDialog):
 				newErrors.append(
 					"The selected project directory already belongs to a different project. Please select another.")
 		
+		# copy the project's files. The new project isn't loaded here; it's loaded when it's opened.
+		newProjectFile = None
+		if len(newErrors) == 0 and len(oldErrors) == 0:
+			try:
+				newProjectFile = Project.copyFiles(self._oldProjectFile, os.path.abspath(newPath), newName,
+												   newDescription)
+			except OSError as e:
+				logger.exception(e)
+				newErrors.append("The project could not be copied: {}".format(e.strerror or e))
+		
 		# if there are any errors, show them, then return.
 		if len(newErrors) != 0:
 			errMsg = "Errors:\n"
@@ -229,11 +249,8 @@ class CopyProjectDialog(QDialog):
 				errMsg += "\t" + err + "\n"
 			self.ui.oldErrorLabel.setText(errMsg)
 		
-		# if there are no errors, create a new project, emit the projectCreated signal, and
+		# if there are no errors, emit the projectCreated signal, and
 		# call the super-class's accept method to perform the default behavior.
 		if len(newErrors) == 0 and len(oldErrors) == 0:
-			self._newProject.setName(newName)
-			self._newProject.setDescription(newDescription)
-			self._newProject.setProjectDir(newPath)
-			self.projectCreated.emit(self._newProject)
+			self.projectCreated.emit(newProjectFile)
 			return QDialog.accept(self)
@@ -30,6 +30,7 @@ from PySide2.QtWidgets import (QMainWindow, QFileDialog, QLabel, QWidget, QMessa
 							   QGraphicsOpacityEffect, QProgressDialog, QApplication)
 
 from data.project import Project
+from data.projectsaver import ProjectSaver
 from data.statemachine import StateMachine
 from data.tguim.component import Component
 from data.tguim.visibilitybehavior import VisibilityBehavior
@@ -85,6 +86,7 @@ class FacileView(QMainWindow):
 	NOTIF_LENGTH = 5000  # Time in ms to show a notification
 	NOTIF_AUTOHIDE = False  # Automatically hide notifications on mouse hover
 	NOTIF_BUTTON = ''  # Text for button to close the notification. Empty str is a good looking X
+	AUTOSAVE_INTERVAL = 300  # Seconds between autosaves of the open project. 0 disables autosave.
 	
 	def __init__(self) -> 'FacileView':
 		"""
@@ -104,6 +106,8 @@ class FacileView(QMainWindow):
 		self.themeList = FacileView.DEFAULT_THEMES
 		self._layout = FacileView.Layout.CLASSIC
 		self._scrollBarsEnabled = False
+		self._projectSaver = None
+		self._autosaveInterval = FacileView.AUTOSAVE_INTERVAL
 
 		# Initialize variables
 		self.screenSize = pyautogui.size()
@@ -207,6 +211,15 @@ class FacileView(QMainWindow):
 		"""
 		return self._layout
 	
+	def getProjectSaver(self) -> ProjectSaver:
+		"""
+		Gets the object that saves the current project in the background.
+
+		:return: The current project's saver, or None if no project is open.
+		:rtype: ProjectSaver
+		"""
+		return self._projectSaver
+	
 	@Slot(Project)
 	def setProject(self, project: Project) -> None:
 		"""
@@ -218,9 +231,19 @@ class FacileView(QMainWindow):
 		:rtype: NoneType
 		"""
 		
+		if self._projectSaver is not None:
+			self._projectSaver.stop()
+			self._projectSaver = None
+		
 		self._project = project
 		
 		if project is not None:
+			self._projectSaver = ProjectSaver(project, self._autosaveInterval)
+			self._projectSaver.saveStarted.connect(lambda full: self.ui.statusBar.showMessage("Saving project..."))
+			self._projectSaver.saveProgress.connect(self.onSaveProgress)
+			self._projectSaver.saveFinished.connect(lambda: self.ui.statusBar.showMessage("Project saved.",
+																						 FacileView.NOTIF_LENGTH))
+			self._projectSaver.saveFailed.connect(self.onSaveFailed)
 			self._stateMachine.projectOpened(project)
 
 			self.notify.emit("Opened Project: " + project.getName(), 'primary', FacileView.NOTIF_LENGTH,
@@ -275,8 +298,54 @@ class FacileView(QMainWindow):
 		:rtype: NoneType
 		"""
 		
-		if self._project is not None:
-			self._project.save()
+		if self._projectSaver is not None:
+			self._projectSaver.save()
+	
+	@Slot(int, int)
+	def onSaveProgress(self, done: int, total: int) -> None:
+		"""
+		This slot is run while a project is being saved in the background.
+		
+		:param done: The number of components that have been written.
+		:type done: int
+		:param total: The number of components in the project.
+		:type total: int
+		:return: None
+		:rtype: NoneType
+		"""
+		
+		if total:
+			self.ui.statusBar.showMessage("Saving project... {}%".format(done * 100 // total))
+	
+	@Slot(str)
+	def onSaveFailed(self, message: str) -> None:
+		"""
+		This slot is run when saving the project in the background failed. The changes are kept, so the next save
+		tries to write them again.
+		
+		:param message: The error message.
+		:type message: str
+		:return: None
+		:rtype: NoneType
+		"""
+		
+		self.ui.statusBar.clearMessage()
+		self.notify.emit("The project could not be saved: " + message, 'danger', FacileView.NOTIF_LENGTH,
+						 FacileView.NOTIF_AUTOHIDE, FacileView.NOTIF_BUTTON)
+	
+	def setAutosaveInterval(self, seconds: int) -> None:
+		"""
+		Sets how often the open project is saved automatically.
+		
+		:param seconds: The number of seconds between autosaves, or 0 to disable autosave.
+		:type seconds: int
+		:return: None
+		:rtype: NoneType
+		"""
+		
+		self._autosaveInterval = seconds
+		if self._projectSaver is not None:
+			self._projectSaver.setAutosaveInterval(seconds)
 	
 	@Slot()
 	def onNewProjectFromScratchTriggered(self) -> None:
@@ -305,7 +374,7 @@ class FacileView(QMainWindow):
 		"""
 		
 		copyProjectDialog = CopyProjectDialog()
-		copyProjectDialog.projectCreated.connect(self.setProject)
+		copyProjectDialog.projectCreated.connect(self.loadProject)
 		copyProjectDialog.exec_()
 	
 	@Slot()
@@ -657,6 +726,8 @@ class FacileView(QMainWindow):
 				self.onSaveProjectTriggered()
 				
 			if result != QMessageBox.Cancel:
+				self._projectSaver.stop()  # Let the save (or an autosave) finish writing before exiting
+				
 				if self._project.autoCloseAppOnExit:
 					self.onStopAppTriggered(confirm=False)
 
@@ -736,7 +807,8 @@ class FacileView(QMainWindow):
 		settings = {'theme':       self._theme.getName(),
 					'theme list':  [theme.asDict() for theme in self.themeList if theme.isCustom()],
 					'layout':      self._layout.value,
-					'scrollbars':  self._scrollBarsEnabled}
+					'scrollbars':  self._scrollBarsEnabled,
+					'autosave interval': self._autosaveInterval}
 
 		if not os.path.exists(tempDir):
 			os.mkdir(tempDir)
@@ -755,6 +827,7 @@ class FacileView(QMainWindow):
 
 			self.setLayout(FacileView.Layout(settings['layout']))
 			self.enableScrollBars(settings['scrollbars'])
+			self.setAutosaveInterval(settings.get('autosave interval', FacileView.AUTOSAVE_INTERVAL))
 
 			# Load custom themes
 			self.themeList = FacileView.DEFAULT_THEMES
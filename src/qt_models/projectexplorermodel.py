@@ -352,13 +352,10 @@ class ProjectExplorerModel(QAbstractItemModel):
 				return self.registerAndCreateIndex(data.getParentIndex(), 0, parentData)
 			
 			elif isinstance(innerData, Component):
-				visBehaviors = list(
-					self._project.getTargetGUIModel().getVisibilityBehaviors().values())
-				try:
-					visBehaviorIdx = visBehaviors.index(parentData)
-					return self.registerAndCreateIndex(visBehaviorIdx, 0, parentData)
-				except:
+				visBehaviorIdx = self._project.getTargetGUIModel().getVisibilityBehaviorPosition(parentData)
+				if visBehaviorIdx is None:
 					return QModelIndex()
+				return self.registerAndCreateIndex(visBehaviorIdx, 0, parentData)
 			
 			else:
 				raise ProjectExplorerModel.UnsupportedTypeException(
@@ -676,8 +673,7 @@ class ProjectExplorerModel(QAbstractItemModel):
 		self._view.collapse(cur)
 		self._view.expand(cur)
 		
-		visBehaviors = list(self._project.getTargetGUIModel().getVisibilityBehaviors().values())
-		visBehaviorIdx = visBehaviors.index(visibilityBehavior)
+		visBehaviorIdx = self._project.getTargetGUIModel().getVisibilityBehaviorPosition(visibilityBehavior)
 		cur = self.index(visBehaviorIdx, 0, cur)
 		self._view.expand(cur)
 		
@@ -27,6 +27,22 @@ from datetime import datetime
 import psutil
 import pywinauto
 
+if 'CONTEXT' not in locals():
+    try:  # Facile
+        from libs.env import CONTEXT
+        from libs.env import InvalidContextException
+    except ImportError:  # Sphinx
+        from .libs.env import CONTEXT
+        from .libs.env import InvalidContextException
+
+if CONTEXT in ("Facile", "Sphinx"):
+    from tguiil.waiting import WaitCondition, WindowCondition, Backoff, waitUntil
+elif CONTEXT in ("API"):
+    # from .waiting import WaitCondition, WindowCondition, Backoff, waitUntil
+    pass
+else:
+    raise InvalidContextException(CONTEXT)
+
 
 class WaitException(Exception):
     def __init__(self, msg: str):
@@ -145,33 +161,33 @@ class Application(pywinauto.Desktop):
             except pywinauto.controls.hwndwrapper.InvalidWindowHandle:
                 continue
 
-    def wait(self, state: str, timeout: float = 120):
+    def wait(self, state, timeout: float = 120, backoff: 'Backoff' = None):
         """
-        Pauses until state is reached for all visible windows, timing out in timeout seconds. Useful when waiting
-        for target app to complete execution of a task, or when starting up.
-        Wraps around pywinauto's wait function.
+        Pauses until state is reached by any of the application's windows (in any of its processes), or until a
+        WaitCondition holds, timing out in timeout seconds. Returns as soon as the state is reached. Useful when
+        waiting for target app to complete execution of a task, or when starting up.
+
+        The windows are polled with exponential backoff and jitter, and every process shares the whole timeout.
 
-        :param state: state to wait for ('visible', 'ready', 'exists', 'enabled', 'active')
-        :type state: str
-        :param timeout: Maximum number of seconds to wait for state to be reached. Defaults to a minute, should be longer for apps with more windows.
+        :param state: state to wait for ('visible', 'ready', 'exists', 'enabled', 'active'), or a WaitCondition
+        :type state: str or WaitCondition
+        :param timeout: Maximum number of seconds to wait for state to be reached.
         :type timeout: float
+        :param backoff: The poll intervals to use. Defaults to Backoff().
+        :type backoff: Backoff
+        :raises: WaitException if state is not a valid state, or if it isn't reached before timing out.
         """
 
-        # ---- NOTE: Letting pywinauto handle the errors if state isn't a valid state ----
-
-        pids = self.getPIDs()
-        procSecs = timeout / len(pids)
-        success = False
-
-        for pid in pids:
+        if isinstance(state, WaitCondition):
+            condition = state
+        else:
             try:
-                pywinauto.Application().connect(process=pid).top_window().wait(state, timeout=procSecs)
-                success = True  # NOTE: Counts as success if one of them works.
-            except:
-                continue
+                condition = WindowCondition(state)
+            except ValueError as e:
+                raise WaitException(str(e))
 
-        if not success:
-            raise WaitException('Could not connect to process. Please try again')
+        if not waitUntil(condition, self.windows, timeout, backoff):
+            raise WaitException('Timed out after {} seconds waiting for the application.'.format(timeout))
 
     def getStartTime(self) -> int:
         """
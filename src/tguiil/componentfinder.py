@@ -62,7 +62,8 @@ class ComponentFinder:
 
     PYWINAUTO_TIMEOUT = 5  # seconds
 
-    def __init__(self, app: Application, options: Set[MatchOption], defaultOption=MatchOption.CloseToken):
+    def __init__(self, app: Application, options: Set[MatchOption], defaultOption=MatchOption.CloseToken,
+                 captureImages: bool = True):
         """
         Initialize a component finder object.
 
@@ -72,8 +73,12 @@ class ComponentFinder:
         :type options: Set[MatchOption]
         :param defaultOption: If the options are empty, the default option will be used.
         :type defaultOption: MatchOption
+        :param captureImages: Whether to capture images of components while searching. This should be False when the
+                              super tokens being searched for don't have images either.
+        :type captureImages: bool
         """
         self._app = app
+        self._captureImages = captureImages
         self._matchOptions = []
         for option in options:
             self._matchOptions.append(option.value)
@@ -132,7 +137,7 @@ class ComponentFinder:
                         curComponent = work.pop()
 
                         try:
-                            token = Token.createToken(timestamp, curComponent)
+                            token = Token.createToken(timestamp, curComponent, self._captureImages)
                         except Token.CreationException as e:
                             print(str(e))
                         else:
@@ -165,7 +170,7 @@ class ComponentFinder:
                     curComponent = work.pop()
 
                     try:
-                        token = Token.createToken(timestamp, curComponent)
+                        token = Token.createToken(timestamp, curComponent, self._captureImages)
                     except Token.CreationException as e:
                         print(str(e))
                     else:
@@ -99,7 +99,8 @@ class Observer(QThread):
 		dictionaries.
 
 		This method is vital because when a new observer is created, it needs to know about
-		existing super tokens to avoid duplication.
+		existing super tokens to avoid duplication. Any super tokens loaded before are forgotten,
+		so it is also used to reload the observer after components were merged or removed.
 
 		.. note::
 			This method should be run in Facile's main thread BEFORE the observer is played.
@@ -110,6 +111,8 @@ class Observer(QThread):
 		:rtype: NoneType
 		"""
 		componentWork = tguim.getRoot().getChildren()[:]
+		self._childMapping = {}
+		self._lastSuperTokenIterations = {}
 		
 		# add all of the top level components to be children of None
 		self._childMapping[None] = []
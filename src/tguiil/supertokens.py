@@ -47,6 +47,7 @@ class SuperToken:
     does not care about specific components.
     """
     id_counter = 1
+    changeTracker = None  # If not None, the ChangeTracker that is told when a token is added to a SuperToken.
 
     def __init__(self, token, parent: 'SuperToken'):
         """
@@ -60,6 +61,7 @@ class SuperToken:
         :rtype: NoneType
         """
         self._tokenListLock = Lock()
+        self._owner = None
         self.tokens = [token]
         self.id = SuperToken.id_counter
         SuperToken.id_counter += 1
@@ -95,6 +97,32 @@ class SuperToken:
         finally:
             self._tokenListLock.release()
 
+        if SuperToken.changeTracker is not None:
+            SuperToken.changeTracker.superTokenChanged(self)
+        if self._owner is not None and tokenA.hasPicture():
+            self._owner.pictureAdded()
+
+    def setOwner(self, owner: 'Component') -> None:
+        """
+        Sets the component that the super token belongs to. The component is told when a token with a picture is
+        added, so that it can keep track of which subtrees have pictures.
+
+        :param owner: The component that the super token belongs to.
+        :type owner: Component
+        :return: None
+        :rtype: NoneType
+        """
+        self._owner = owner
+
+    def hasPicture(self) -> bool:
+        """
+        Determines whether any of the super token's tokens has a picture, without decoding the pictures.
+
+        :return: True if a token has a picture.
+        :rtype: bool
+        """
+        return any(token.hasPicture() for token in self.getTokens())
+
     def getTokens(self) -> list:
         """
         Gets a copy of the token list. It's important that this is a copy because 2 threads may access token
@@ -150,25 +178,40 @@ class SuperToken:
 
         return Token.Match.CLOSE, bestCloseScore
 
+    def __getstate__(self) -> dict:
+        # Locks can't be pickled, so a SuperToken that is sent between processes gets a new one.
+        # The owner is a Qt object, so it stays behind too.
+        state = self.__dict__.copy()
+        del state['_tokenListLock']
+        state.pop('_owner', None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._tokenListLock = Lock()
+        self._owner = None
+
     def __str__(self):
         return "SuperToken:\n\t" + "\n\t".join([str(token) for token in self.tokens])
 
     def __repr__(self):
         return self.__str__()
 
-    def asDict(self) -> dict:
+    def asDict(self, includeImages: bool = True) -> dict:
         """
         Get a dictionary representation of the visibility behavior.
 
         .. note::
             This is not just a getter of the __dict__ attribute.
 
+        :param includeImages: If False, the tokens' pictures are not stored.
+        :type includeImages: bool
         :return: The dictionary representation of the object.
         :rtype: dict
         """
         d = {}
         d["id"] = self.id
-        d["tokens"] = [t.asDict() for t in self.tokens]
+        d["tokens"] = [t.asDict(includeImages) for t in self.tokens]
         d["ignoreFlag"] = self.ignoreFlag
         d['relativePos'] = list(self.posRelativeToParent)
         return d
@@ -189,6 +232,7 @@ class SuperToken:
 
         st = SuperToken.__new__(SuperToken)
         st._tokenListLock = Lock()
+        st._owner = None
         st.tokens = [Token.fromDict(t) for t in d['tokens']]
         st.ignoreFlag = d['ignoreFlag']
         st.id = d['id']
@@ -25,22 +25,42 @@ from enum import Enum, unique
 from datetime import datetime
 from functools import cmp_to_key
 
-import numpy as np
-from PIL import Image
-from pywinauto.win32structures import RECT
-import pywinauto
-import pyautogui
-from skimage.metrics import structural_similarity as ssim
-
+import re
 import string
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.feature_extraction.text import CountVectorizer
-from nltk.corpus import stopwords
 
-stopwords = stopwords.words('english')
+# numpy, PIL, pyautogui, skimage, sklearn, and nltk are slow to import and are only needed for some comparisons, so
+# they are imported the first time they're used. So is pywinauto, which imports PIL and is only needed to create tokens
+# and rebuild their rectangles. This keeps generated APIs fast to start.
+_stopwords = None
+_screenWidth = None
+
+
+def getStopwords() -> set:
+    """
+    Gets the english stopwords, loading them on first use.
+
+    :return: set of english stopwords
+    :rtype: set
+    """
+    global _stopwords
+    if _stopwords is None:
+        from nltk.corpus import stopwords
+        _stopwords = set(stopwords.words('english'))  # Can support more languages in future
+    return _stopwords
 
-# Can support more languages in future
-screenWidth = pyautogui.size()[0]
+
+def getScreenWidth() -> int:
+    """
+    Gets the width of the screen in pixels, querying it on first use.
+
+    :return: width of the screen
+    :rtype: int
+    """
+    global _screenWidth
+    if _screenWidth is None:
+        import pyautogui
+        _screenWidth = pyautogui.size()[0]
+    return _screenWidth
 
 
 class Token:
@@ -48,6 +68,7 @@ class Token:
     Token class sets parameters of a token for each state that changes.
     """
     control_ID_count = {}
+    imageStore = None  # While set (during project saving/loading), pictures are kept in this ImageStore.
     
     class CreationException(Exception):
         def __init__(self, msg):
@@ -96,10 +117,10 @@ class Token:
     BOTH_NOT_SIG = -3.0
     
     def __init__(self, appTimeStamp: int, identifier: int, isDialog: bool, isEnabled: bool,
-                 isVisible: bool, processID: int, typeOf: str, rectangle: RECT, texts: list,
+                 isVisible: bool, processID: int, typeOf: str, rectangle: 'RECT', texts: list,
                  title: str, numControls: int, controlIDs: list, parentTitle: str,
-                 parentType: str, parentRect: RECT, topLevelParentControlIDs: list, topLevelParentTitle: str, topLevelParentType: str,
-                 childrenTexts: list, picture: Image = None, autoID: int = None,
+                 parentType: str, parentRect: 'RECT', topLevelParentControlIDs: list, topLevelParentTitle: str, topLevelParentType: str,
+                 childrenTexts: list, picture: 'PIL.Image' = None, autoID: int = None,
                  expandState: int = None, shownState: int = None):
         """
         Checks if the tokens component state changed based on a random variable.
@@ -171,6 +192,7 @@ class Token:
         self.title = title
         self.numControls = numControls
         self.pic = picture
+        self.picHash = None  # Key of pic in the project's image store, set when the token is saved.
         self.type = typeOf
         self.controlIDs = controlIDs
         self.autoid = autoID
@@ -190,8 +212,34 @@ class Token:
         # self.childrenTexts.sort()  # ChildrenTexts is now a list of lists so this doesn't work
         self.controlIDs.sort()
     
+    @property
+    def pic(self) -> 'PIL.Image':
+        """
+        Gets the token's picture. Pictures of loaded projects are decoded from the image store on first access.
+
+        :return: the picture, or None if the token has none.
+        :rtype: PIL.Image
+        """
+        pic = self.__dict__.get('pic')
+        if getattr(pic, 'isLazyImage', False):
+            return pic.resolve()
+        return pic
+
+    @pic.setter
+    def pic(self, picture: 'PIL.Image'):
+        self.__dict__['pic'] = picture
+
+    def hasPicture(self) -> bool:
+        """
+        Determines whether the token has a picture, without decoding it.
+
+        :return: True if the token has a picture, False otherwise.
+        :rtype: bool
+        """
+        return self.__dict__.get('pic') is not None
+
     @staticmethod
-    def createToken(timeStamp: datetime, component: pywinauto.base_wrapper.BaseWrapper,
+    def createToken(timeStamp: datetime, component: 'pywinauto.base_wrapper.BaseWrapper',
                     captureImage: bool = True) -> 'Token':
         """
         Create a token from a pywinauto control.
@@ -205,6 +253,7 @@ class Token:
         :return: The token that was created from the pywinauto control.
         :rtype: Token
         """
+        import pywinauto
 
         def flatten(myList):
             tmp = []
@@ -249,7 +298,8 @@ class Token:
                 image = component.capture_as_image()
 
             # size of dialogs is a bit off, so we trim to adjust.
-            if isDialog:
+            if isDialog and image is not None:
+                screenWidth = getScreenWidth()
 
                 # Setting amounts to trim off dialog size
                 leftAdjust = (15/4096)*screenWidth
@@ -264,9 +314,8 @@ class Token:
                 # rectangle.bottom += bottomAdjust
 
                 # crop image
-                if image is not None:
-                    width, height = image.size
-                    image = image.crop((leftAdjust, topAdjust, width + rightAdjust, height + bottomAdjust))
+                width, height = image.size
+                image = image.crop((leftAdjust, topAdjust, width + rightAdjust, height + bottomAdjust))
             
             # get text of all children that are not editable.
             cTextList = []
@@ -380,7 +429,7 @@ class Token:
                 self.rectangle == token2.rectangle and \
                 self.numControls == token2.numControls and \
                 self.childrenTexts == token2.childrenTexts and \
-                ((self.pic is None) == (token2.pic is None)):
+                (self.hasPicture() == token2.hasPicture()):
             return Token.Match.EXACT, 1
         
         #####################################################################
@@ -531,14 +580,16 @@ class Token:
         total += Token.Weight["CONTROL_ID"] * controlSimilarity
         
         # compare pictures
-        if self.pic is not None and token2.pic is not None:
+        if self.hasPicture() and token2.hasPicture():
             if self.pic.size == token2.pic.size:
                 try:
+                    import numpy as np
+                    from skimage.metrics import structural_similarity as ssim
                     picSimilarity = (ssim(np.array(self.pic), np.array(token2.pic)) + 1) / 2
                     total += picSimilarity * Token.Weight["PIC"]
                 except:
                     total += 0
-        elif self.pic is not None or token2.pic is not None:
+        elif self.hasPicture() or token2.hasPicture():
             total += 0
         else:
             max -= Token.Weight["PIC"]
@@ -699,17 +750,23 @@ class Token:
     def __repr__(self):
         return self.__str__()
     
-    def asDict(self) -> dict:
+    def asDict(self, includeImage: bool = True) -> dict:
         """
         Get a dictionary representation of the visibility behavior.
 
         .. note::
             This is not just a getter of the __dict__ attribute.
 
+        If Token.imageStore is set, the picture is put in the image store and only its key ("picHash") is kept in the
+        dictionary. Otherwise, the picture is stored inline as a list of pixels.
+
+        :param includeImage: If False, the token's picture is not stored.
+        :type includeImage: bool
         :return: The dictionary representation of the object.
         :rtype: dict
         """
         d = self.__dict__.copy()
+        d['picHash'] = None
         d['rectangle'] = [self.rectangle.left, self.rectangle.top, self.rectangle.width(),
                           self.rectangle.height()]
 
@@ -717,8 +774,18 @@ class Token:
             d['parentRect'] = [self.parentRect.left, self.parentRect.top, self.parentRect.width(),
                                self.parentRect.height()]
 
-        if 'pic' in d and d['pic'] is not None:
-            d['pic'] = np.array(self.pic).tolist()
+        if not includeImage:
+            d['pic'] = None
+        elif 'pic' in d and d['pic'] is not None:
+            if Token.imageStore is not None:
+                # Only decode the picture if the store doesn't already have it
+                if self.picHash is None or self.picHash not in Token.imageStore:
+                    self.picHash = Token.imageStore.put(self.pic, self.picHash)
+                d['picHash'] = self.picHash
+                d['pic'] = None
+            else:
+                import numpy as np
+                d['pic'] = np.array(self.pic).tolist()
         
         return d
     
@@ -737,9 +804,19 @@ class Token:
             return None
         
         t = Token.__new__(Token)
+        d.setdefault('picHash', None)
         
-        if d['pic']:
+        if d['pic']:  # Pictures from before the image store are stored inline. Move them to the store.
+            import numpy as np
+            from PIL import Image
             d["pic"] = Image.fromarray(np.uint8(np.asarray(d["pic"])))
+            if Token.imageStore is not None:
+                d['picHash'] = Token.imageStore.put(d['pic'])
+                d['pic'] = Token.imageStore.getLazy(d['picHash'])
+        elif d['picHash'] and Token.imageStore is not None:
+            d['pic'] = Token.imageStore.getLazy(d['picHash'])  # Decoded when first accessed
+        
+        from pywinauto.win32structures import RECT
         
         if d['rectangle']:
             r = RECT()
@@ -776,10 +853,25 @@ def cleanString(myStr: str, sws: bool = True):
     myStr = ''.join([word for word in myStr if word not in string.punctuation])
     myStr = myStr.lower()
     if sws:
-        myStr = ' '.join([word for word in myStr.split() if word not in stopwords])
+        myStr = ' '.join([word for word in myStr.split() if word not in getStopwords()])
     return myStr
 
 
+def getTitleWords(title: str) -> set:
+    """
+    Gets the words of a title that stringSimilarity compares, including stopwords. Two titles can only be similar
+    if they share one of these words.
+
+    :param title: The title of a component
+    :type title: str
+    :return: The words of the title, in lowercase
+    :rtype: set
+    """
+    
+    title = ''.join(char for char in (title or '') if char not in string.punctuation).lower()
+    return set(re.findall(r"\b\w\w+\b", title))
+
+
 def stringSimilarity(str1: str, str2: str) -> float:
     """
     Returns the similarity of two strings using cosine similarity.
@@ -807,6 +899,9 @@ def stringSimilarity(str1: str, str2: str) -> float:
     elif not cleaned[1]:
         return Token.STR2_NOT_SIG
     
+    from sklearn.metrics.pairwise import cosine_similarity
+    from sklearn.feature_extraction.text import CountVectorizer
+
     vectors = CountVectorizer().fit_transform(cleaned).toarray()
     
     v1 = vectors[0].reshape(1, -1)
@@ -0,0 +1,296 @@
+"""
+..
+    /------------------------------------------------------------------------------\
+    |                 -- FACADE TECHNOLOGIES INC.  CONFIDENTIAL --                 |
+    |------------------------------------------------------------------------------|
+    |                                                                              |
+    |    Copyright [2019] Facade Technologies Inc.                                 |
+    |    All Rights Reserved.                                                      |
+    |                                                                              |
+    | NOTICE:  All information contained herein is, and remains the property of    |
+    | Facade Technologies Inc. and its suppliers if any.  The intellectual and     |
+    | and technical concepts contained herein are proprietary to Facade            |
+    | Technologies Inc. and its suppliers and may be covered by U.S. and Foreign   |
+    | Patents, patents in process, and are protected by trade secret or copyright  |
+    | law.  Dissemination of this information or reproduction of this material is  |
+    | strictly forbidden unless prior written permission is obtained from Facade   |
+    | Technologies Inc.                                                            |
+    |                                                                              |
+    \------------------------------------------------------------------------------/
+
+This file contains the wait conditions and the adaptive poller used by Application.wait. A condition is evaluated
+against a snapshot of the target application's windows that is taken once per poll, so composite conditions
+(e.g. a window exists AND a control in it is enabled) share a single traversal of the GUI.
+"""
+
+import random
+import time
+
+
+class WaitSnapshot:
+    """
+    The target application's top-level windows at one point in time. Descendants of a window are only collected
+    the first time a condition needs them, and are then shared by every condition evaluated on the snapshot.
+    """
+
+    def __init__(self, windows: list):
+        """
+        Constructs a WaitSnapshot
+
+        :param windows: The target application's top-level windows.
+        :type windows: list[pywinauto.base_wrapper.BaseWrapper]
+        """
+        self.windows = windows
+        self._descendants = {}
+
+    def getDescendants(self, window) -> list:
+        """
+        Gets all descendants of window, traversing the window at most once per snapshot.
+
+        :param window: One of the snapshot's windows
+        :type window: pywinauto.base_wrapper.BaseWrapper
+        :return: the window's descendants
+        :rtype: list[pywinauto.base_wrapper.BaseWrapper]
+        """
+        key = id(window)
+        if key not in self._descendants:
+            try:
+                self._descendants[key] = window.descendants()
+            except Exception:
+                self._descendants[key] = []
+        return self._descendants[key]
+
+
+def _isReady(wrapper) -> bool:
+    return wrapper.is_visible() and wrapper.is_enabled()
+
+
+class WaitCondition:
+    """
+    Base class of all wait conditions. Conditions can be combined with & and |.
+    """
+
+    STATES = {
+        'exists': lambda wrapper: True,
+        'visible': lambda wrapper: wrapper.is_visible(),
+        'enabled': lambda wrapper: wrapper.is_enabled(),
+        'active': lambda wrapper: wrapper.is_active(),
+        'ready': _isReady,
+    }
+
+    def evaluate(self, snapshot: 'WaitSnapshot') -> bool:
+        """
+        Must be overwritten in children classes; raises exception here if not.
+        """
+        raise NotImplementedError("evaluate() must be defined in the condition's class.")
+
+    def __and__(self, other: 'WaitCondition') -> 'AllOf':
+        return AllOf(self, other)
+
+    def __or__(self, other: 'WaitCondition') -> 'AnyOf':
+        return AnyOf(self, other)
+
+    @staticmethod
+    def _inState(wrapper, state: str) -> bool:
+        """
+        Checks whether a wrapper is in a state. A wrapper that disappears while being checked is not in any state.
+
+        :param wrapper: The window or control to check
+        :type wrapper: pywinauto.base_wrapper.BaseWrapper
+        :param state: one of 'exists', 'visible', 'enabled', 'active', 'ready'
+        :type state: str
+        :return: True if the wrapper is in the state, False otherwise.
+        :rtype: bool
+        """
+        try:
+            return bool(WaitCondition.STATES[state](wrapper))
+        except Exception:
+            return False
+
+    @staticmethod
+    def _checkState(state: str):
+        if state not in WaitCondition.STATES:
+            raise ValueError('Not a valid state: "{}". Please use one of {}.'.format(state,
+                                                                                    ', '.join(WaitCondition.STATES)))
+
+
+class WindowCondition(WaitCondition):
+    """
+    Holds when a top-level window of the target application is in the given state.
+    """
+
+    def __init__(self, state: str = 'exists', title: str = None):
+        """
+        Constructs a WindowCondition
+
+        :param state: one of 'exists', 'visible', 'enabled', 'active', 'ready'
+        :type state: str
+        :param title: The window's title. If None, any of the application's windows will do.
+        :type title: str
+        """
+        WaitCondition._checkState(state)
+        self.state = state
+        self.title = title
+
+    def getWindows(self, snapshot: 'WaitSnapshot') -> list:
+        """
+        Gets the snapshot's windows with this condition's title.
+
+        :param snapshot: The windows to look through
+        :type snapshot: WaitSnapshot
+        :return: the matching windows
+        :rtype: list[pywinauto.base_wrapper.BaseWrapper]
+        """
+        if self.title is None:
+            return snapshot.windows
+
+        windows = []
+        for win in snapshot.windows:
+            try:
+                if win.window_text() == self.title:
+                    windows.append(win)
+            except Exception:
+                continue
+        return windows
+
+    def evaluate(self, snapshot: 'WaitSnapshot') -> bool:
+        return any(WaitCondition._inState(win, self.state) for win in self.getWindows(snapshot))
+
+
+class ControlCondition(WaitCondition):
+    """
+    Holds when a control matching all of the given properties is in the given state.
+    """
+
+    def __init__(self, state: str = 'exists', title: str = None, controlType: str = None, autoId: str = None,
+                 windowTitle: str = None):
+        """
+        Constructs a ControlCondition. Properties that are None are not checked.
+
+        :param state: one of 'exists', 'visible', 'enabled', 'active', 'ready'
+        :type state: str
+        :param title: The control's text
+        :type title: str
+        :param controlType: The control's type (e.g. 'Button')
+        :type controlType: str
+        :param autoId: The control's automation ID
+        :type autoId: str
+        :param windowTitle: The title of the top-level window containing the control.
+        :type windowTitle: str
+        """
+        WaitCondition._checkState(state)
+        self.state = state
+        self.title = title
+        self.controlType = controlType
+        self.autoId = autoId
+        self._windowCondition = WindowCondition('exists', windowTitle)
+
+    def _matches(self, control) -> bool:
+        try:
+            if self.controlType is not None and control.element_info.control_type != self.controlType:
+                return False
+            if self.autoId is not None and control.element_info.automation_id != self.autoId:
+                return False
+            if self.title is not None and control.window_text() != self.title:
+                return False
+        except Exception:
+            return False
+        return True
+
+    def evaluate(self, snapshot: 'WaitSnapshot') -> bool:
+        for win in self._windowCondition.getWindows(snapshot):
+            for control in snapshot.getDescendants(win):
+                if self._matches(control) and WaitCondition._inState(control, self.state):
+                    return True
+        return False
+
+
+class AllOf(WaitCondition):
+    """
+    Holds when all of its conditions hold in the same snapshot.
+    """
+
+    def __init__(self, *conditions: 'WaitCondition'):
+        self.conditions = conditions
+
+    def evaluate(self, snapshot: 'WaitSnapshot') -> bool:
+        return all(condition.evaluate(snapshot) for condition in self.conditions)
+
+
+class AnyOf(WaitCondition):
+    """
+    Holds when any of its conditions holds.
+    """
+
+    def __init__(self, *conditions: 'WaitCondition'):
+        self.conditions = conditions
+
+    def evaluate(self, snapshot: 'WaitSnapshot') -> bool:
+        return any(condition.evaluate(snapshot) for condition in self.conditions)
+
+
+class Backoff:
+    """
+    Generates poll intervals that grow exponentially up to a maximum, with random jitter so that several waiting
+    applications don't poll in lock step.
+    """
+
+    def __init__(self, initial: float = 0.05, maximum: float = 1.0, factor: float = 2.0, jitter: float = 0.25):
+        """
+        Constructs a Backoff
+
+        :param initial: The first interval in seconds
+        :type initial: float
+        :param maximum: The longest interval in seconds
+        :type maximum: float
+        :param factor: The amount each interval is multiplied by
+        :type factor: float
+        :param jitter: The fraction of each interval that is randomized, between 0 and 1.
+        :type jitter: float
+        """
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+
+    def intervals(self):
+        """
+        Yields poll intervals forever.
+        """
+        interval = self.initial
+        while True:
+            yield interval * (1 - self.jitter * random.random())
+            interval = min(interval * self.factor, self.maximum)
+
+
+def waitUntil(condition: 'WaitCondition', getWindows, timeout: float, backoff: 'Backoff' = None) -> bool:
+    """
+    Polls until condition holds, returning as soon as it does.
+
+    :param condition: The condition to wait for
+    :type condition: WaitCondition
+    :param getWindows: callable returning the target application's current top-level windows
+    :type getWindows: callable
+    :param timeout: Maximum number of seconds to wait
+    :type timeout: float
+    :param backoff: The poll intervals to use. Defaults to Backoff().
+    :type backoff: Backoff
+    :return: True if the condition holds, False if timed out.
+    :rtype: bool
+    """
+    deadline = time.monotonic() + timeout
+    intervals = (backoff or Backoff()).intervals()
+
+    while True:
+        try:
+            windows = getWindows()
+        except Exception:
+            windows = []
+
+        if condition.evaluate(WaitSnapshot(windows)):
+            return True
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(next(intervals), remaining))
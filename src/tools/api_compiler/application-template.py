@@ -24,9 +24,9 @@
 import sys, os
 
 try:
-	from .apicore import BaseApplication, MatchOption
+	from .apicore import BaseApplication, MatchOption, WindowCondition, ControlCondition, traced, ApplicationPool
 except ImportError:
-	from apicore import BaseApplication, MatchOption
+	from apicore import BaseApplication, MatchOption, WindowCondition, ControlCondition, traced, ApplicationPool
 
 pathToThisFile, thisFile = os.path.split(os.path.abspath(__file__))
 sys.path.insert(0, pathToThisFile)
@@ -71,9 +71,24 @@ class Application(BaseApplication):
 	def pause(self, demo=False):
 		return BaseApplication.pause(self, demo)
 
-	def wait(self, state: str, timeout: int = 10):
+	def wait(self, state, timeout: int = 10):
 		return BaseApplication.wait(self, state, timeout)
 
+	def enableTracing(self):
+		return BaseApplication.enableTracing(self)
+
+	def disableTracing(self):
+		return BaseApplication.disableTracing(self)
+
+	def clearTrace(self):
+		return BaseApplication.clearTrace(self)
+
+	def exportTrace(self, path: str):
+		return BaseApplication.exportTrace(self, path)
+
+	def getTraceSummary(self) -> str:
+		return BaseApplication.getTraceSummary(self)
+
 	def _startApp(self):
 		return BaseApplication._startApp(self)
 
@@ -0,0 +1,202 @@
+"""
+..
+    /------------------------------------------------------------------------------\
+    |                 -- FACADE TECHNOLOGIES INC.  CONFIDENTIAL --                 |
+    |------------------------------------------------------------------------------|
+    |                                                                              |
+    |    Copyright [2019] Facade Technologies Inc.                                 |
+    |    All Rights Reserved.                                                      |
+    |                                                                              |
+    | NOTICE:  All information contained herein is, and remains the property of    |
+    | Facade Technologies Inc. and its suppliers if any.  The intellectual and     |
+    | and technical concepts contained herein are proprietary to Facade            |
+    | Technologies Inc. and its suppliers and may be covered by U.S. and Foreign   |
+    | Patents, patents in process, and are protected by trade secret or copyright  |
+    | law.  Dissemination of this information or reproduction of this material is  |
+    | strictly forbidden unless prior written permission is obtained from Facade   |
+    | Technologies Inc.                                                            |
+    |                                                                              |
+    \------------------------------------------------------------------------------/
+
+    This document contains the ApplicationPool class, which runs batch work over several instances of the target
+    application at once.
+"""
+
+import queue
+import threading
+import time
+import traceback
+
+
+class InstanceStats:
+    """
+    Counts the work done by one instance slot of an ApplicationPool.
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.itemsDone = 0
+        self.errors = 0
+        self.restarts = 0
+        self.busyTime = 0.0
+
+    def getThroughput(self) -> float:
+        """
+        Gets the number of items processed per second of work.
+
+        :return: items per second
+        :rtype: float
+        """
+        if self.busyTime == 0:
+            return 0.0
+        return self.itemsDone / self.busyTime
+
+
+class ApplicationPool:
+    """
+    Runs a function over many work items using a pool of target application instances. Each instance slot has its own
+    Application (and therefore its own ComponentFinder cache) and its own thread. Items are handed out from a shared
+    queue, so faster instances take more of the work. An instance whose target application crashed is restarted, and
+    the item it was processing is retried.
+
+    Example::
+
+        pool = ApplicationPool(Application, 4)
+        results = pool.run(lambda app, row: app.enterRow(row), rows)
+        print(pool.formatReport())
+    """
+
+    def __init__(self, appFactory, size: int, maxRetries: int = 2):
+        """
+        Initializes an ApplicationPool.
+
+        :param appFactory: callable creating a new, unstarted application, usually the generated Application class.
+        :type appFactory: callable
+        :param size: The number of target application instances to run at once
+        :type size: int
+        :param maxRetries: The number of times an item is retried after its instance crashed.
+        :type maxRetries: int
+        """
+        if size < 1:
+            raise ValueError("An ApplicationPool needs at least one instance.")
+
+        self._appFactory = appFactory
+        self._size = size
+        self._maxRetries = maxRetries
+        self._stats = [InstanceStats(i) for i in range(size)]
+
+    def getStats(self) -> list:
+        """
+        Gets the statistics of each instance slot.
+
+        :return: one InstanceStats per instance slot
+        :rtype: list[InstanceStats]
+        """
+        return self._stats
+
+    def run(self, func, items) -> list:
+        """
+        Calls func(app, item) for every item, spreading the items across the pool's instances. The instances are
+        started before processing and stopped afterwards.
+
+        :param func: callable taking an application instance and a work item
+        :type func: callable
+        :param items: the work items
+        :type items: iterable
+        :return: the results, in the same order as items. An item that failed has its exception as result.
+        :rtype: list
+        """
+        work = queue.Queue()
+        count = 0
+        for index, item in enumerate(items):
+            work.put((index, item, 0))
+            count += 1
+
+        results = [None] * count
+        self._stats = [InstanceStats(i) for i in range(self._size)]
+        threads = [threading.Thread(target=self._work, args=(stats, func, work, results), daemon=True)
+                   for stats in self._stats]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Items are left over only if instances could not be (re)started.
+        while not work.empty():
+            index, item, attempt = work.get_nowait()
+            results[index] = RuntimeError("No application instance was available to process this item.")
+        return results
+
+    def _startInstance(self, stats: 'InstanceStats'):
+        """
+        Creates and starts a new application for an instance slot.
+
+        :return: the started application, or None if it could not be started.
+        """
+        try:
+            app = self._appFactory()
+            if not stats.restarts and hasattr(app, "_initializeThread"):
+                app._initializeThread()  # Once per thread, before the first UI Automation call
+            return app.start()
+        except Exception:
+            traceback.print_exc()
+            stats.errors += 1
+            return None
+
+    @staticmethod
+    def _stopInstance(app):
+        try:
+            app.stop()
+        except Exception:
+            traceback.print_exc()
+
+    def _work(self, stats: 'InstanceStats', func, work: 'queue.Queue', results: list):
+        """
+        Processes items from the queue with one instance slot until the queue is empty.
+        """
+        app = self._startInstance(stats)
+        if app is None:
+            return
+
+        while True:
+            try:
+                index, item, attempt = work.get_nowait()
+            except queue.Empty:
+                break
+
+            start = time.perf_counter()
+            try:
+                results[index] = func(app, item)
+                stats.itemsDone += 1
+            except Exception as e:
+                crashed = not app.isRunning()
+                if crashed and attempt < self._maxRetries:
+                    work.put((index, item, attempt + 1))
+                else:
+                    results[index] = e
+                    stats.errors += 1
+
+                if crashed:
+                    self._stopInstance(app)
+                    stats.restarts += 1
+                    app = self._startInstance(stats)
+                    if app is None:
+                        break
+            finally:
+                stats.busyTime += time.perf_counter() - start
+
+        if app is not None:
+            self._stopInstance(app)
+
+    def formatReport(self) -> str:
+        """
+        Gets the per-instance statistics of the last run as a table.
+
+        :return: the table
+        :rtype: str
+        """
+        lines = ["{:>8}{:>8}{:>8}{:>10}{:>12}".format("instance", "items", "errors", "restarts", "items/s")]
+        for stats in self._stats:
+            lines.append("{:>8}{:>8}{:>8}{:>10}{:>12.2f}".format(stats.index, stats.itemsDone, stats.errors,
+                                                                 stats.restarts, stats.getThroughput()))
+        return "\n".join(lines)
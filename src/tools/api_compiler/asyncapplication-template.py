@@ -0,0 +1,74 @@
+"""
+..
+	/------------------------------------------------------------------------------\
+	|                 -- FACADE TECHNOLOGIES INC.  CONFIDENTIAL --                 |
+	|------------------------------------------------------------------------------|
+	|                                                                              |
+	|    Copyright [2019] Facade Technologies Inc.                                 |
+	|    All Rights Reserved.                                                      |
+	|                                                                              |
+	| NOTICE:  All information contained herein is, and remains the property of    |
+	| Facade Technologies Inc. and its suppliers if any.  The intellectual and     |
+	| and technical concepts contained herein are proprietary to Facade            |
+	| Technologies Inc. and its suppliers and may be covered by U.S. and Foreign   |
+	| Patents, patents in process, and are protected by trade secret or copyright  |
+	| law.  Dissemination of this information or reproduction of this material is  |
+	| strictly forbidden unless prior written permission is obtained from Facade   |
+	| Technologies Inc.                                                            |
+	|                                                                              |
+	\------------------------------------------------------------------------------/
+
+	This document contains the custom generated AsyncApplication class
+"""
+
+import asyncio
+import sys, os
+
+try:
+	from .apicore import AsyncBaseApplication, MatchOption, WindowCondition, ControlCondition
+	from .application import Application, ActionException
+except ImportError:
+	from apicore import AsyncBaseApplication, MatchOption, WindowCondition, ControlCondition
+	from application import Application, ActionException
+
+pathToThisFile, thisFile = os.path.split(os.path.abspath(__file__))
+sys.path.insert(0, pathToThisFile)
+
+
+class AsyncApplication(AsyncBaseApplication):
+	"""
+	This class allows a user to automate a predefined target GUI from asyncio code, using coroutines (action
+	pipelines) defined in Facile itself. Several instances can be driven concurrently with asyncio.gather.
+	"""
+	
+	def __init__(self):
+		"""
+		Initializes the AsyncApplication class with a synchronous Application to delegate actions to.
+		"""
+		
+		AsyncBaseApplication.__init__(self, Application())
+	
+	async def start(self) -> 'AsyncApplication':
+		"""
+		Starts the target application, then waits for all processes' active window to be ready.
+		Returns self, that way the user can just call await AsyncApplication().start() when initializing their app.
+		"""
+		
+		return await AsyncBaseApplication.start(self)
+
+	# ------------------- Overloading AsyncBaseApplication Methods for Documentation ------------------- #
+
+	async def stop(self):
+		return await AsyncBaseApplication.stop(self)
+
+	async def pause(self, demo=False):
+		return await AsyncBaseApplication.pause(self, demo)
+
+	async def wait(self, state, timeout: int = 10):
+		return await AsyncBaseApplication.wait(self, state, timeout)
+
+	def close(self):
+		return AsyncBaseApplication.close(self)
+
+	# ------------------------------------------------------------------------------------------------ #
+
@@ -0,0 +1,132 @@
+"""
+..
+    /------------------------------------------------------------------------------\
+    |                 -- FACADE TECHNOLOGIES INC.  CONFIDENTIAL --                 |
+    |------------------------------------------------------------------------------|
+    |                                                                              |
+    |    Copyright [2019] Facade Technologies Inc.                                 |
+    |    All Rights Reserved.                                                      |
+    |                                                                              |
+    | NOTICE:  All information contained herein is, and remains the property of    |
+    | Facade Technologies Inc. and its suppliers if any.  The intellectual and     |
+    | and technical concepts contained herein are proprietary to Facade            |
+    | Technologies Inc. and its suppliers and may be covered by U.S. and Foreign   |
+    | Patents, patents in process, and are protected by trade secret or copyright  |
+    | law.  Dissemination of this information or reproduction of this material is  |
+    | strictly forbidden unless prior written permission is obtained from Facade   |
+    | Technologies Inc.                                                            |
+    |                                                                              |
+    \------------------------------------------------------------------------------/
+
+    This document contains the AsyncBaseApplication class
+"""
+
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+if 'CONTEXT' not in locals():
+    from libs.env import CONTEXT
+
+if CONTEXT in ("API"):
+    # from .baseapplication import BaseApplication, WaitException
+    pass
+elif CONTEXT in ("Sphinx"):
+    from baseapplication import BaseApplication, WaitException
+else:
+    raise Exception(f"Invalid context: {CONTEXT}")
+
+
+class AsyncBaseApplication:
+    """
+    The core of all async Facile APIs. The custom generated AsyncApplication class inherits from this.
+
+    Each instance wraps a synchronous Application and owns a single worker thread. Every call into the target
+    application is made from that thread, so calls on one instance are serialized while calls on different instances
+    (i.e. different target application instances) run concurrently. Cancellation takes effect between actions: an
+    action that is already running on the worker thread is allowed to finish.
+    """
+
+    def __init__(self, app: 'BaseApplication'):
+        """
+        Initializes an AsyncBaseApplication instance.
+
+        :param app: The synchronous application that actions are delegated to.
+        :type app: BaseApplication
+        """
+
+        self._app = app
+        self._executor = ThreadPoolExecutor(max_workers=1, initializer=BaseApplication._initializeThread)
+
+    async def _run(self, func, *args, **kwargs):
+        """
+        Runs func on this instance's worker thread without blocking the event loop.
+
+        :param func: the blocking callable to run
+        :type func: callable
+        :return: whatever func returns
+        """
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def start(self) -> 'AsyncBaseApplication':
+        """
+        Starts the target application, then waits for all processes' active window to be ready.
+        Returns self, that way the user can just call await AsyncApplication().start().
+        """
+
+        await self._run(self._app.start)
+        return self
+
+    async def stop(self):
+        """
+        Stops the target application and the processes spawned by it
+        """
+
+        await self._run(self._app.stop)
+
+    async def pause(self, demo=False):
+        """
+        Pauses execution while the user interacts with their app.
+        """
+
+        await self._run(self._app.pause, demo)
+
+    async def wait(self, state, timeout: int = 10):
+        """
+        Pauses until state is reached for each process's active window, timing out in timeout seconds.
+        Wait times ("x s" or "x m") are awaited on the event loop instead of blocking the worker thread.
+
+        :param state: state to wait for ('visible', 'ready', 'exists', 'enabled', 'active'), a WaitCondition, or time to wait in s or m
+        :type state: str or WaitCondition
+        :param timeout: Maximum number of seconds to wait for state to be reached.
+        :type timeout: float
+        """
+
+        try:
+            duration = BaseApplication._parseWaitTime(state)
+        except Exception:
+            raise WaitException('Not a valid wait time. Please use "x s" or "x m" for x seconds/minutes respectively.')
+
+        if duration is not None:
+            await asyncio.sleep(duration)
+        else:
+            await self._run(self._app.wait, state, timeout)
+
+    def close(self):
+        """
+        Shuts down this instance's worker thread. Does not stop the target application.
+        """
+
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> 'AsyncBaseApplication':
+        return await self.start()
+
+    async def __aexit__(self, excType, exc, tb):
+        try:
+            await self.stop()
+        finally:
+            self.close()
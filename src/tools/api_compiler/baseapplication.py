@@ -25,10 +25,11 @@ import sys
 import os
 import time as t
 import json
+import logging
 import psutil
 import pywinauto
-import pyautogui
 import traceback
+import functools
 from datetime import datetime
 from typing import Set
 
@@ -36,37 +37,67 @@ if 'CONTEXT' not in locals():
     from libs.env import CONTEXT
 
 if CONTEXT in ("API"):
-    # from .tguiil.tokens import Token
+    # from .tguiil.tokens import Token, getTitleWords
     # from .tguiil.application import Application
     # from .tguiil.matchoption import MatchOption
     # from .tguiil.componentfinder import ComponentFinder
     # from .data.tguim.targetguimodel import TargetGuiModel
     # from .data.tguim.visibilitybehavior import VisibilityBehavior
+    # from .data.tguim.routetable import RouteTable
+    # from .tracer import Tracer
     pass
 elif CONTEXT in ("Sphinx"):
-    from tguiil.tokens import Token
+    from tguiil.tokens import Token, getTitleWords
     from tguiil.application import Application
     from tguiil.matchoption import MatchOption
     from tguiil.componentfinder import ComponentFinder
     from data.tguim.targetguimodel import TargetGuiModel
     from data.tguim.visibilitybehavior import VisibilityBehavior
+    from data.tguim.routetable import RouteTable
+    from tools.api_compiler.tracer import Tracer
 else:
     raise Exception(f"Invalid context: {CONTEXT}")
 
 pathToThisFile, thisFile = os.path.split(os.path.abspath(__file__))
 sys.path.insert(0, pathToThisFile)
 
+logger = logging.getLogger(__name__)
+
 
 class WaitException(Exception):
     def __init__(self, msg: str):
         Exception.__init__(self, msg)
 
 
+def traced(compID: int = None):
+    """
+    Decorates a generated action or action pipeline method so that each call is recorded as a span when tracing is
+    enabled on the application.
+
+    :param compID: The ID of the component the action acts on, or None for action pipelines.
+    :type compID: int
+    :return: the decorator
+    """
+    category = "pipeline" if compID is None else "action"
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not self._tracer.enabled:
+                return func(self, *args, **kwargs)
+            with self._tracer.span(func.__name__, category, compID):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
 class BaseApplication:
     """
     The core of all Facile APIs: contains functions that are necessary for any API. The
     custom generated Application class inherits from this.
     """
+
+    NUM_ALTERNATIVE_ROUTES = 3  # Number of routes to try when forcing a component's appearance
     
     def __init__(self, exeLoc: str, options: Set['MatchOption'], name: str, reqCompIds: list, backend: str = 'uia'):
         """
@@ -90,10 +121,27 @@ class BaseApplication:
         self._options = options
         self._exeLoc = exeLoc
         self._name = name
-        self._compFinder = ComponentFinder(self.app, self._options)
+        self._compFinder = ComponentFinder(self.app, self._options, captureImages=False)
         self._pathMap = {}
         self._compIDs = reqCompIds
-        
+        self._dialogIndex = {}  # maps hard-match key to ({title: [comps]}, {title word: [comps]}, [other comps])
+        self._windowIDMemo = {}  # maps (window handle, PID) to component ID while the window is alive
+        self._tgm = None
+        self._routeTable = None
+        self._modelLoaded = False  # The TGUIM is loaded on first use. See _loadModel
+        self._tracer = Tracer()  # Disabled until enableTracing is called
+
+    def _loadModel(self):
+        """
+        Loads the target GUI model from ./tguim.json, then builds the dialog index, route table, and path map.
+
+        This is done the first time the model is needed instead of in the constructor, so that importing the API and
+        creating an Application is fast.
+        """
+        if self._modelLoaded:
+            return
+        self._modelLoaded = True
+
         try:
             with open(os.path.join(pathToThisFile, "tguim.json"), 'r') as tguimFile:
                 d = json.loads(tguimFile.read())
@@ -103,8 +151,72 @@ class BaseApplication:
             self._tgm = None
             traceback.print_exc()
 
+        self._buildDialogIndex()
+        self._routeTable = RouteTable(self._tgm) if self._tgm is not None else None
         self._generatePathMap()
     
+    def enableTracing(self):
+        """
+        Starts recording how long each action pipeline, action, component search, forced appearance, visibility
+        behavior, and wait takes.
+        """
+        self._tracer.enabled = True
+
+    def disableTracing(self):
+        """
+        Stops recording spans. Spans that were already recorded are kept.
+        """
+        self._tracer.enabled = False
+
+    def clearTrace(self):
+        """
+        Discards all recorded spans.
+        """
+        self._tracer.clear()
+
+    def exportTrace(self, path: str):
+        """
+        Writes the recorded spans to a Chrome trace-event JSON file, which can be opened in chrome://tracing.
+
+        :param path: The file to write to
+        :type path: str
+        """
+        self._tracer.exportChromeTrace(path)
+
+    def getTraceSummary(self) -> str:
+        """
+        Gets a table of the p50 and p95 latencies of the recorded spans for each component ID, slowest first.
+
+        :return: the table
+        :rtype: str
+        """
+        return self._tracer.formatSummary()
+
+    @staticmethod
+    def _initializeThread():
+        """
+        Initializes COM for a worker thread, since UI Automation calls are made from it.
+        """
+        try:
+            import comtypes
+            comtypes.CoInitializeEx(comtypes.COINIT_MULTITHREADED)
+        except Exception:
+            pass
+
+    def isRunning(self) -> bool:
+        """
+        Determines whether the target application was started by this instance and is still running.
+
+        :return: True if running, False otherwise.
+        :rtype: bool
+        """
+        if not self._isRunning:
+            return False
+        try:
+            return self.app.is_process_running()
+        except psutil.Error:
+            return False
+
     def _startApp(self):
         """
         Starts the target application, then waits for all processes' active window to be ready.
@@ -114,7 +226,7 @@ class BaseApplication:
             self._isRunning = True
         else:
             print('Your app is already running. If you want more instances, make another application instance '
-                  '(myApp1 = Application(), myApp2 = Application())')
+                  '(myApp1 = Application(), myApp2 = Application()), or use an ApplicationPool for batch work.')
     
     def stop(self):
         """
@@ -125,6 +237,7 @@ class BaseApplication:
                 self.app.kill()
             except psutil.NoSuchProcess:
                 pass
+            self._isRunning = False
         else:
             print('Your app should not be running. If it is, please report this as a bug on our website.')
             
@@ -132,6 +245,8 @@ class BaseApplication:
         """
         Pauses execution while the user interacts with their app.
         """
+        import pyautogui  # Imported here since it's slow to import and rarely needed
+
         if not demo:
             pyautogui.alert('Execution paused. Press "OK" when ready to continue.')
         else:
@@ -139,29 +254,55 @@ class BaseApplication:
                             'to check out how you can get the most out of your application.\n\n'
                             'Press "OK" to close this and your application.')
     
-    def wait(self, state: str, timeout: int = 10):
+    def wait(self, state, timeout: int = 10):
         """
-        Pauses until state is reached for each process's active window, timing out in timeout seconds.
-        Useful when waiting for target app to complete execution of a task, or when starting up.
-        Wraps around pywinauto's wait function.
+        Pauses until state is reached by the application's windows, or until a condition holds, timing out in timeout
+        seconds. Returns as soon as the state is reached. Useful when waiting for target app to complete execution of
+        a task, or when starting up.
 
-        :param state: state to wait for ('visible', 'ready', 'exists', 'enabled', 'active'), or time to wait in s or m
-        :type state: str
-        :param timeout: Maximum number of seconds to wait for state to be reached. Defaults to a minute, should be longer for apps with more windows.
+        Conditions can be combined, e.g. WindowCondition('exists', 'Save As') & ControlCondition('enabled', 'Save'),
+        and are checked together on each poll.
+
+        :param state: state to wait for ('visible', 'ready', 'exists', 'enabled', 'active'), a WaitCondition, or time to wait in s or m
+        :type state: str or WaitCondition
+        :param timeout: Maximum number of seconds to wait for state to be reached.
         :type timeout: float
         """
-        
+
         try:
-            if ' s' in state:
-                t.sleep(float(state[:-2]))
-            elif ' m' in state:
-                t.sleep(60 * float(state[:-2]))
-            else:
-                self.app.wait(state, timeout)
-        except Exception as e:
+            duration = BaseApplication._parseWaitTime(state)
+        except ValueError:
             raise WaitException('Not a valid wait time or state. Please use "x s" or "x m" for x seconds/minutes \
             respectively, or use one of "visible", "ready", "exists", "enabled", "active" as state to wait for.')
 
+        with self._tracer.span("wait", "wait", state=str(state)):
+            if duration is not None:
+                t.sleep(duration)
+                return
+
+            try:
+                self.app.wait(state, timeout)
+            except Exception as e:
+                raise WaitException(str(e))
+
+    @staticmethod
+    def _parseWaitTime(state) -> float:
+        """
+        Parses a wait time given as "x s" or "x m".
+
+        :param state: time to wait in s or m, or a window state or condition
+        :type state: str or WaitCondition
+        :return: the number of seconds to wait, or None if state is not a wait time.
+        :rtype: float
+        """
+        if not isinstance(state, str):
+            return None
+        if ' s' in state:
+            return float(state[:-2])
+        elif ' m' in state:
+            return 60 * float(state[:-2])
+        return None
+
     def _generatePathMap(self):
         """
         Creates a map of component ID to (supertoken path, handle) tuples, where handle is initialized to None
@@ -183,19 +324,22 @@ class BaseApplication:
         :rtype: pywinauto.base_wrapper.BaseWrapper
         """
 
+        self._loadModel()
         path, tmpHandle = self._pathMap[compID]
 
-        if tmpHandle:
-            if tmpHandle.is_visible():
-                return tmpHandle
+        with self._tracer.span("_findComponent", "find", compID):
+            if tmpHandle:
+                if tmpHandle.is_visible():
+                    return tmpHandle
 
-        comp = self._getComponentObject(compID)
-        self._forceShow(comp)
+            comp = self._getComponentObject(compID)
+            self._forceShow(comp)
 
-        handle = self._compFinder.find(comp.getSuperToken(), path)
+            with self._tracer.span("ComponentFinder.find", "componentFinder", compID):
+                handle = self._compFinder.find(comp.getSuperToken(), path)
 
-        self._pathMap[compID] = (path, handle)
-        return handle
+            self._pathMap[compID] = (path, handle)
+            return handle
     
     def _getComponentObject(self, compID: int) -> 'Component':
         """
@@ -206,7 +350,8 @@ class BaseApplication:
         :return: The component item for an item with ID compID
         :rtype: Component
         """
-        
+
+        self._loadModel()
         try:
             comp = self._tgm.getComponent(compID)
             if comp:
@@ -216,36 +361,153 @@ class BaseApplication:
         except Exception as e:
             raise Exception(str(e))
         
+    @staticmethod
+    def _hardMatchKey(token: 'Token') -> tuple:
+        """
+        Gets the fields of a token that must be identical for two tokens to possibly match (see Token.isEqualTo).
+
+        :param token: The token to get the key for
+        :type token: Token
+        :return: The hard-match key of the token
+        :rtype: tuple
+        """
+        return token.type, token.autoid, token.parentType, token.topLevelParentType
+
+    def _buildDialogIndex(self):
+        """
+        Builds an index of all dialog components in the TGUIM so that windows can be identified without comparing
+        against every component. Components are keyed by their tokens' hard-match fields, then bucketed by title and
+        by the words in their titles.
+        """
+
+        self._dialogIndex = {}
+        if self._tgm is None:
+            return
+
+        def addTo(bucket, comp):
+            if comp not in bucket:
+                bucket.append(comp)
+
+        for comp in self._tgm.findComponents(isDialog=True):
+            for token in comp.getSuperToken().tokens:
+                titleBuckets, wordBuckets, others = self._dialogIndex.setdefault(
+                    BaseApplication._hardMatchKey(token), ({}, {}, []))
+                addTo(titleBuckets.setdefault(token.title, []), comp)
+                if token.isDialog:
+                    for word in getTitleWords(token.title):
+                        addTo(wordBuckets.setdefault(word, []), comp)
+                else:  # Not matched as a window (see Token.isEqualTo), so its title doesn't have to be similar
+                    addTo(others, comp)
+
+    def _getDialogCandidates(self, token: 'Token') -> list:
+        """
+        Gets the dialog components that could match token: the ones sharing its title first, then the ones whose
+        titles share words with it, most shared words first.
+
+        A window token's title is weighted so heavily (see Token.isEqualTo) that a dialog whose title is different and
+        shares no words with it can never match, so those dialogs aren't candidates. In the worst case, a word appears
+        in the title of every dialog with the token's hard-match key (e.g. the application's name), and all of them
+        are candidates.
+
+        :param token: token created from a window of the target application
+        :type token: Token
+        :return: list of candidate dialog components
+        :rtype: list[Component]
+        """
+
+        entry = self._dialogIndex.get(BaseApplication._hardMatchKey(token))
+        if entry is None:
+            return []
+        titleBuckets, wordBuckets, others = entry
+
+        candidates = list(titleBuckets.get(token.title, []))
+        seen = set(comp.getId() for comp in candidates)
+
+        # maps component ID to [number of shared title words, component]
+        similar = {}
+        for word in getTitleWords(token.title):
+            for comp in wordBuckets.get(word, []):
+                if comp.getId() not in seen:
+                    similar.setdefault(comp.getId(), [0, comp])[0] += 1
+        for numShared, comp in sorted(similar.values(), key=lambda item: -item[0]):
+            seen.add(comp.getId())
+            candidates.append(comp)
+
+        candidates.extend(comp for comp in others if comp.getId() not in seen)
+        return candidates
+
+    @staticmethod
+    def _getWindowKey(winHandle: pywinauto.base_wrapper.BaseWrapper) -> tuple:
+        """
+        Gets a key that identifies a live window, or None if the window has no native handle.
+
+        :param winHandle: handle of window to get the key for
+        :type winHandle: pywinauto.base_wrapper.BaseWrapper
+        :return: (native handle, process ID) or None
+        :rtype: tuple
+        """
+        try:
+            nativeHandle = winHandle.handle
+            if nativeHandle:
+                return nativeHandle, winHandle.process_id()
+        except Exception:
+            pass
+        return None
+
+    def _pruneWindowIDMemo(self, aliveKeys: set):
+        """
+        Forgets memoized window identifications for windows that no longer exist.
+
+        :param aliveKeys: keys (see _getWindowKey) of all windows that currently exist
+        :type aliveKeys: set
+        """
+        for key in list(self._windowIDMemo):
+            if key not in aliveKeys:
+                del self._windowIDMemo[key]
+
     def _getWindowObjectIDFromHandle(self, winHandle: pywinauto.base_wrapper.BaseWrapper) -> 'Component':
         """
         Gets the Component object for a component with handle compHandle.
         ** ONLY WORKS FOR WINDOWS ** (Can be modified for more, but implemented this way to save processing power/time.
 
+        Results are memoized per native window handle, so a window is only identified once while it is alive.
+
         :param winHandle: handle of window to get Component object for
         :type winHandle: pywinauto.base_wrapper.BaseWrapper
         :return: The Component object for an item with handle compHandle
         :rtype: Component
         """
-        
+
+        self._loadModel()
+        windowKey = BaseApplication._getWindowKey(winHandle)
+        if windowKey is not None and windowKey in self._windowIDMemo:
+            return self._windowIDMemo[windowKey]
+
+        compID = self._identifyWindow(winHandle)
+        if windowKey is not None:
+            self._windowIDMemo[windowKey] = compID
+        return compID
+
+    def _identifyWindow(self, winHandle: pywinauto.base_wrapper.BaseWrapper) -> int:
+        """
+        Matches a window against the dialog index.
+
+        :param winHandle: handle of window to identify
+        :type winHandle: pywinauto.base_wrapper.BaseWrapper
+        :return: The ID of the matching component, or None if there is no match
+        :rtype: int
+        """
+
         # Create Token for handle
         timeStamp = datetime.now()
         token = Token.createToken(timeStamp, winHandle, captureImage=False)
     
         # determine if the new token matches any super tokens and how well it matches if it does.
         bestMatch = 0
-        bestDecision = Token.Match.NO.value
         selectedComponent = None
-        potentialMatches = []
-        comps = self._tgm.getComponents()
-        for id in comps:
-            comp = comps[id]
-            st = comp.getSuperToken()
-            if st.tokens[0].isDialog:
-                potentialMatches.append((st, comp))
-        
-        for superToken, comp in potentialMatches:
-            decision, matchVal = superToken.shouldContain(token)
-            bestDecision = min(bestDecision, decision.value)
+
+        for comp in self._getDialogCandidates(token):
+            decision, matchVal = comp.getSuperToken().shouldContain(token)
             
             if decision.value == Token.Match.NO.value:
                 continue
@@ -268,74 +530,65 @@ class BaseApplication:
     def _forceShow(self, compObj: 'Component'):
         """
         Attempts to force the component to be visible using visibility behaviors.
-        Uses a simple breadth-first search algorithm.
+        Routes between windows are looked up in the precomputed route table. If performing a route fails, the next
+        best alternative route is tried.
 
         :param compObj: Component to show
         :type compObj: Component
         :return: None
         """
         
-        # --- This may be useful for other search algorithms later --- #
-        # # First, get all necessary lists.
-        # # The instantiated Visibility Behaviors (These are the edges)
-        # visBs = self._tgm.getVisibilityBehaviors()
-        # # All top-level windows in the TGUIM (These are the nodes)
-        # tlwComps = self._tgm.getTopLevelWindows()
-        # ------------------------------------------------------------ #
-        
-        # Get the window that we want to show. This is the starting point.
-        startWindow, pos = compObj.getPathFromRoot()[-2]  # -1 position is root, -2 is window
-        
-        # Get the currently active windows, which are the algorithm's targets.
-        # We want the component objects for these, not the actual handles.
-        targets = []
-        handles = self.app.windows()
-        while handles:
-            handle = handles.pop()
-            for child in handle.children():
-                if child.is_dialog():
-                    handles.append(child)
-            targets.append(self._getWindowObjectIDFromHandle(handle))  # Ids are faster to compare than Comps
-
-        # Find path to one of the windows from desired component's window.
-        # How this works:
-        # Store lists of (component, window, VB) tuples, where the VB is performed on component.
-        # These lists are the path to the most recent item in the list, and the containing list holds all paths
-        work = [[(compObj, startWindow, None)]]
-        seen = []
-        path = []
-        success = False
-        while work:  # TODO: Might want to modify this to have a "backup" path as well: just keep the first 2 paths
-            path = work.pop(0)
-            curComp, window, visB = path[-1]
-            
-            if window.getId() in targets:  # Found closest path
-                success = True
-                break
-            elif window.getId() in seen:  # already saw window; ignoring it
-                continue
-            else:
-                seen.append(window.getId())  # avoids seeing a window multiple times and getting an infinite loop
-                for vb in (curComp.getDestVisibilityBehaviors() + window.getDestVisibilityBehaviors()):
-                    # if vb.getReactionType() is VisibilityBehavior.ReactionType.Show:
-                    tmp = path[:]
-                    tmpComp = vb.getSrcComponent()
-                    tmpWin, pos = vb.getSrcComponent().getPathFromRoot()[-2]
-                    tmp.append((tmpComp, tmpWin, vb))
-                    work.append(tmp)
-
-        if not success:
-            print(compObj, startWindow)
-            pyautogui.alert('Could not force component appearance. Please manually ensure that component "' +
-                            compObj.getName() + '" in window "' + startWindow.getName() + '" is visible, then press '
-                                                                                          'OK.')
-        else:
-            # Now, window is one of the active windows, so we can now interact with the application and
-            # force comp's appearance.
-            while path:
-                curComp, window, visB = path.pop()
-                if visB:
-                    getattr(self, visB.methodName)()  # This does self.(methodName contents)()
+        self._loadModel()
+
+        with self._tracer.span("_forceShow", "forceShow", compObj.getId()):
+            # Get the window that we want to show.
+            startWindow = self._tgm.getWindow(compObj)
+
+            # Get the currently active windows, which are the possible starting points of a route.
+            # We want the component IDs for these, not the actual handles.
+            targets = set()
+            aliveKeys = set()
+            handles = self.app.windows()
+            while handles:
+                handle = handles.pop()
+                for child in handle.children():
+                    if child.is_dialog():
+                        handles.append(child)
+                aliveKeys.add(BaseApplication._getWindowKey(handle))
+                targets.add(self._getWindowObjectIDFromHandle(handle))  # Ids are faster to compare than Comps
+            self._pruneWindowIDMemo(aliveKeys)
+
+            with self._tracer.span("getRoutes", "routing", compObj.getId()):
+                routes = self._routeTable.getRoutes(targets, startWindow.getId(),
+                                                    BaseApplication.NUM_ALTERNATIVE_ROUTES)
+
+            # Routes that fail are reported to the user if no route works.
+            failures = []
+            for route in routes:
+                # Now, the route starts at one of the active windows, so we can now interact with the application and
+                # force comp's appearance.
+                try:
+                    for visB in route:
+                        with self._tracer.span(visB.methodName, "visibilityBehavior", compObj.getId(),
+                                               vbID=visB.getId()):
+                            getattr(self, visB.methodName)()  # This does self.(methodName contents)()
+                except Exception as e:
+                    routeStr = " -> ".join(visB.methodName for visB in route)
+                    logger.debug("Route %s to window %s failed, trying the next one.", routeStr, startWindow.getName(),
+                                 exc_info=True)
+                    failures.append(routeStr + ": " + str(e))
+                    continue
+                else:
+                    return
+
+        import pyautogui
+
+        print(compObj, startWindow)
+        message = 'Could not force component appearance. Please manually ensure that component "' + \
+                  compObj.getName() + '" in window "' + startWindow.getName() + '" is visible, then press OK.'
+        if failures:
+            message += '\n\nThese routes to the window failed:\n' + '\n'.join(failures)
+        pyautogui.alert(message)
     
     def _selectMenuItem(self, component: 'Component'):
         """
@@ -346,6 +599,7 @@ class BaseApplication:
         :return: None
         """
 
+        self._loadModel()
         path, handle = self._pathMap[component.getId()]
 
         # Getting the lowest level component containing the menu/menuitem that can be force-shown
@@ -23,7 +23,6 @@ work in the gui, and converts it into the desired API.
 """
 import os
 import sys
-import json
 from subprocess import check_call, DEVNULL, STDOUT, check_output
 from shutil import copyfile, rmtree
 
@@ -32,6 +31,7 @@ from PySide2.QtWidgets import QApplication
 
 import data.statemachine as sm
 from data.compilationprofile import CompilationProfile
+import data.jsonstream as jsonstream
 from tools.api_compiler.copy_file_manifest import compilation_copy_files
 from libs.logging import compiler_logger as logger
 from libs.logging import log_exceptions
@@ -168,23 +168,7 @@ class Compiler(QObject):
             optStr = optStr[:-2] + '}'
 
             logger.debug("Generating str of required compIDs")
-            alreadyWritten = []
-            aps, cas = self._apim.getActionsByType()
-            compIDs = '['
-            for action in cas:
-                alreadyWritten.append(action.getTargetComponent().getId())
-                compIDs += str(action.getTargetComponent().getId()) + ', '
-
-            # We also want the visibilitybehaviors' triggeractions' components' IDs
-            vbs = self._tguim.getVisibilityBehaviors()
-            for id in vbs:
-                vb = vbs[id]
-                name = vb.methodName
-                triggerAction = vb.getTriggerAction()
-                if name not in alreadyWritten and triggerAction is not None:
-                    compIDs += str(triggerAction.getTargetComponent().getId()) + ', '
-
-            compIDs = compIDs[:-2] + ']'  # remove the final ", " and close bracket
+            compIDs = str(self._getRequiredComponentIDs())
 
             logger.debug("Format BaseApp superclass call with necessary info")
             try:
@@ -195,27 +179,110 @@ class Compiler(QObject):
             logger.debug("Writing BaseApp")
             f.write(appStr)
 
-            logger.debug("Writing methods generated from actions that are used in action pipelines.")
-            alreadyWritten = []
-            for action in cas:
-                alreadyWritten.append(action.getMethodName())
-                f.write(action.getMethod())
+            self._writeActionMethods(f)
 
-            logger.debug("Writing methods generated from actions that are used by visibility behaviors.")
-            for id in vbs:
-                vb = vbs[id]
-                name = vb.methodName
-                triggerAction = vb.getTriggerAction()
-                if name not in alreadyWritten and triggerAction is not None:
-                    f.write(triggerAction.getMethod())
+        logger.info("Finished generating custom application driver.")
+        self.stepComplete.emit()
 
-            logger.debug("Writing methods generated from action pipelines.")
-            for ap in aps:
-                f.write(ap.getMethod())
+    def generateAsyncApp(self) -> None:
+        """
+        Creates the custom async application class/file, which wraps the custom application so that action pipelines
+        can be awaited and run concurrently on several application instances.
 
-        logger.info("Finished generating custom application driver.")
+        :return: None
+        """
+        msg = "Generating custom async application driver"
+        logger.info(msg)
+        self.stepStarted.emit(msg)
+
+        with open(os.path.join(self._srcFolder, "asyncapplication.py"), "w+") as f:
+            logger.debug("Reading asyncapplication-template.py")
+            try:
+                with open(os.path.join(dir, 'asyncapplication-template.py'), 'r') as g:
+                    f.write(g.read())
+            except Exception as e:
+                f.write('There was an error generating your API.\n')
+                logger.exception(e)
+
+            self._writeActionMethods(f, isAsync=True)
+
+        logger.info("Finished generating custom async application driver.")
         self.stepComplete.emit()
 
+    def _writeActionMethods(self, f, isAsync: bool = False) -> None:
+        """
+        Writes the methods generated from the API model's actions and from the visibility behaviors' trigger actions.
+
+        :param f: The application file to write the methods to
+        :type f: file
+        :param isAsync: If True, the methods are written as coroutines for the async application.
+        :type isAsync: bool
+        :return: None
+        """
+        aps, cas = self._apim.getActionsByType()
+        vbs = self._tguim.getVisibilityBehaviors()
+
+        logger.debug("Writing methods generated from actions that are used in action pipelines.")
+        alreadyWritten = []
+        for action in cas:
+            alreadyWritten.append(action.getMethodName())
+            f.write(action.getMethod(isAsync))
+
+        logger.debug("Writing methods generated from actions that are used by visibility behaviors.")
+        for id in vbs:
+            vb = vbs[id]
+            name = vb.methodName
+            triggerAction = vb.getTriggerAction()
+            if name not in alreadyWritten and triggerAction is not None:
+                f.write(triggerAction.getMethod(isAsync))
+
+        logger.debug("Writing methods generated from action pipelines.")
+        for ap in aps:
+            f.write(ap.getMethod(isAsync))
+
+    def _getRequiredComponentIDs(self) -> list:
+        """
+        Gets the IDs of all components that the generated API interacts with: the targets of the component actions
+        used in action pipelines, and the targets of the visibility behaviors' trigger actions.
+
+        :return: The IDs of the required components, without duplicates.
+        :rtype: list[int]
+        """
+        compIDs = []
+        aps, cas = self._apim.getActionsByType()
+        for action in cas:
+            compIDs.append(action.getTargetComponent().getId())
+
+        # We also want the visibilitybehaviors' triggeractions' components' IDs
+        for vb in self._tguim.getVisibilityBehaviors().values():
+            triggerAction = vb.getTriggerAction()
+            if triggerAction is not None:
+                compIDs.append(triggerAction.getTargetComponent().getId())
+
+        return list(dict.fromkeys(compIDs))
+
+    def _warnUnreachableComponents(self, compIDs: list) -> None:
+        """
+        Logs a warning for each required component that the generated API won't be able to show on its own.
+
+        The first window that was observed and windows that no visibility behavior shows are assumed to open with the
+        application (see TargetGuiModel.getStartWindows). A component is reachable if its window can be shown from one
+        of those windows by performing visibility behaviors. Otherwise, the API has to ask the user to show it.
+
+        :param compIDs: The IDs of the components that the generated API interacts with.
+        :type compIDs: list[int]
+        :return: None
+        """
+        startWindows = self._tguim.getStartWindows()
+        reachable = set(window.getId() for window in self._tguim.getReachableWindows(startWindows))
+
+        for id in compIDs:
+            comp = self._tguim.getComponent(id)
+            window = self._tguim.getWindow(comp)
+            if window.getId() not in reachable:
+                logger.warning(f"Component \"{comp.getName()}\" is in window \"{window.getName()}\", which can't be "
+                               f"shown by performing visibility behaviors. The API will ask the user to show it.")
+
     def copyNecessaryFiles(self) -> None:
         """
         Adds all necessary files for compiler to work into created directory
@@ -249,7 +316,10 @@ class Compiler(QObject):
     
     def saveTGUIM(self):
         """
-        Saves the tguim in the API folder. Saves project as well.
+        Saves the tguim in the API folder.
+
+        Only the parts of the tguim that the API needs are saved, and token images are left out. The project itself is
+        saved by the ApiCompilerDialog before compilation starts, because projects can only be saved on the main thread.
 
         :return: None
         """
@@ -258,9 +328,9 @@ class Compiler(QObject):
         self.stepStarted.emit(msg)
         logger.info(msg)
 
-        self.statem._project.save()
-        with open(os.path.join(self._srcFolder, "tguim.json"), "w+") as f:
-            f.write(json.dumps(self._tguim.asDict()))
+        requiredIDs = self._getRequiredComponentIDs()
+        self._warnUnreachableComponents(requiredIDs)
+        jsonstream.save(self._tguim.asRuntimeDict(requiredIDs), os.path.join(self._srcFolder, "tguim.json"))
 
         self.stepComplete.emit()
 
@@ -296,6 +366,8 @@ class Compiler(QObject):
             targetAppName = self.statem._project.getExecutableFile().split('/')[-1].split('.')[0]  # '/app.exe' -> 'app'
             targetAppName = targetAppName[0].upper() + targetAppName[1:]  # 'app' -> 'App'
             initStr = initTempFile.read().format(targetApplicationName=targetAppName)
+            if self._compProf.asyncApi:
+                initStr += "\nfrom .asyncapplication import AsyncApplication as Async{}".format(targetAppName)
 
         with open(os.path.join(self._srcFolder, '__init__.py'), 'w') as initFile:
             initFile.write(initStr)
@@ -394,6 +466,8 @@ class Compiler(QObject):
 
         self.generateInitFile()  # We want this regardless of installing the api or not
         self.generateCustomApp()
+        if self._compProf.asyncApi:
+            self.generateAsyncApp()
 
         if self._compProf.installApi:
             self.installAPI()
@@ -28,6 +28,7 @@ import os
 # List of files that will be processed during the API compilation process. This does not include templated files.
 compilation_copy_files = [
     ("tguiil.componentfinder",          os.path.join("tguiil", "componentfinder.py")),
+    ("tguiil.waiting",                  os.path.join("tguiil", "waiting.py")),
     ("tguiil.application",              os.path.join("tguiil", "application.py")),
     ("tguiil.tokens",                   os.path.join("tguiil", "tokens.py")),
     ("tguiil.supertokens",              os.path.join("tguiil", "supertokens.py")),
@@ -36,11 +37,15 @@ compilation_copy_files = [
     ("data.tguim.visibilitybehavior",   os.path.join("data", "tguim", "visibilitybehavior.py")),
     ("data.tguim.condition",            os.path.join("data", "tguim", "condition.py")),
     ("data.tguim.targetguimodel",       os.path.join("data", "tguim", "targetguimodel.py")),
+    ("data.tguim.routetable",           os.path.join("data", "tguim", "routetable.py")),
     ("data.properties",                 os.path.join("data", "properties.py")),
     ("data.property",                   os.path.join("data", "property.py")),
     ("data.entity",                     os.path.join("data", "entity.py")),
     ("libs.env",                        os.path.join("libs", "env.py")),
-    ("baseapplication",                 os.path.join("tools", "api_compiler", "baseapplication.py"))
+    ("tracer",                          os.path.join("tools", "api_compiler", "tracer.py")),
+    ("baseapplication",                 os.path.join("tools", "api_compiler", "baseapplication.py")),
+    ("asyncbaseapplication",            os.path.join("tools", "api_compiler", "asyncbaseapplication.py")),
+    ("apppool",                         os.path.join("tools", "api_compiler", "apppool.py"))
 ]
 
 # List of other files that are necessary for compilation, but will NOT be directly copied during the compilation process.
@@ -53,6 +58,7 @@ additional_files_for_compilation = [
     (f"{os.path.abspath('./src/tools/api_compiler/setup-template.txt')}", "tools/api_compiler/setup-template.txt"),
     (f"{os.path.abspath('./src/tools/api_compiler/__init__template.txt')}", "tools/api_compiler/__init__template.txt"),
     (f"{os.path.abspath('./src/tools/api_compiler/application-template.py')}", "tools/api_compiler/application-template.py"),
+    (f"{os.path.abspath('./src/tools/api_compiler/asyncapplication-template.py')}", "tools/api_compiler/asyncapplication-template.py"),
     (f"{os.path.abspath('./src/tools/api_compiler/automate-template.txt')}", "tools/api_compiler/automate-template.txt"),
     (f"{os.path.abspath('./src/tools/api_compiler/run-script-template.bat')}", "tools/api_compiler/run-script-template.bat"),
     (f"{os.path.abspath('./src/tools/api_compiler/api_requirements.txt')}", "tools/api_compiler/api_requirements.txt"),
@@ -0,0 +1,224 @@
+"""
+..
+    /------------------------------------------------------------------------------\
+    |                 -- FACADE TECHNOLOGIES INC.  CONFIDENTIAL --                 |
+    |------------------------------------------------------------------------------|
+    |                                                                              |
+    |    Copyright [2019] Facade Technologies Inc.                                 |
+    |    All Rights Reserved.                                                      |
+    |                                                                              |
+    | NOTICE:  All information contained herein is, and remains the property of    |
+    | Facade Technologies Inc. and its suppliers if any.  The intellectual and     |
+    | and technical concepts contained herein are proprietary to Facade            |
+    | Technologies Inc. and its suppliers and may be covered by U.S. and Foreign   |
+    | Patents, patents in process, and are protected by trade secret or copyright  |
+    | law.  Dissemination of this information or reproduction of this material is  |
+    | strictly forbidden unless prior written permission is obtained from Facade   |
+    | Technologies Inc.                                                            |
+    |                                                                              |
+    \------------------------------------------------------------------------------/
+
+    This document contains the Tracer class, which records the time spent in the parts of a generated API's calls.
+"""
+
+import json
+import os
+import threading
+import time
+
+
+class _NullSpan:
+    """
+    The span used when tracing is disabled. Entering and exiting it does nothing.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """
+    A timed part of an API call. Spans opened while another span is open on the same thread are its children.
+    """
+
+    def __init__(self, tracer: 'Tracer', name: str, category: str, compID: int = None, args: dict = None):
+        self.name = name
+        self.category = category
+        self.compID = compID
+        self.args = args or {}
+        self.thread = threading.get_ident()
+        self.start = None
+        self.end = None
+        self.children = []
+        self._tracer = tracer
+
+    def getDuration(self) -> float:
+        """
+        Gets the span's duration in seconds.
+
+        :return: the duration, or 0 if the span hasn't ended.
+        :rtype: float
+        """
+        if self.end is None:
+            return 0
+        return self.end - self.start
+
+    def __enter__(self) -> 'Span':
+        stack = self._tracer._getStack()
+        if stack:
+            stack[-1].children.append(self)
+        else:
+            self._tracer._roots.append(self)
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, excType, exc, tb):
+        self.end = time.perf_counter()
+        if excType is not None:
+            self.args["error"] = excType.__name__
+        self._tracer._getStack().pop()
+        return False
+
+
+class Tracer:
+    """
+    Records a tree of spans for each traced call. Tracing is disabled by default; while disabled, span() returns a
+    shared do-nothing context manager so instrumented code pays only for a method call.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._roots = []
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+
+    def _getStack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def span(self, name: str, category: str, compID: int = None, **args):
+        """
+        Creates a span to be used in a with statement.
+
+        :param name: What is being timed
+        :type name: str
+        :param category: The kind of span ("pipeline", "action", "find", "forceShow", "visibilityBehavior", "wait")
+        :type category: str
+        :param compID: The ID of the component the span is about, if any.
+        :type compID: int
+        :return: the span, or a null span if tracing is disabled.
+        :rtype: Span
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, category, compID, args)
+
+    def clear(self):
+        """
+        Discards all recorded spans.
+        """
+        self._roots = []
+
+    def getSpans(self) -> list:
+        """
+        Gets every recorded span, parents before their children.
+
+        :return: all spans
+        :rtype: list[Span]
+        """
+        spans = []
+        work = list(reversed(self._roots))
+        while work:
+            span = work.pop()
+            spans.append(span)
+            work.extend(reversed(span.children))
+        return spans
+
+    def asChromeTrace(self) -> dict:
+        """
+        Gets the recorded spans as Chrome trace events, which can be opened in chrome://tracing or Perfetto.
+
+        :return: the trace
+        :rtype: dict
+        """
+        events = []
+        pid = os.getpid()
+        for span in self.getSpans():
+            if span.end is None:
+                continue
+            args = dict(span.args)
+            if span.compID is not None:
+                args["compID"] = span.compID
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start - self._origin) * 1e6,
+                "dur": span.getDuration() * 1e6,
+                "pid": pid,
+                "tid": span.thread,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def exportChromeTrace(self, path: str):
+        """
+        Writes the recorded spans to a Chrome trace-event JSON file.
+
+        :param path: The file to write to
+        :type path: str
+        """
+        with open(path, "w") as f:
+            json.dump(self.asChromeTrace(), f)
+
+    @staticmethod
+    def _percentile(values: list, q: float) -> float:
+        """
+        Nearest-rank percentile of sorted values.
+        """
+        index = max(0, int(-(-q * len(values) // 100)) - 1)
+        return values[min(index, len(values) - 1)]
+
+    def getSummary(self) -> list:
+        """
+        Gets latency statistics for each component ID and span category.
+
+        :return: rows of (compID, category, count, p50 in ms, p95 in ms, total in ms), slowest total first.
+        :rtype: list[tuple]
+        """
+        durations = {}
+        for span in self.getSpans():
+            if span.compID is None or span.end is None:
+                continue
+            durations.setdefault((span.compID, span.category), []).append(span.getDuration() * 1000)
+
+        rows = []
+        for (compID, category), values in durations.items():
+            values.sort()
+            rows.append((compID, category, len(values), Tracer._percentile(values, 50),
+                         Tracer._percentile(values, 95), sum(values)))
+        rows.sort(key=lambda row: row[5], reverse=True)
+        return rows
+
+    def formatSummary(self) -> str:
+        """
+        Gets the latency statistics as a table.
+
+        :return: the table
+        :rtype: str
+        """
+        lines = ["{:>8}  {:<20}{:>7}{:>11}{:>11}{:>12}".format("compID", "category", "count", "p50 (ms)",
+                                                               "p95 (ms)", "total (ms)")]
+        for compID, category, count, p50, p95, total in self.getSummary():
+            lines.append("{:>8}  {:<20}{:>7}{:>11.1f}{:>11.1f}{:>12.1f}".format(compID, category, count, p50, p95,
+                                                                               total))
+        return "\n".join(lines)
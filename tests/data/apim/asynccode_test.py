@@ -0,0 +1,75 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath("./src/"))
+sys.path.insert(0, os.path.abspath("./src/gui/rc/"))
+
+import ast
+import asyncio
+import unittest
+import libs.env as env
+env.updateContext("Facile")
+
+from data.apim.actionpipeline import ActionPipeline
+from data.apim.actionspecification import ActionSpecification
+from data.apim.actionwrapper import ActionWrapper
+from data.apim.componentaction import ComponentAction
+from data.apim.port import Port
+from data.tguim.component import Component
+from data.tguim.targetguimodel import TargetGuiModel
+
+
+class FakeApplication:
+	def __init__(self):
+		self.calls = []
+
+	def __getattr__(self, name):
+		return lambda **kwargs: self.calls.append((name, kwargs))
+
+
+class TestAsyncMethodCode(unittest.TestCase):
+
+	def setUp(self):
+		tguim = TargetGuiModel()
+		spec = ActionSpecification.fromFile("database/component_actions/write.action")
+		self.write = ComponentAction(Component(tguim), spec)
+
+		self.pipeline = ActionPipeline()
+		self.pipeline.setName("enterName")
+		self.pipeline.setAnnotation("Enters a name.")
+		name = Port()
+		name.setName("name")
+		name.setDataType(str)
+		name.setAnnotation("The name to enter.")
+		name.setOptional(False)
+		self.pipeline.addInputPort(name)
+		wrapper = ActionWrapper(self.write, self.pipeline)
+		self.pipeline.connect(name, wrapper.getInputPorts()[0])
+
+		self.code = "class AsyncApplication:\n" + self.pipeline.getMethod(isAsync=True) + \
+		            self.write.getMethod(isAsync=True)
+
+	def test_generated_code_parses(self):
+		methods = {node.name: node for node in ast.walk(ast.parse(self.code)) if isinstance(node, ast.AsyncFunctionDef)}
+		self.assertEqual(set(methods), {"enterName", self.write.getMethodName()})
+		for method in methods.values():
+			self.assertTrue(any(isinstance(node, ast.Await) for node in ast.walk(method)))
+		self.assertIn("await self._run(self._app." + self.write.getMethodName() + ", value=value)", self.code)
+		self.assertIn("await self." + self.write.getMethodName() + "(str(name))", self.code)
+
+	def test_generated_code_runs(self):
+		namespace = {"asyncio": asyncio, "ActionException": Exception}
+		exec(self.code, namespace)
+
+		async def run(func, *args, **kwargs):
+			return func(*args, **kwargs)
+
+		app = namespace["AsyncApplication"]()
+		app._app = FakeApplication()
+		app._run = run
+		asyncio.run(app.enterName("Ada"))
+		self.assertEqual(app._app.calls, [(self.write.getMethodName(), {"value": "Ada"})])
+
+
+if __name__ == '__main__':
+	unittest.main()
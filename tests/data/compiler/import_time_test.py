@@ -0,0 +1,55 @@
+import sys
+import os
+
+import unittest
+import subprocess
+import json
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "src"))
+
+# Set this to the folder containing a compiled API package (the one with setup.py) to also time the generated API.
+GENERATED_API_DIR = os.environ.get("FACILE_GENERATED_API_DIR", "")
+GENERATED_API_NAME = os.environ.get("FACILE_GENERATED_API_NAME", "")
+
+HEAVY_MODULES = ["sklearn", "skimage", "nltk", "PIL", "numpy", "pyautogui", "pywinauto"]
+
+COLD_IMPORT_SCRIPT = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy} if m in sys.modules]}}))
+"""
+
+
+def coldImport(module: str, cwd: str) -> dict:
+	"""
+	Imports a module in a fresh interpreter and reports how long it took and which heavy modules were loaded.
+	"""
+	script = COLD_IMPORT_SCRIPT.format(module=module, heavy=HEAVY_MODULES)
+	out = subprocess.check_output([sys.executable, "-c", script], cwd=cwd)
+	return json.loads(out.decode().strip().splitlines()[-1])
+
+
+class TestImportTime(unittest.TestCase):
+	
+	IMPORT_BUDGET = 2.0  # seconds
+	
+	def test_TokensImportIsLight(self):
+		"""
+		The API runtime imports the tokens module, which must not pull in its heavy dependencies until a comparison
+		needs them.
+		"""
+		result = coldImport("tguiil.tokens", SRC_DIR)
+		self.assertEqual(result["loaded"], [])
+		self.assertLess(result["seconds"], TestImportTime.IMPORT_BUDGET)
+	
+	@unittest.skipUnless(GENERATED_API_DIR and GENERATED_API_NAME, "No generated API given")
+	def test_GeneratedAPIImportTime(self):
+		result = coldImport(GENERATED_API_NAME, GENERATED_API_DIR)
+		self.assertEqual(result["loaded"], [])
+		self.assertLess(result["seconds"], TestImportTime.IMPORT_BUDGET)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,132 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath("./src/"))
+
+import tempfile
+import unittest
+from data.imagestore import ImageStore
+
+
+class FakeImage:
+	"""
+	Has the parts of PIL.Image that the store uses. "Encodes" to its raw pixels.
+	"""
+	
+	def __init__(self, pixels: bytes, size=(2, 2), mode="RGB"):
+		self.pixels = pixels
+		self.size = size
+		self.mode = mode
+		self.saved = 0
+	
+	def tobytes(self):
+		return self.pixels
+	
+	def save(self, f, format):
+		self.saved += 1
+		f.write(b"PNG" + self.pixels)
+
+
+class TestImageStore(unittest.TestCase):
+	
+	def setUp(self):
+		self.path = os.path.join(tempfile.mkdtemp(), "project.fcli")
+	
+	def test_Deduplicates(self):
+		store = ImageStore(self.path)
+		a = FakeImage(b"\x00" * 12)
+		b = FakeImage(b"\x00" * 12)
+		c = FakeImage(b"\x00" * 12, size=(4, 1))
+		
+		keyA = store.put(a)
+		self.assertEqual(store.put(b), keyA)
+		self.assertNotEqual(store.put(c), keyA)
+		self.assertEqual(b.saved, 0)
+		self.assertEqual(len(store), 2)
+		self.assertEqual(store.put(a, keyA), keyA)
+		self.assertEqual(a.saved, 1)
+	
+	def test_Reopen(self):
+		store = ImageStore(self.path)
+		keys = [store.put(FakeImage(bytes([i]) * 12)) for i in range(5)]
+		
+		reopened = ImageStore(self.path)
+		self.assertEqual(reopened.keys(), keys)
+		self.assertEqual(reopened.getBytes(keys[3]), b"PNG" + bytes([3]) * 12)
+		self.assertIsNone(reopened.getBytes("0" * 64))
+	
+	def test_PartialRecordIsIgnored(self):
+		store = ImageStore(self.path)
+		key = store.put(FakeImage(b"\x01" * 12))
+		with open(self.path, "ab") as f:
+			f.write(b"\x02" * 40)  # A record header without its data
+		
+		reopened = ImageStore(self.path)
+		self.assertEqual(reopened.keys(), [key])
+		key2 = reopened.put(FakeImage(b"\x03" * 12))
+		
+		self.assertEqual(ImageStore(self.path).keys(), [key, key2])
+		self.assertEqual(ImageStore(self.path).getBytes(key2), b"PNG" + b"\x03" * 12)
+	
+	def test_NotAStore(self):
+		with open(self.path, "wb") as f:
+			f.write(b"something else")
+		self.assertRaises(IOError, len, ImageStore(self.path))
+
+
+class TestImageCache(unittest.TestCase):
+	
+	class DecodedImage:
+		def __init__(self, data):
+			self.data = data
+			self.size = (10, 10)
+		
+		def getbands(self):
+			return ("R", "G", "B")  # 300 bytes per image
+	
+	def setUp(self):
+		self.decoded = []
+		
+		def decode(data):
+			self.decoded.append(data)
+			return TestImageCache.DecodedImage(data)
+		
+		self.path = os.path.join(tempfile.mkdtemp(), "project.fcli")
+		self.store = ImageStore(self.path, maxCacheBytes=700)
+		self.store._decode = decode
+		self.keys = [self.store.put(FakeImage(bytes([i]) * 12)) for i in range(4)]
+	
+	def test_LazyHandlesDecodeOnFirstAccess(self):
+		handles = [self.store.getLazy(key) for key in self.keys]
+		self.assertEqual(self.decoded, [])
+		
+		image = handles[1].resolve()
+		self.assertEqual(image.data, b"PNG" + bytes([1]) * 12)
+		self.assertIs(handles[1].resolve(), image)
+		self.assertEqual(len(self.decoded), 1)
+	
+	def test_LeastRecentlyUsedIsEvicted(self):
+		a, b, c, d = self.keys
+		self.store.get(a)
+		self.store.get(b)
+		self.store.get(a)
+		self.store.get(c)  # Over the cap: b is the least recently used
+		self.assertEqual(self.store.getCacheBytes(), 600)
+		
+		self.store.get(a)
+		self.assertEqual(len(self.decoded), 3)
+		self.store.get(b)
+		self.assertEqual(len(self.decoded), 4)
+		
+		self.store.setMaxCacheBytes(300)
+		self.assertEqual(self.store.getCacheBytes(), 300)
+	
+	def test_AppendWhileMapped(self):
+		self.store.get(self.keys[0])
+		key = self.store.put(FakeImage(b"\x09" * 12))
+		self.assertEqual(self.store.get(key).data, b"PNG" + b"\x09" * 12)
+		self.store.close()
+		self.assertEqual(self.store.getCacheBytes(), 0)
+
+
+if __name__ == "__main__":
+	unittest.main()
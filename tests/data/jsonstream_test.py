@@ -0,0 +1,91 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath("./src/"))
+
+import io
+import json
+import tempfile
+import unittest
+from data import jsonstream
+from data.jsonstream import LazyObject, LazyArray
+
+
+class TestJsonStream(unittest.TestCase):
+
+	def test_MatchesJsonDumps(self):
+		values = [{"a": [1, 2.5, {"b": None, 3: True}], "c": {}, "d": [], "e": "xé\n"}, [], {}, 5, "s",
+				  [[1], [{}], ()]]
+		for value in values:
+			for indent in (None, 2, 4):
+				f = io.StringIO()
+				jsonstream.dump(value, f, indent)
+				if indent is None:
+					expected = json.dumps(value, separators=(',', ':'))
+				else:
+					expected = json.dumps(value, indent=indent)
+				self.assertEqual(f.getvalue(), expected)
+
+	def test_LazyContainers(self):
+		created = []
+
+		def components():
+			for i in range(3):
+				created.append(i)
+				yield i, {"children": LazyArray(range(i))}
+
+		f = io.StringIO()
+		jsonstream.dump({"components": LazyObject(components())}, f)
+		self.assertEqual(json.loads(f.getvalue()),
+						 {"components": {"0": {"children": []}, "1": {"children": [0]}, "2": {"children": [0, 1]}}})
+		self.assertEqual(created, [0, 1, 2])
+
+	def test_AtomicReplace(self):
+		directory = tempfile.mkdtemp()
+		path = os.path.join(directory, "project.fcl")
+		jsonstream.save({"version": 1}, path)
+
+		def failing():
+			yield "a", 1
+			raise RuntimeError("interrupted")
+
+		with self.assertRaises(RuntimeError):
+			jsonstream.save(LazyObject(failing()), path)
+
+		with open(path) as f:
+			self.assertEqual(json.load(f), {"version": 1})
+		self.assertEqual(os.listdir(directory), ["project.fcl"])
+
+	def test_SaveIndexed(self):
+		path = os.path.join(tempfile.mkdtemp(), "project.fcl")
+		components = LazyObject(iter([(1, {"title": "é"}), (2, {"title": "b"})]))
+		project = {"Project Information": {"Name": "p"}, "Data Structures": {"Target GUI Model": components,
+																			   "API Model": [1, 2]}}
+		for indent in (None, 4):
+			index = jsonstream.saveIndexed(project, path, indent)
+			project["Data Structures"]["Target GUI Model"] = {"1": {"title": "é"}, "2": {"title": "b"}}
+			
+			with open(path, "rb") as f:
+				contents = f.read()
+			self.assertEqual(index["size"], len(contents))
+			self.assertEqual(json.loads(contents.decode("utf-8")), project)
+			for path_, value in [("Project Information", {"Name": "p"}), ("Data Structures/API Model", [1, 2]),
+								 ("Data Structures/Target GUI Model", project["Data Structures"]["Target GUI Model"])]:
+				self.assertEqual(jsonstream.loadSection(path, *index["sections"][path_]), value)
+
+	
+	def test_LoadChunk(self):
+		path = os.path.join(tempfile.mkdtemp(), "project.fcl")
+		expected = {str(i): {"title": "é" * i} for i in range(5)}
+		for indent in (None, 2):
+			components = LazyObject(iter([(i, {"title": "é" * i}) for i in range(5)]), chunkSize=2)
+			index = jsonstream.saveIndexed({"Target GUI Model": {"components": components}}, path, indent, depth=3)
+			chunks = index["chunks"]["Target GUI Model/components"]
+			self.assertEqual(len(chunks), 3)
+			loaded = {}
+			for offset, length in chunks:
+				loaded.update(jsonstream.loadChunk(path, offset, length))
+			self.assertEqual(loaded, expected)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,77 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath("./src/"))
+
+import tempfile
+import unittest
+import zipfile
+from data import jsonstream
+from data.jsonstream import LazyObject
+from data.projectcontainer import ProjectContainer
+from data.projectmanifest import ProjectManifest
+
+
+class TestProjectContainer(unittest.TestCase):
+	
+	def setUp(self):
+		self.path = os.path.join(tempfile.mkdtemp(), "project.fcl")
+		self.info = {"Project Information": {"Name": "é", "Model Entities": 5},
+					 "Application Information": {"Backend": "uia"},
+					 "Settings": {"Close App on Exit": False}}
+		self.components = {str(i): {"id": i, "children": [], "properties": {"a": {"b": i}}} for i in range(5)}
+	
+	def makeProject(self) -> dict:
+		project = dict(self.info)
+		components = LazyObject(iter(list(self.components.items())), chunkSize=2)
+		project["Data Structures"] = {"Target GUI Model": {"root": {"id": 0, "children": {"a": 1}},
+														   "components": components, "behaviors": {}},
+									  "API Model": {"action pipelines": []}}
+		return project
+	
+	def test_SaveAndLoad(self):
+		for compression in ProjectContainer.COMPRESSIONS:
+			index = ProjectContainer.save(self.makeProject(), self.path, compression)
+			self.assertTrue(ProjectContainer.isContainer(self.path))
+			self.assertEqual(index["size"], os.path.getsize(self.path))
+			self.assertEqual(len(index["chunks"]["Data Structures/Target GUI Model/components"]), 3)
+			
+			with ProjectContainer(self.path) as container:
+				self.assertEqual(container.getFormatVersion(), ProjectContainer.VERSION)
+				self.assertEqual(container.getCompression(), compression)
+				project = container.load()
+				self.assertEqual(container.readSection("Data Structures/Target GUI Model/root"),
+								 {"id": 0, "children": {"a": 1}})
+				self.assertEqual(container.readSection("Data Structures/Target GUI Model/components"),
+								 self.components)
+			
+			expected = self.makeProject()
+			expected["Data Structures"]["Target GUI Model"]["components"] = self.components
+			self.assertEqual(project, expected)
+	
+	def test_PlainJSONIsNotAContainer(self):
+		jsonstream.save(self.info, self.path)
+		self.assertFalse(ProjectContainer.isContainer(self.path))
+	
+	def test_NewerFormatIsRejected(self):
+		with zipfile.ZipFile(self.path, "w") as zf:
+			zf.writestr(ProjectContainer.FORMAT_MEMBER, '{"Format Version": %d}' % (ProjectContainer.VERSION + 1))
+		with self.assertRaises(ValueError):
+			with ProjectContainer(self.path):
+				pass
+	
+	def test_ManifestReadsMembers(self):
+		index = ProjectContainer.save(self.makeProject(), self.path)
+		ProjectManifest.create(self.path, self.info, {"Model Entities": 5}, index).write(self.path)
+		
+		manifest = ProjectManifest.read(self.path)
+		self.assertTrue(manifest.isContainer())
+		self.assertTrue(manifest.verify(self.path))
+		self.assertEqual(manifest.readSection(self.path, "Data Structures/API Model"), {"action pipelines": []})
+		components = {}
+		for chunk in manifest.getChunks("Data Structures/Target GUI Model/components"):
+			components.update(ProjectManifest.readChunk(self.path, chunk))
+		self.assertEqual(components, self.components)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,109 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath("./src/"))
+
+import tempfile
+import unittest
+from data.projectjournal import ChangeTracker, ProjectJournal
+
+
+class FakeEntity:
+	
+	def __init__(self, id: int):
+		self._id = id
+	
+	def getId(self):
+		return self._id
+
+
+def makeProjectDict():
+	return {"Project Information": {"Name": "proj"},
+			"Settings": {"Close App on Exit": False},
+			"Data Structures": {
+				"Target GUI Model": {"root": {"id": 1}, "components": {"2": {"id": 2, "v": 0}, "3": {"id": 3}},
+									 "behaviors": {"4": {"id": 4}}, "Entity Count": 4, "SuperToken Count": 2},
+				"API Model": {"action pipelines": []}}}
+
+
+class TestChangeTracker(unittest.TestCase):
+	
+	def test_TakeChanges(self):
+		tracker = ChangeTracker()
+		self.assertFalse(tracker.hasChanges())
+		tracker.entityChanged(FakeEntity(2))
+		tracker.entityChanged(FakeEntity(3))
+		tracker.entityRemoved(FakeEntity(3))
+		tracker.superTokenChanged("st")
+		self.assertTrue(tracker.hasChanges())
+		
+		changes = tracker.takeChanges()
+		self.assertEqual(changes, ({2}, {3}, {"st"}))
+		self.assertFalse(tracker.hasChanges())
+		
+		tracker.entityChanged(FakeEntity(5))
+		tracker.restoreChanges(changes)
+		self.assertEqual(tracker.takeChanges(), ({2, 5}, {3}, {"st"}))
+
+
+class TestProjectJournal(unittest.TestCase):
+	
+	def setUp(self):
+		self.path = os.path.join(tempfile.mkdtemp(), "proj.fclj")
+	
+	def test_AppendAndReplay(self):
+		journal = ProjectJournal(self.path)
+		self.assertRaises(RuntimeError, journal.append, {})
+		journal.reset("a")
+		journal.append({"components": {2: {"id": 2, "v": 1}}, "Entity Count": 6})
+		journal.append({"components": {5: {"id": 5}}, "behaviors": {6: {"id": 6}}, "removed behaviors": [4],
+						"removed components": [3], "sections": {"Settings": {"Close App on Exit": True}}, "API Model": {"action pipelines": [1]}})
+		
+		reopened = ProjectJournal(self.path)
+		self.assertEqual(reopened.getSnapshotID(), "a")
+		self.assertEqual(reopened.getNumRecords(), 2)
+		self.assertEqual(list(reopened.records("b")), [])
+		
+		projectDict = makeProjectDict()
+		for record in reopened.records("a"):
+			ProjectJournal.apply(projectDict, record)
+		tguim = projectDict["Data Structures"]["Target GUI Model"]
+		self.assertEqual(tguim["components"], {"2": {"id": 2, "v": 1}, "5": {"id": 5}})
+		self.assertEqual(tguim["behaviors"], {"6": {"id": 6}})
+		self.assertEqual(tguim["Entity Count"], 6)
+		self.assertEqual(tguim["SuperToken Count"], 2)
+		self.assertTrue(projectDict["Settings"]["Close App on Exit"])
+		self.assertEqual(projectDict["Data Structures"]["API Model"], {"action pipelines": [1]})
+	
+	def test_PartialRecordIsDropped(self):
+		journal = ProjectJournal(self.path)
+		journal.reset("a")
+		journal.append({"Entity Count": 1})
+		with open(self.path, "a") as f:
+			f.write('{"Entity Count": ')
+		
+		reopened = ProjectJournal(self.path)
+		self.assertEqual(reopened.getNumRecords(), 1)
+		reopened.append({"Entity Count": 3})
+		self.assertEqual(list(ProjectJournal(self.path).records("a")), [{"Entity Count": 1}, {"Entity Count": 3}])
+	
+	def test_ResetAndCompaction(self):
+		journal = ProjectJournal(self.path)
+		journal.reset("a")
+		self.assertFalse(journal.needsCompaction(10 ** 6))
+		for i in range(ProjectJournal.MAX_RECORDS):
+			journal.append({"Entity Count": i})
+		self.assertTrue(journal.needsCompaction(10 ** 9))
+		
+		journal.reset("b")
+		self.assertEqual(journal.getNumRecords(), 0)
+		self.assertEqual(list(journal.records("a")), [])
+		journal.append({"components": {1: {"data": "x" * 100}}})
+		self.assertTrue(journal.needsCompaction(100))
+		
+		journal.remove()
+		self.assertFalse(os.path.exists(self.path))
+		self.assertIsNone(ProjectJournal(self.path).getSnapshotID())
+
+
+if __name__ == '__main__':
+	unittest.main()
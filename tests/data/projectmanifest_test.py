@@ -0,0 +1,55 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath("./src/"))
+
+import tempfile
+import time
+import unittest
+from data import jsonstream
+from data.projectmanifest import ProjectManifest
+
+
+class TestProjectManifest(unittest.TestCase):
+	
+	def setUp(self):
+		self.path = os.path.join(tempfile.mkdtemp(), "project.fcl")
+		self.info = {"Project Information": {"Name": "project", "Model Entities": 3},
+					 "Application Information": {"Backend": "uia"},
+					 "Settings": {"Close App on Exit": False}}
+		project = dict(self.info)
+		project["Data Structures"] = {"Target GUI Model": {"components": {"1": {}, "2": {}}}, "API Model": {"a": 1}}
+		self.index = jsonstream.saveIndexed(project, self.path)
+	
+	def test_ReadSections(self):
+		self.assertIsNone(ProjectManifest.read(self.path))
+		ProjectManifest.create(self.path, self.info, {"Model Entities": 3}, self.index).write(self.path)
+		
+		manifest = ProjectManifest.read(self.path)
+		self.assertEqual(manifest.getCount("Model Entities"), 3)
+		self.assertIsNone(manifest.getCount("Components"))
+		self.assertEqual(manifest.getSection("Project Information")["Name"], "project")
+		self.assertEqual(manifest.readSection(self.path, "Data Structures/API Model"), {"a": 1})
+		self.assertFalse(manifest.hasSection("Data Structures/Target GUI Model/components"))
+		self.assertTrue(manifest.verify(self.path))
+	
+	def test_JournalSaveKeepsSections(self):
+		ProjectManifest.create(self.path, self.info, {"Model Entities": 3}, self.index).write(self.path)
+		previous = ProjectManifest.read(self.path)
+		self.info["Project Information"]["Model Entities"] = 5
+		ProjectManifest.create(self.path, self.info, {"Model Entities": 5}, previous=previous).write(self.path)
+		
+		manifest = ProjectManifest.read(self.path)
+		self.assertEqual(manifest.getCount("Model Entities"), 5)
+		self.assertEqual(manifest.getCounts(), {"Model Entities": 5})
+		self.assertEqual(manifest.readSection(self.path, "Data Structures/API Model"), {"a": 1})
+	
+	def test_StaleManifestIsIgnored(self):
+		ProjectManifest.create(self.path, self.info, {"Model Entities": 3}, self.index).write(self.path)
+		time.sleep(0.01)
+		with open(self.path, "a") as f:
+			f.write(" ")
+		self.assertIsNone(ProjectManifest.read(self.path))
+
+
+if __name__ == '__main__':
+	unittest.main()
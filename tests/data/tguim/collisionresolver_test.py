@@ -0,0 +1,105 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath("./src/"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import unittest
+import libs.env as env
+env.updateContext("Facile")
+
+from data.tguim.collisionresolver import CollisionResolver, MergeReport
+from data.tguim.visibilitybehavior import VisibilityBehavior
+from tguimfixtures import makeComponent, makeModel
+
+
+class FakeAction:
+    def __init__(self, target):
+        self._target = target
+
+    def getTargetComponent(self):
+        return self._target
+
+    def setTargetComponent(self, target):
+        self._target = target
+
+
+class TestCollisionResolver(unittest.TestCase):
+    def setUp(self):
+        # Window 6 is a duplicate of window 1, and its OK button (7) is a duplicate of window 1's (2).
+        self.tguim = makeModel({1: makeComponent(1, None, 0, "Window", "Main", "main"),
+                                2: makeComponent(2, 1, 1, "Button", "OK", "ok"),
+                                3: makeComponent(3, 1, 1, "Button", "Cancel", "cancel"),
+                                4: makeComponent(4, None, 0, "Window", "Save As", "save"),
+                                5: makeComponent(5, 4, 1, "Button", "Save", "save"),
+                                6: makeComponent(6, None, 0, "Window", "Main", "main"),
+                                7: makeComponent(7, 6, 1, "Button", "OK", "ok"),
+                                8: makeComponent(8, 6, 1, "Edit", "Name", "name")})
+        get = self.tguim.getComponent
+        self.open = VisibilityBehavior(self.tguim, get(8), get(4))
+        self.back = VisibilityBehavior(self.tguim, get(5), get(6))
+        self.tguim.addVisibilityBehavior(self.open)
+        self.tguim.addVisibilityBehavior(self.back)
+
+    def ids(self, components):
+        return [component.getId() for component in components]
+
+    def test_merge_duplicates(self):
+        action = FakeAction(self.tguim.getComponent(7))
+        report = self.tguim.resolveComponentCollisions([action])
+
+        self.assertEqual(report.getMergedIDs(), {6: 1, 7: 2})
+        self.assertEqual(report.numActionsRetargeted, 1)
+        main, ok = self.tguim.getComponent(1), self.tguim.getComponent(2)
+        self.assertIsNone(self.tguim.getComponent(6))
+        self.assertIs(action.getTargetComponent(), ok)
+        self.assertEqual(len(main.getSuperToken().getTokens()), 2)
+        self.assertEqual(self.ids(self.tguim.getTopLevelWindows()), [1, 4])
+        self.assertEqual(self.ids(main.getChildren()), [2, 3, 8])
+        self.assertEqual(self.ids(self.tguim.findComponents(window=main)), [1, 2, 3, 8])
+        self.assertEqual(self.tguim.getRoot().getNumDescendants(), 6)
+        self.assertEqual(main.getNumDescendants(), 3)
+
+        name = self.tguim.getComponent(8)
+        self.assertIs(self.open.getSrcComponent(), name)
+        self.assertIs(self.back.getDestComponent(), main)
+        self.assertEqual(main.getDestVisibilityBehaviors(), [self.back])
+        self.assertEqual(self.tguim.getBehaviorsFromWindow(main), [self.open])
+        self.assertEqual(self.ids(self.tguim.getReachableWindows([main])), [1, 4])
+
+    def test_incremental(self):
+        self.tguim.resolveComponentCollisions()
+        report = self.tguim.resolveComponentCollisions()
+        self.assertEqual(len(report), 0)
+        self.assertEqual(report.numComparisons, 0)
+
+    def test_title_word_candidates(self):
+        tguim = makeModel({1: makeComponent(1, None, 0, "Window", "Form", "form"),
+                           2: makeComponent(2, 1, 1, "Edit", "Phone", "field"),
+                           3: makeComponent(3, 1, 1, "Edit", "First Name", "field"),
+                           4: makeComponent(4, 1, 1, "Edit", "Street", "field"),
+                           5: makeComponent(5, 1, 1, "Edit", "Last Name", "field"),
+                           6: makeComponent(6, 1, 1, "Edit", "Email", "field")})
+        get = tguim.getComponent
+        resolver = CollisionResolver(tguim)
+        group = ({}, {})
+        for id in (2, 3, 4):
+            CollisionResolver._addKept(group, get(id))
+
+        # Only the field whose title shares a word is scored.
+        report = MergeReport()
+        match, decision, score = resolver._findMatch(get(5), group, report)
+        self.assertIs(match, get(3))
+        self.assertEqual(report.numComparisons, 1)
+
+        # No title shares a word, so every kept field is scored.
+        report = MergeReport()
+        resolver._findMatch(get(6), group, report)
+        self.assertEqual(report.numComparisons, 3)
+
+        CollisionResolver._removeKept(group, get(3))
+        report = MergeReport()
+        resolver._findMatch(get(5), group, report)
+        self.assertEqual(report.numComparisons, 2)
+
+if __name__ == '__main__':
+    unittest.main()
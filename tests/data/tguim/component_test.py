@@ -27,3 +27,48 @@ class TestComponent(unittest.TestCase):
         # Check that add functions verify input param types.
         self.assertRaises(TypeError, comp_1.addDestVisibilityBehavior, "wrong")
         self.assertRaises(TypeError, comp_1.addSrcVisibilityBehavior, "wrong")
+
+    def test_position_in_siblings(self):
+        app = QApplication.instance() or QApplication([])
+
+        tguim = TargetGuiModel()
+        parent = Component(tguim)
+        children = [Component(tguim) for i in range(5)]
+        parent.addChild(children[0])
+        parent.addChild(children[1])  # to the front
+        parent.addChild(children[2], pos=2)  # to the end
+        parent.addChild(children[3], pos=1)  # in the middle
+        parent.addChild(children[4], pos=-1)
+
+        for pos, child in enumerate(parent.getChildren()):
+            self.assertEqual(child.getPositionInSiblings(), pos)
+            self.assertIs(child.getParent(), parent)
+        self.assertEqual(parent.getPositionInSiblings(), 0)
+        self.assertEqual([pos for comp, pos in children[4].getPathFromRoot()], [3, 0])
+
+    def test_subtree_aggregates(self):
+        app = QApplication.instance() or QApplication([])
+
+        tguim = TargetGuiModel()
+        root = Component(tguim)
+        window = Component(tguim)
+        child = Component(tguim)
+        grandchild = Component(tguim)
+        root.addChild(window)
+        child.addChild(grandchild)
+        window.addChild(child)  # a subtree that was built first
+
+        self.assertEqual(root.getNumDescendants(), 3)
+        self.assertEqual(root.getMaxDepth(), 4)
+        self.assertEqual(window.getMaxDepth(curDepth=2), 4)
+        self.assertFalse(root.hasPicturesInSubtree())
+
+        grandchild.isExtraComponent = True
+        child.isExtraComponent = True
+        self.assertEqual(root.getNumExtraComponents(), 2)
+        child.isExtraComponent = False
+        self.assertEqual(window.getNumExtraComponents(), 1)
+
+        grandchild.pictureAdded()
+        self.assertTrue(root.hasPicturesInSubtree())
+        self.assertFalse(Component(tguim).hasPicturesInSubtree())
@@ -0,0 +1,91 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath("./src/"))
+
+import unittest
+from data.tguim.routetable import RouteTable
+
+
+class FakeComponent:
+    def __init__(self, id, parent=None):
+        self._id = id
+        self._parent = parent
+
+    def getId(self):
+        return self._id
+
+    def getParent(self):
+        return self._parent
+
+
+class FakeBehavior:
+    def __init__(self, id, src, dest):
+        self._id = id
+        self._src = src
+        self._dest = dest
+
+    def getId(self):
+        return self._id
+
+    def getSrcComponent(self):
+        return self._src
+
+    def getDestComponent(self):
+        return self._dest
+
+
+class FakeModel:
+    def __init__(self, windows, vbs):
+        self._windows = {window.getId(): window for window in windows}
+        self._outgoing = {}
+        self._incoming = {}
+        for vb in vbs:
+            self._outgoing.setdefault(self.getWindow(vb.getSrcComponent()).getId(), []).append(vb)
+            self._incoming.setdefault(self.getWindow(vb.getDestComponent()).getId(), []).append(vb)
+
+    def getTopLevelWindows(self):
+        return list(self._windows.values())
+
+    def getComponent(self, id):
+        return self._windows.get(id)
+
+    def getWindow(self, component):
+        while component.getParent().getParent() is not None:
+            component = component.getParent()
+        return component
+
+    def getBehaviorsFromWindow(self, window):
+        return self._outgoing.get(window.getId(), [])
+
+    def getBehaviorsToWindow(self, window):
+        return self._incoming.get(window.getId(), [])
+
+
+class TestRouteTable(unittest.TestCase):
+    def setUp(self):
+        root = FakeComponent(0)
+        self.main, self.settings, self.advanced = FakeComponent(1, root), FakeComponent(2, root), FakeComponent(3, root)
+        settingsBtn = FakeComponent(10, self.main)
+        advancedBtn = FakeComponent(11, self.settings)
+        shortcutBtn = FakeComponent(12, self.main)
+        self.vb1 = FakeBehavior(100, settingsBtn, self.settings)
+        self.vb2 = FakeBehavior(101, advancedBtn, self.advanced)
+        self.vb3 = FakeBehavior(102, shortcutBtn, self.advanced)
+        self.table = RouteTable(FakeModel([self.main, self.settings, self.advanced], [self.vb1, self.vb2, self.vb3]))
+
+    def test_shortest_route(self):
+        self.assertEqual(self.table.getRoute(1, 2), [self.vb1])
+        self.assertEqual(self.table.getRoute(1, 3), [self.vb3])
+        self.assertEqual(self.table.getDistance(2, 3), 1)
+        self.assertIsNone(self.table.getRoute(3, 1))
+
+    def test_alternative_routes(self):
+        routes = self.table.getRoutes({1}, 3, k=3)
+        self.assertEqual(routes, [[self.vb3], [self.vb1, self.vb2]])
+        self.assertEqual(self.table.getRoutes({3}, 3), [[]])
+        self.assertEqual(self.table.getRoutes({2}, 1), [])
+        self.assertEqual(self.table.getRoutes({2, 99}, 3), [[self.vb2]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath("./src/"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import re
+import unittest
+import libs.env as env
+env.updateContext("Facile")
+
+from data.apim.actionspecification import ActionSpecification
+from data.apim.componentaction import ComponentAction
+from data.tguim.targetguimodel import TargetGuiModel
+from data.tguim.visibilitybehavior import VisibilityBehavior
+from tguiil.supertokens import SuperToken
+from tguimfixtures import makeComponent, makeModel
+
+
+class TestTargetGuiModelQueries(unittest.TestCase):
+    def setUp(self):
+        self.tguim = makeModel({1: makeComponent(1, None, 0, "Window", "Main"),
+                                2: makeComponent(2, 1, 1),
+                                3: makeComponent(3, 1, 1, "Edit"),
+                                4: makeComponent(4, None, 0, "Window", "Save As", isDialog=True),
+                                5: makeComponent(5, 4, 1, title="Save")})
+
+    def ids(self, components):
+        return [component.getId() for component in components]
+
+    def test_top_level_windows(self):
+        self.assertEqual(self.ids(self.tguim.getTopLevelWindows()), [1, 4])
+
+    def test_find_components(self):
+        main = self.tguim.getComponent(1)
+        self.assertEqual(self.ids(self.tguim.findComponents(type="Button", window=main)), [2])
+        self.assertEqual(self.ids(self.tguim.findComponents(window=main)), [1, 2, 3])
+        self.assertEqual(self.ids(self.tguim.findComponents(isDialog=True)), [4])
+        self.assertEqual(self.ids(self.tguim.findComponents(title=re.compile("Save"))), [4, 5])
+        self.assertEqual(self.ids(self.tguim.findComponents(autoid="3", depth=1)), [3])
+        self.assertEqual(self.tguim.findComponents(type="Button", depth=0), [])
+        self.assertEqual(len(self.tguim.findComponents()), 5)
+
+    def test_behavior_index(self):
+        main, edit, saveAs, save = (self.tguim.getComponent(id) for id in (1, 3, 4, 5))
+        show = VisibilityBehavior(self.tguim, edit, saveAs)
+        hide = VisibilityBehavior(self.tguim, save, main)
+        back = VisibilityBehavior(self.tguim, save, saveAs)
+        for vb in (hide, show, back):
+            self.tguim.addVisibilityBehavior(vb)
+
+        self.assertEqual([self.tguim.getNthVisibilityBehavior(n) for n in range(3)], [show, hide, back])
+        self.assertEqual(self.tguim.getVisibilityBehaviorPosition(back), 2)
+        self.assertIs(self.tguim.getWindow(save), saveAs)
+        self.assertEqual(self.tguim.getBehaviorsFromWindow(saveAs), [hide, back])
+        self.assertEqual(self.tguim.getBehaviorsToWindow(saveAs), [show, back])
+        self.assertEqual(self.ids(self.tguim.getReachableWindows([main])), [1, 4])
+        self.assertIn(show, edit.getSrcVisibilityBehaviors())
+
+        self.tguim.removeVisibilityBehavior(show)
+        self.assertEqual(self.tguim.getVisibilityBehaviorPosition(back), 1)
+        self.assertIsNone(self.tguim.getVisibilityBehaviorPosition(show))
+        self.assertEqual(self.ids(self.tguim.getReachableWindows([main])), [1])
+        self.assertEqual(edit.getSrcVisibilityBehaviors(), [])
+
+    def test_start_windows(self):
+        main, edit, saveAs, save = (self.tguim.getComponent(id) for id in (1, 3, 4, 5))
+        self.assertEqual(self.ids(self.tguim.getStartWindows()), [1, 4])
+
+        # Main -> Save As -> Main is a cycle, and the main window still opens with the application.
+        self.tguim.addVisibilityBehavior(VisibilityBehavior(self.tguim, edit, saveAs))
+        self.tguim.addVisibilityBehavior(VisibilityBehavior(self.tguim, save, main))
+        self.assertEqual(self.ids(self.tguim.getStartWindows()), [1])
+        self.assertEqual(self.ids(self.tguim.getReachableWindows(self.tguim.getStartWindows())), [1, 4])
+
+    def test_runtime_dict(self):
+        components = {1: makeComponent(1, None, 0, "Window", "Main"),
+                      2: makeComponent(2, 1, 1),
+                      3: makeComponent(3, 1, 1),
+                      4: makeComponent(4, None, 0, "Window", "Save As", isDialog=True),
+                      5: makeComponent(5, 4, 1),
+                      6: makeComponent(6, None, 0, "Window", "About", isDialog=True),
+                      7: makeComponent(7, 6, 1)}
+        tokens = components[2]["superToken"]["tokens"]
+        tokens.append(dict(tokens[0], appTimeStamp=100, identifier=100))  # The same state, seen in another run
+        tokens.append(dict(tokens[0], title="Renamed"))
+        tguim = makeModel(components)
+        vb = VisibilityBehavior(tguim, tguim.getComponent(3), tguim.getComponent(4))
+        vb.setTriggerAction(ComponentAction(tguim.getComponent(3),
+                                            ActionSpecification.fromFile("database/component_actions/click.action")))
+        tguim.addVisibilityBehavior(vb)
+
+        d = tguim.asRuntimeDict([2])
+        self.assertEqual(sorted(d["components"]), [1, 2, 3, 4])
+        self.assertEqual(d["root"]["children"], [1, 4])
+        self.assertEqual(d["components"][4]["children"], [])
+        kept = d["components"][2]["superToken"]["tokens"]
+        self.assertEqual([(token["title"], token["appTimeStamp"]) for token in kept],
+                         [("Component 2", 100), ("Renamed", 2)])
+        for compDict in d["components"].values():
+            for token in compDict["superToken"]["tokens"]:
+                self.assertIsNone(token["pic"])
+
+        runtime = TargetGuiModel.fromDict(d)
+        self.assertEqual(self.ids(runtime.getTopLevelWindows()), [1, 4])
+        self.assertEqual(len(runtime.getVisibilityBehaviors()), 1)
+
+    def test_create_components(self):
+        def makeItems():
+            superTokens = {id: SuperToken.fromDict(makeComponent(id, None, 0)["superToken"]) for id in range(1, 7)}
+            parents = {1: None, 2: 1, 3: 1, 4: None, 5: 4, 6: 2}
+            return [(superTokens[id], superTokens[parent] if parent else None) for id, parent in parents.items()]
+
+        def shape(tguim):
+            titles = lambda component: component.getSuperToken().tokens[0].title
+            return [(titles(component), titles(component.getParent()) if component.depth else None, component.depth,
+                     component.getPositionInSiblings(), component.getNumDescendants(), component.getMaxDepth())
+                    for component in tguim.getComponents().values()]
+
+        single = TargetGuiModel()
+        for superToken, parentToken in makeItems():
+            single.createComponent(superToken, parentToken)
+        bulk = TargetGuiModel()
+        created = bulk.createComponents(makeItems())
+
+        self.assertEqual(shape(bulk), shape(single))
+        self.assertEqual(list(bulk.getComponents().values()), created)
+        self.assertEqual(bulk.getRoot().getNumDescendants(), 6)
+        self.assertEqual(created[0].getProperties().getProperty("Title")[1].getValue(), "Component 1")
+        self.assertEqual(self.ids(bulk.findComponents(window=created[0])), self.ids(created[:3] + created[5:]))
+
+        more = bulk.createComponents([(SuperToken.fromDict(makeComponent(7, None, 0)["superToken"]),
+                                       created[1].getSuperToken())])
+        self.assertEqual(more[0].getParent(), created[1])
+        self.assertEqual(bulk.getRoot().getNumDescendants(), 7)
+        self.assertEqual(created[0].getMaxDepth(), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+"""
+Builders for the small target GUI models used by the tguim tests.
+"""
+
+from data.tguim.targetguimodel import TargetGuiModel
+
+
+def makeComponent(id, parent, depth, type="Button", title=None, autoid=None, isDialog=False):
+    """
+    Makes the dictionary of a component with a single token, as TargetGuiModel.fromDict expects it. The token's
+    timestamp is the component's ID, so tokens of different components never look like the same control.
+    """
+    token = {"type": type, "title": title or "Component %d" % id, "autoid": autoid or str(id), "picHash": None,
+             "pic": None, "rectangle": [0, 0, 80, 20], "parentRect": None, "controlIDs": [type, str(id)], "texts": [],
+             "childrenTexts": [], "isDialog": isDialog, "appTimeStamp": id, "identifier": id, "processID": 1,
+             "parentType": None, "parentTitle": "", "topLevelParentType": None, "topLevelParentTitle": "",
+             "numControls": 0, "isEnabled": True, "isVisible": True, "expandState": None, "shownState": None}
+    return {"id": id, "srcBehaviors": [], "destBehaviors": [], "children": [], "isEC": False, "depth": depth,
+            "timestamp": float(id), "properties": None, "parent": parent,
+            "superToken": {"id": id, "tokens": [token], "ignoreFlag": False, "relativePos": [0, 0, 80, 20]}}
+
+
+def makeModel(components):
+    """
+    Builds a target GUI model from dictionaries made by makeComponent. Each component becomes a child of its parent in
+    the order the dictionaries are given.
+    """
+    for id, component in components.items():
+        if component["parent"] is not None:
+            components[component["parent"]]["children"].append(id)
+    root = {"id": 0, "srcBehaviors": [], "destBehaviors": [], "isEC": False, "depth": -1, "timestamp": 0.0,
+            "properties": None, "parent": None, "superToken": None,
+            "children": [id for id, component in components.items() if component["parent"] is None]}
+    count = max(components) + 1
+    return TargetGuiModel.fromDict({"root": root, "components": components, "behaviors": {}, "Entity Count": count,
+                                    "SuperToken Count": count})
@@ -0,0 +1,89 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath("./src/"))
+
+import time
+import unittest
+from tguiil.waiting import WindowCondition, ControlCondition, Backoff, waitUntil
+
+
+class FakeElementInfo:
+    def __init__(self, controlType, autoId):
+        self.control_type = controlType
+        self.automation_id = autoId
+
+
+class FakeWrapper:
+    def __init__(self, title, controlType="Window", autoId="", visible=True, enabled=True, children=()):
+        self.title = title
+        self.visible = visible
+        self.enabled = enabled
+        self.children = list(children)
+        self.element_info = FakeElementInfo(controlType, autoId)
+        self.traversals = 0
+
+    def window_text(self):
+        return self.title
+
+    def is_visible(self):
+        return self.visible
+
+    def is_enabled(self):
+        return self.enabled
+
+    def is_active(self):
+        return True
+
+    def descendants(self):
+        self.traversals += 1
+        return self.children
+
+
+class TestWaiting(unittest.TestCase):
+
+    def test_CompositeConditionTraversesOnce(self):
+        button = FakeWrapper("Save", "Button", enabled=False)
+        edit = FakeWrapper("", "Edit", autoId="1001")
+        win = FakeWrapper("Save As", children=[button, edit])
+
+        cond = WindowCondition('exists', 'Save As') & ControlCondition('exists', autoId="1001") & \
+               ControlCondition('enabled', 'Save', 'Button')
+        self.assertFalse(waitUntil(cond, lambda: [win], timeout=0))
+        self.assertEqual(win.traversals, 1)
+
+        button.enabled = True
+        self.assertTrue(waitUntil(cond, lambda: [win], timeout=0))
+
+        anyCond = WindowCondition('exists', 'Open') | ControlCondition('enabled', 'Save')
+        self.assertTrue(waitUntil(anyCond, lambda: [win], timeout=0))
+
+    def test_ReturnsAsSoonAsConditionHolds(self):
+        win = FakeWrapper("Main", visible=False)
+        start = time.monotonic()
+
+        def getWindows():
+            if time.monotonic() - start > 0.1:
+                win.visible = True
+            return [win]
+
+        self.assertTrue(waitUntil(WindowCondition('ready'), getWindows, timeout=5))
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_TimesOut(self):
+        start = time.monotonic()
+        self.assertFalse(waitUntil(WindowCondition('exists', 'Missing'), lambda: [], timeout=0.2))
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_Backoff(self):
+        intervals = Backoff(initial=0.1, maximum=0.4, factor=2, jitter=0.5).intervals()
+        values = [next(intervals) for i in range(5)]
+        for value, upper in zip(values, [0.1, 0.2, 0.4, 0.4, 0.4]):
+            self.assertLessEqual(value, upper)
+            self.assertGreaterEqual(value, upper / 2)
+
+    def test_InvalidState(self):
+        self.assertRaises(ValueError, WindowCondition, 'asleep')
+
+
+if __name__ == "__main__":
+    unittest.main()
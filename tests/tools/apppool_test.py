@@ -0,0 +1,82 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath("./src/tools/api_compiler/"))
+
+import threading
+import unittest
+from apppool import ApplicationPool
+
+
+class FakeApplication:
+    """
+    Stands in for a generated Application: start/stop/isRunning with a process that can crash.
+    """
+    started = 0
+    lock = threading.Lock()
+
+    def __init__(self):
+        self.running = False
+
+    def start(self):
+        with FakeApplication.lock:
+            FakeApplication.started += 1
+        self.running = True
+        return self
+
+    def stop(self):
+        self.running = False
+
+    def isRunning(self):
+        return self.running
+
+    def double(self, value):
+        if value == "crash":
+            self.running = False
+            raise RuntimeError("target application crashed")
+        if value == "bad":
+            raise ValueError("bad input")
+        return value * 2
+
+
+class TestApplicationPool(unittest.TestCase):
+
+    def setUp(self):
+        FakeApplication.started = 0
+
+    def test_ResultsInOrder(self):
+        pool = ApplicationPool(FakeApplication, 3)
+        results = pool.run(lambda app, item: app.double(item), range(100))
+        self.assertEqual(results, [i * 2 for i in range(100)])
+        self.assertEqual(sum(stats.itemsDone for stats in pool.getStats()), 100)
+        self.assertEqual(FakeApplication.started, 3)
+        self.assertIn("items/s", pool.formatReport())
+
+    def test_CrashRestartsInstanceAndRetries(self):
+        crashes = {"left": 2}
+
+        def work(app, item):
+            if item == 5 and crashes["left"]:
+                crashes["left"] -= 1
+                return app.double("crash")
+            return app.double(item)
+
+        pool = ApplicationPool(FakeApplication, 2, maxRetries=2)
+        results = pool.run(work, range(10))
+        self.assertEqual(results, [i * 2 for i in range(10)])
+        self.assertEqual(sum(stats.restarts for stats in pool.getStats()), 2)
+        self.assertEqual(FakeApplication.started, 4)
+
+    def test_ErrorsWithoutCrashAreReturned(self):
+        pool = ApplicationPool(FakeApplication, 2)
+        results = pool.run(lambda app, item: app.double(item), [1, "bad", 3, "crash"])
+        self.assertEqual(results[0], 2)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertIsInstance(results[3], RuntimeError)
+        self.assertEqual(sum(stats.errors for stats in pool.getStats()), 2)
+
+    def test_InvalidSize(self):
+        self.assertRaises(ValueError, ApplicationPool, FakeApplication, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath("./src/tools/api_compiler/"))
+
+import json
+import tempfile
+import unittest
+from tracer import Tracer
+
+
+class TestTracer(unittest.TestCase):
+
+    def test_DisabledRecordsNothing(self):
+        tracer = Tracer()
+        with tracer.span("find", "find", 1):
+            pass
+        self.assertEqual(tracer.getSpans(), [])
+        self.assertIs(tracer.span("a", "b"), tracer.span("c", "d"))
+
+    def test_SpanTree(self):
+        tracer = Tracer()
+        tracer.enabled = True
+        with tracer.span("pipeline", "pipeline"):
+            with tracer.span("_findComponent", "find", 5):
+                with tracer.span("_forceShow", "forceShow", 5):
+                    pass
+            with tracer.span("_5_click", "action", 5):
+                pass
+
+        root, = tracer._roots
+        self.assertEqual([c.name for c in root.children], ["_findComponent", "_5_click"])
+        self.assertEqual(root.children[0].children[0].category, "forceShow")
+        self.assertEqual(len(tracer.getSpans()), 4)
+
+    def test_ErrorIsRecorded(self):
+        tracer = Tracer()
+        tracer.enabled = True
+        with self.assertRaises(KeyError):
+            with tracer.span("action", "action", 2):
+                raise KeyError()
+        self.assertEqual(tracer.getSpans()[0].args["error"], "KeyError")
+
+    def test_ChromeTraceAndSummary(self):
+        tracer = Tracer()
+        tracer.enabled = True
+        for i in range(20):
+            with tracer.span("_findComponent", "find", 3):
+                pass
+        with tracer.span("_findComponent", "find", 4):
+            pass
+
+        path = os.path.join(tempfile.mkdtemp(), "trace.json")
+        tracer.exportChromeTrace(path)
+        with open(path) as f:
+            events = json.load(f)["traceEvents"]
+        self.assertEqual(len(events), 21)
+        self.assertEqual(events[0]["ph"], "X")
+        self.assertEqual(events[0]["args"]["compID"], 3)
+
+        rows = {(row[0], row[1]): row for row in tracer.getSummary()}
+        self.assertEqual(rows[(3, "find")][2], 20)
+        self.assertLessEqual(rows[(3, "find")][3], rows[(3, "find")][4])
+        self.assertIn("p95", tracer.formatSummary())
+
+    def test_Percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(Tracer._percentile(values, 50), 50)
+        self.assertEqual(Tracer._percentile(values, 95), 95)
+        self.assertEqual(Tracer._percentile([7], 95), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()